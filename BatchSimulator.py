@@ -0,0 +1,133 @@
+import numpy as np
+from typing import Dict
+from World import World
+from Rules import fertility
+
+
+class BatchSimulator:
+    """
+    Steps many Game of Life worlds of the same size at once, for parameter sweeps. The worlds are stacked into a
+    single ``(N, height, width)`` array and every world can have its own birth/survival/age rules.
+    """
+
+    def __init__(self, cells, rules = ([3], [2, 3], None)):
+        """
+        Constructor for the batch simulator.
+
+        :param cells: ``(N, height, width)`` array of cell values, or a list of equally sized ``World`` objects.
+        :param rules: (optional) one ``(birth, survival, age)`` tuple for all worlds, or a list with one tuple per world.
+        """
+        if not isinstance(cells, np.ndarray):
+            cells = np.stack([np.asarray(world.world) for world in cells])
+        if cells.ndim != 3:
+            raise ValueError("Expected cells of shape (N, height, width), got {}".format(cells.shape))
+        self.cells = cells.astype(int)
+        self.generation = 0
+        self.set_rules(rules)
+
+    @classmethod
+    def random(cls, count: int, width: int, height: int = -1, density: float = 0.5, seed: int = None,
+               rules = ([3], [2, 3], None)) -> "BatchSimulator":
+        """
+        Creates a batch of randomly filled worlds.
+
+        :param count: number of worlds.
+        :param width: width of every world.
+        :param height: (optional) height of every world; defaults to ``width``.
+        :param density: (optional) chance that a cell starts alive.
+        :param seed: (optional) seed of the random generator, to make a sweep reproducible.
+        :param rules: (optional) rules as for the constructor; living cells start at the birth value of their rules.
+        :return: new ``BatchSimulator``.
+        """
+        height = width if height == -1 else height
+        alive = np.random.default_rng(seed).random((count, height, width)) < density
+        batch = cls(alive.astype(int), rules)
+        batch.cells *= batch.birthval[:, np.newaxis, np.newaxis]
+        return batch
+
+    def set_rules(self, rules) -> None:
+        """
+        Changes the rules of the worlds.
+
+        :param rules: one ``(birth, survival, age)`` tuple for all worlds, or a list with one such tuple per world.
+        """
+        count = self.cells.shape[0]
+        if isinstance(rules, tuple):
+            rules = [rules] * count
+        if len(rules) != count:
+            raise ValueError("Expected rules for {} worlds, got {}".format(count, len(rules)))
+        self.rules = list(rules)
+
+        # Regels als tabellen per wereld: birth_table[i, n] is True als n buren in wereld i geboorte geven.
+        self.birth_table = np.zeros((count, 9), dtype=bool)
+        self.survival_table = np.zeros((count, 9), dtype=bool)
+        self.birthval = np.zeros(count, dtype=int)
+        self.fertilestart = np.zeros(count, dtype=int)
+        self.fertileend = np.zeros(count, dtype=int)
+        self.aged = np.zeros(count, dtype=bool)
+        for i, (birth, survival, age) in enumerate(self.rules):
+            self.birth_table[i, [n for n in birth if 0 <= n <= 8]] = True
+            self.survival_table[i, [n for n in survival if 0 <= n <= 8]] = True
+            birthval, fertilestart, fertileend = fertility(age)
+            self.birthval[i] = birthval
+            self.aged[i] = age is not None
+            if age is not None:
+                self.fertilestart[i], self.fertileend[i] = fertilestart, fertileend
+
+    def update(self) -> Dict[str, np.ndarray]:
+        """
+        Updates every world to its next generation in one vectorized pass.
+
+        :return: dictionary of per-world statistics, each an array of length N: ``population`` (living cells after
+            the step), ``births`` (dead cells that became alive) and ``deaths`` (living cells that reached zero).
+        """
+        self.generation += 1
+        count, height, width = self.cells.shape
+        padded = np.pad(self.cells, ((0, 0), (1, 1), (1, 1)), mode="wrap")
+        alive = padded > 0
+        per_world = (slice(None), np.newaxis, np.newaxis)
+        fertile = np.where(self.aged[per_world],
+                           (padded <= self.fertilestart[per_world]) & (padded >= self.fertileend[per_world]), alive)
+
+        neighborcount = np.zeros((count, height, width), dtype=np.uint8)
+        breedingneighborcount = np.zeros((count, height, width), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy == 1 and dx == 1:
+                    continue
+                neighborcount += alive[:, dy:dy + height, dx:dx + width]
+                breedingneighborcount += fertile[:, dy:dy + height, dx:dx + width]
+
+        index = np.arange(count)[per_world]
+        cells = self.cells
+        living = cells > 0
+        born = (cells == 0) & self.birth_table[index, breedingneighborcount]
+        survives = self.survival_table[index, neighborcount]
+        newcells = np.where(born, self.birthval[per_world], 0)
+        newcells = np.where(living, np.where(survives, cells, cells - 1), newcells)
+
+        statistics = {
+            "population": np.count_nonzero(newcells > 0, axis=(1, 2)),
+            "births": np.count_nonzero(born, axis=(1, 2)),
+            "deaths": np.count_nonzero(living & (newcells <= 0), axis=(1, 2)),
+        }
+        self.cells = newcells
+        return statistics
+
+    def get_generation(self) -> int:
+        """
+        Returns the value of the current generation of the batch.
+
+        :return: generation of the simulated worlds.
+        """
+        return self.generation
+
+    def get_world(self, index: int) -> World:
+        """
+        Returns one world of the batch as a ``World`` that shares its cells with the batch until the next ``update``.
+
+        :param index: position of the world in the batch.
+        :return: ``World`` view on the cells.
+        """
+        height, width = self.cells.shape[1:]
+        return World(width, height, self.cells[index])
@@ -0,0 +1,291 @@
+from collections import OrderedDict
+import numpy as np
+from World import World
+
+
+class Node:
+    """
+    Immutable quadtree node. A node of level ``k`` covers a square of ``2**k`` by ``2**k`` cells; level 0 nodes are
+    single cells. Nodes are hash-consed by ``HashLife.join``, so equal subtrees are the same object.
+    """
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level: int, nw, ne, sw, se, population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+class HashLife:
+    """
+    HashLife engine for classic birth/survival rules (no age rules). Advances worlds by large numbers of generations
+    at once by memoizing the future of every distinct quadtree node.
+    Read https://en.wikipedia.org/wiki/Hashlife for an introduction to the algorithm.
+    """
+
+    def __init__(self, birth = [3], survival = [2,3], max_nodes: int = 2_000_000, max_results: int = 1_000_000):
+        """
+        Constructor of the HashLife engine.
+
+        :param birth: neighbour counts for which a dead cell becomes alive.
+        :param survival: neighbour counts for which a living cell survives.
+        :param max_nodes: (optional) most nodes in the node table; when it is full the nodes that no memoized result
+            uses are dropped, also in the middle of a jump (see ``collect``).
+        :param max_results: (optional) number of memoized results kept; the least recently used are evicted first.
+        """
+        if 0 in birth:
+            raise ValueError("HashLife cannot simulate rules where cells are born without neighbours (B0)")
+        self.birth = set(birth)
+        self.survival = set(survival)
+        self.max_nodes = max_nodes
+        self.max_results = max_results
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self.nodes = {}
+        self.results = OrderedDict()
+        self.zeros = [self.off]
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """
+        Returns the canonical node with the four given quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se, nw.population + ne.population + sw.population + se.population)
+            self.collect()
+            self.nodes[key] = node
+        return node
+
+    def zero(self, level: int) -> Node:
+        """
+        Returns the empty node of the given level.
+        """
+        while len(self.zeros) <= level:
+            previous = self.zeros[-1]
+            self.zeros.append(self.join(previous, previous, previous, previous))
+        return self.zeros[level]
+
+    def center(self, node: Node) -> Node:
+        """
+        Returns the centered sub-node of half the size, without advancing time.
+        """
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def step(self, node: Node, j: int) -> Node:
+        """
+        Advances the center of ``node`` by ``2**j`` generations.
+
+        :param node: node of level ``k >= 2``.
+        :param j: log2 of the number of generations, at most ``k - 2``.
+        :return: node of level ``k - 1`` covering the center of ``node``.
+        """
+        if node.population == 0:
+            return self.zero(node.level - 1)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            return result
+
+        if node.level == 2:
+            result = self.__step_leaf__(node)
+        else:
+            n = node
+            quadrants = [
+                n.nw, self.join(n.nw.ne, n.ne.nw, n.nw.se, n.ne.sw), n.ne,
+                self.join(n.nw.sw, n.nw.se, n.sw.nw, n.sw.ne), self.center(n), self.join(n.ne.sw, n.ne.se, n.se.nw, n.se.ne),
+                n.sw, self.join(n.sw.ne, n.se.nw, n.sw.se, n.se.sw), n.se,
+            ]
+            if j == node.level - 2:  # Twee halve sprongen.
+                c = [self.step(q, j - 1) for q in quadrants]
+                finish = lambda q: self.step(q, j - 1)
+            else:  # Een sprong, daarna alleen het midden nemen.
+                c = [self.step(q, j) for q in quadrants]
+                finish = self.center
+            result = self.join(finish(self.join(c[0], c[1], c[3], c[4])), finish(self.join(c[1], c[2], c[4], c[5])),
+                               finish(self.join(c[3], c[4], c[6], c[7])), finish(self.join(c[4], c[5], c[7], c[8])))
+
+        self.results[key] = result
+        if len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+        return result
+
+    def __step_leaf__(self, node: Node) -> Node:
+        """
+        Internal method that advances the 2x2 center of a 4x4 node by one generation by counting neighbours.
+        """
+        grid = [[0] * 4 for _ in range(4)]
+        for qy, qx, quadrant in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            for cy, cx, cell in ((0, 0, quadrant.nw), (0, 1, quadrant.ne), (1, 0, quadrant.sw), (1, 1, quadrant.se)):
+                grid[qy + cy][qx + cx] = cell.population
+
+        def next_cell(x: int, y: int) -> Node:
+            count = sum(grid[ny][nx] for ny in range(y - 1, y + 2) for nx in range(x - 1, x + 2)) - grid[y][x]
+            alive = count in self.survival if grid[y][x] else count in self.birth
+            return self.on if alive else self.off
+
+        return self.join(next_cell(1, 1), next_cell(2, 1), next_cell(1, 2), next_cell(2, 2))
+
+    def collect(self) -> None:
+        """
+        Garbage-collects the node table once it holds ``max_nodes`` nodes; called by ``join`` before adding a node, so
+        the limit also holds in the middle of a jump. Only the nodes used by memoized results are kept, at most half of
+        ``max_nodes``: the least recently used results are dropped until they fit. Other nodes that are still
+        referenced stay valid; they are just no longer shared with nodes built afterwards.
+        """
+        if len(self.nodes) < self.max_nodes:
+            return
+        while True:
+            self.nodes = {}
+            stack = [node for key, result in self.results.items() for node in (key[0], result)]
+            while stack:
+                node = stack.pop()
+                if node.level == 0:
+                    continue
+                key = (node.nw, node.ne, node.sw, node.se)
+                if key not in self.nodes:
+                    self.nodes[key] = node
+                    stack.extend(key)
+            if len(self.nodes) <= self.max_nodes // 2 or not self.results:
+                break
+            for _ in range(-(-len(self.results) // 2)):
+                self.results.popitem(last=False)
+        self.zeros = [self.off]
+
+    def from_array(self, cells: np.ndarray, level: int = None) -> Node:
+        """
+        Builds a node holding ``cells`` in its top-left corner; cells outside the array are dead.
+
+        :param cells: 2D array; positive values are living cells.
+        :param level: (optional) level of the node; defaults to the smallest level that fits the array.
+        :return: quadtree node.
+        """
+        height, width = cells.shape
+        if level is None:
+            level = max(1, int(np.ceil(np.log2(max(width, height, 1)))))
+        alive = cells > 0
+
+        def build(k: int, x0: int, y0: int) -> Node:
+            if x0 >= width or y0 >= height or not alive[y0:y0 + 2 ** k, x0:x0 + 2 ** k].any():
+                return self.zero(k)
+            if k == 0:
+                return self.on
+            half = 2 ** (k - 1)
+            return self.join(build(k - 1, x0, y0), build(k - 1, x0 + half, y0),
+                             build(k - 1, x0, y0 + half), build(k - 1, x0 + half, y0 + half))
+
+        return build(level, 0, 0)
+
+    def periodic(self, cells: np.ndarray, level: int, x0: int, y0: int) -> Node:
+        """
+        Builds the node covering ``[x0, x0 + 2**level)`` by ``[y0, y0 + 2**level)`` of the infinite plane tiled with
+        copies of ``cells``; this is how a toroidal ``World`` looks from any cell.
+
+        :param cells: 2D array; positive values are living cells.
+        :param level: level of the node.
+        :param x0: column of the top-left cell.
+        :param y0: row of the top-left cell.
+        :return: quadtree node.
+        """
+        height, width = cells.shape
+        alive = cells > 0
+        built = {}
+
+        def build(k: int, x: int, y: int) -> Node:
+            key = (k, x % width, y % height)
+            node = built.get(key)
+            if node is None:
+                if k == 0:
+                    node = self.on if alive[y % height, x % width] else self.off
+                else:
+                    half = 2 ** (k - 1)
+                    node = self.join(build(k - 1, x, y), build(k - 1, x + half, y),
+                                     build(k - 1, x, y + half), build(k - 1, x + half, y + half))
+                built[key] = node
+            return node
+
+        return build(level, x0, y0)
+
+    def to_array(self, node: Node, width: int, height: int) -> np.ndarray:
+        """
+        Copies the top-left ``width`` by ``height`` cells of a node into an array.
+
+        :param node: quadtree node.
+        :param width: number of columns to copy.
+        :param height: number of rows to copy.
+        :return: 2D integer array of zeros and ones.
+        """
+        cells = np.zeros((height, width), dtype=int)
+
+        def fill(n: Node, x0: int, y0: int) -> None:
+            if n.population == 0 or x0 >= width or y0 >= height:
+                return
+            if n.level == 0:
+                cells[y0, x0] = 1
+                return
+            half = 2 ** (n.level - 1)
+            fill(n.nw, x0, y0)
+            fill(n.ne, x0 + half, y0)
+            fill(n.sw, x0, y0 + half)
+            fill(n.se, x0 + half, y0 + half)
+
+        fill(node, 0, 0)
+        return cells
+
+    def from_world(self, world: World) -> Node:
+        """
+        Converts a ``World`` into a quadtree node with the world in its top-left corner.
+
+        :param world: world to convert.
+        :return: quadtree node.
+        """
+        return self.from_array(np.asarray(world.world))
+
+    def to_world(self, node: Node, width: int = None, height: int = None) -> World:
+        """
+        Converts (the top-left corner of) a quadtree node into a ``World`` so it can be shown in ``Visualisation``.
+
+        :param node: quadtree node.
+        :param width: (optional) width of the world; defaults to the size of the node.
+        :param height: (optional) height of the world; defaults to ``width``.
+        :return: new ``World``.
+        """
+        width = width if width is not None else 2 ** node.level
+        height = height if height is not None else width
+        world = World(width, height)
+        world.world = self.to_array(node, width, height)
+        return world
+
+    def advance(self, world: World, generations: int) -> World:
+        """
+        Advances a toroidal ``World`` by the given number of generations. The number is split into powers of two; each
+        jump builds a node big enough to hold the world plus every cell that can influence it during the jump.
+        Worlds with power-of-two sizes share nearly all nodes between copies; on other sizes the tiles do not line up
+        with the quadtree and hardly any node is shared, which makes stepping much faster (see ``Simulator.advance``).
+
+        :param world: world to advance; positive values count as living cells.
+        :param generations: number of generations to advance.
+        :return: new ``World`` with the resulting state.
+        """
+        if generations < 0:
+            raise ValueError("Cannot advance by a negative number of generations")
+        cells = np.asarray(world.world)
+        height, width = cells.shape
+        cells = (cells > 0).astype(int)
+        tile_level = max(1, int(np.ceil(np.log2(max(width, height)))))
+        j = 0
+        while generations >> j:
+            if generations >> j & 1:
+                level = max(j + 2, tile_level + 1)
+                quarter = 2 ** (level - 2)
+                root = self.periodic(cells, level, -quarter, -quarter)
+                cells = self.to_array(self.step(root, j), width, height)
+            j += 1
+
+        newworld = World(width, height)
+        newworld.world = cells
+        return newworld
@@ -0,0 +1,177 @@
+import threading
+import numpy as np
+from collections import OrderedDict, deque
+from typing import Callable
+from Rules import Rule
+from World import World
+
+
+class History:
+    """
+    Remembers the generations of a ``Simulator`` so that any of them can be looked up with ``at``. Every
+    ``interval``-th generation is kept as a checkpoint; other generations are kept in an LRU cache. Checkpoints and
+    cache together use at most ``budget`` bytes (but the first checkpoint is always kept). A generation that is no
+    longer stored is recomputed from the checkpoint before it, so looking up a generation costs at most one
+    checkpoint interval of steps. When the checkpoints outgrow the budget or ``max_checkpoints``, the interval is
+    doubled and every other checkpoint dropped, so in a long run the interval grows with the number of generations.
+    Generations after the newest recorded one are computed ahead without changing the simulator.
+
+    The history starts at the generation it was reset to (see ``reset``); the simulator resets it when the world is
+    replaced or edited, since earlier checkpoints no longer lead to the current world. All methods can be called from
+    another thread than the one stepping the simulator.
+    """
+
+    def __init__(self, step: Callable[[np.ndarray, Rule], np.ndarray], interval: int = 100, budget: int = 64 << 20,
+                 max_checkpoints: int = 64):
+        """
+        Constructor of the history.
+
+        :param step: function computing the next generation of an array of cells with a rule.
+        :param interval: (optional) initial number of generations between checkpoints.
+        :param budget: (optional) most bytes of cells kept in the checkpoints and the LRU cache together.
+        :param max_checkpoints: (optional) most checkpoints to keep; beyond that (or beyond the budget) the interval
+            is doubled and every other checkpoint dropped, so memory stays bounded for long runs.
+        """
+        self.step = step
+        self.initial_interval = interval
+        self.interval = interval
+        self.budget = budget
+        self.max_checkpoints = max_checkpoints
+        self.lock = threading.Lock()
+        self.checkpoints = {}  # generatie -> cellen
+        self.cache = OrderedDict()  # generatie -> cellen, minst recent gebruikt eerst.
+        self.cached_bytes = 0
+        self.checkpoint_bytes = 0
+        self.base = None  # Eerste generatie van de geschiedenis.
+        self.latest = None  # (generatie, cellen) van de nieuwste generatie van de simulator.
+        self.rule = None
+        self.epoch = 0  # Telt resets, zodat vooruit berekende generaties van voor een reset niet opgeslagen worden.
+
+    @staticmethod
+    def __freeze__(cells: np.ndarray) -> np.ndarray:
+        """
+        Internal method returning a read-only copy of the cells, so later edits of the world do not change the history.
+        """
+        cells = np.array(cells)
+        cells.flags.writeable = False
+        return cells
+
+    def reset(self, generation: int, cells: np.ndarray, rule: Rule) -> None:
+        """
+        Forgets everything and starts the history at the given generation.
+
+        :param generation: number of the generation.
+        :param cells: cells of that generation.
+        :param rule: rule the following generations are computed with.
+        """
+        cells = self.__freeze__(cells)
+        with self.lock:
+            self.__restart__(generation, cells, rule)
+
+    def __restart__(self, generation: int, cells: np.ndarray, rule: Rule) -> None:
+        """
+        Internal method for ``reset``; the caller holds the lock.
+        """
+        self.checkpoints = {generation: cells}
+        self.checkpoint_bytes = cells.nbytes
+        self.cache.clear()
+        self.cached_bytes = 0
+        self.interval = self.initial_interval
+        self.base = generation
+        self.latest = (generation, cells)
+        self.rule = rule
+        self.epoch += 1
+
+    def record(self, generation: int, cells: np.ndarray, rule: Rule) -> None:
+        """
+        Stores the newest generation of the simulator. When the rule changed since the previous generation, the
+        history starts again at the previous generation.
+
+        :param generation: number of the generation.
+        :param cells: cells of that generation.
+        :param rule: rule the generation was computed with.
+        """
+        cells = self.__freeze__(cells)
+        with self.lock:
+            if self.latest is None or generation != self.latest[0] + 1:
+                self.__restart__(generation, cells, rule)
+                return
+            if rule != self.rule:
+                self.__restart__(*self.latest, rule)
+            self.__store__(generation, cells)
+            self.latest = (generation, cells)
+
+    def __store__(self, generation: int, cells: np.ndarray) -> None:
+        """
+        Internal method that stores a generation as a checkpoint or in the cache; the caller holds the lock.
+        """
+        if (generation - self.base) % self.interval == 0:
+            if generation not in self.checkpoints:
+                self.checkpoints[generation] = cells
+                self.checkpoint_bytes += cells.nbytes
+            while len(self.checkpoints) > 1 and (len(self.checkpoints) > self.max_checkpoints
+                                                  or self.checkpoint_bytes > self.budget):
+                # Dunner maken: dubbele afstand, de helft van de checkpoints.
+                self.interval *= 2
+                self.checkpoints = {g: c for g, c in self.checkpoints.items() if (g - self.base) % self.interval == 0}
+                self.checkpoint_bytes = sum(c.nbytes for c in self.checkpoints.values())
+        elif generation in self.cache:
+            self.cache.move_to_end(generation)
+            return
+        else:
+            self.cache[generation] = cells
+            self.cached_bytes += cells.nbytes
+        while self.cached_bytes + self.checkpoint_bytes > self.budget and self.cache:
+            self.cached_bytes -= self.cache.popitem(last=False)[1].nbytes
+
+    def __lookup__(self, generation: int):
+        """
+        Internal method returning the stored cells of a generation, or the closest stored generation before it as
+        ``(generation, cells)``; the caller holds the lock.
+        """
+        if generation == self.latest[0]:
+            return generation, self.latest[1]
+        if generation in self.checkpoints:
+            return generation, self.checkpoints[generation]
+        if generation in self.cache:
+            self.cache.move_to_end(generation)
+            return generation, self.cache[generation]
+        start = max((g for g in self.checkpoints if g <= generation), default=self.base)
+        if generation > self.latest[0]:
+            start = max(start, self.latest[0])
+        start = max([start] + [g for g in range(start + 1, generation) if g in self.cache])
+        if start == self.latest[0]:
+            return start, self.latest[1]
+        return start, self.checkpoints.get(start, self.cache.get(start))
+
+    def at(self, generation: int) -> World:
+        """
+        Returns the world at a generation, recomputing it from the closest stored generation before it if needed.
+
+        :param generation: number of the generation; not before the start of the history.
+        :return: ``World`` with read-only cells.
+        """
+        with self.lock:
+            if self.base is None:
+                raise ValueError("The history is empty")
+            if generation < self.base:
+                raise ValueError("Generation {} is before the start of the history ({})".format(generation, self.base))
+            start, cells = self.__lookup__(generation)
+            rule, epoch, interval, base = self.rule, self.epoch, self.interval, self.base
+        # Onderweg worden de checkpoints en de laatste generaties die in het budget passen bewaard.
+        checkpoints, recent = [], deque()
+        for g in range(start + 1, generation + 1):
+            cells = self.step(cells, rule)
+            cells.flags.writeable = False
+            if (g - base) % interval == 0:
+                checkpoints.append((g, cells))
+            else:
+                recent.append((g, cells))
+                if len(recent) * cells.nbytes > self.budget:
+                    recent.popleft()
+        if checkpoints or recent:
+            with self.lock:
+                if epoch == self.epoch:
+                    for g, stored in checkpoints + list(recent):
+                        self.__store__(g, stored)
+        return World(cells.shape[1], cells.shape[0], cells)
@@ -0,0 +1,251 @@
+import hashlib
+import numpy as np
+from World import World
+from Simulator import evolve
+
+WORD = 64
+
+
+class PackedWorld(World):
+    """
+    Memory-compact ``World``. Classic worlds (``age=None``) store one bit per cell, packed row by row into 64-bit
+    words, and step 64 cells per operation with bitwise adders. Aged worlds need more than one bit per cell and fall
+    back to a ``uint8`` per cell.
+    """
+
+    def __init__(self, width: int, height: int = -1, age: int = None):
+        """
+        Constructor of PackedWorld datatype.
+
+        :param width: integer representing the width of the world.
+        :param height: (optional) integer representing the height of the world. If left implicit, the value of ``width`` is used to create a square-shaped world.
+        :param age: (optional) age rule the world will be simulated with; ``None`` selects the one-bit layout.
+        """
+        self.width = width
+        if not height == -1:
+            self.height = height
+        else:
+            self.height = width
+        self.words = None
+        self.cells = None
+        if age is None:
+            self.words = np.zeros((self.height, -(-self.width // WORD)), dtype=np.uint64)
+        else:
+            self.cells = np.zeros((self.height, self.width), dtype=np.uint8)
+
+    @property
+    def packed(self) -> bool:
+        """
+        Whether the world uses the one-bit layout.
+        """
+        return self.words is not None
+
+    @property
+    def world(self) -> np.ndarray:
+        """
+        Cell values as a 2D array. For the one-bit layout this is an unpacked copy; writes to it are not stored.
+        """
+        if self.packed:
+            return unpack(self.words, self.width).astype(int)
+        return self.cells
+
+    @world.setter
+    def world(self, cells: np.ndarray) -> None:
+        if self.packed:
+            self.words = pack(np.asarray(cells) > 0)
+        else:
+            self.cells = np.clip(cells, 0, 255).astype(np.uint8)
+
+    def get(self, x: int, y: int) -> int:
+        """
+        Returns the value on location ``(x, y)`` in the world.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :return: value of location ``(x, y)`` in World.
+        """
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return -1
+        if self.packed:
+            return int(self.words[y, x // WORD] >> np.uint64(x % WORD)) & 1
+        return int(self.cells[y, x])
+
+    def set(self, x: int, y: int, value: int = 1) -> None:
+        """
+        Sets the state of ``(x, y)`` to the given value. The one-bit layout stores any positive value as ``1``; the
+        ``uint8`` layout clamps values to ``0..255``.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :param value: (optional) value to set location ``(x, y)``; uses ``1`` otherwise.
+        """
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return
+        if self.packed:
+            bit = np.uint64(1) << np.uint64(x % WORD)
+            if value > 0:
+                self.words[y, x // WORD] |= bit
+            else:
+                self.words[y, x // WORD] &= ~bit
+        else:
+            self.cells[y, x] = min(max(value, 0), 255)
+
+    @property
+    def population(self) -> int:
+        """
+        Number of living cells; counted on the packed words for the one-bit layout.
+        """
+        if self.packed:
+            return int(np.bitwise_count(self.words).sum())
+        return int(np.count_nonzero(self.cells))
+
+    def digest(self) -> bytes:
+        """
+        Returns a 128-bit digest of the cells, computed on the stored layout without unpacking it.
+
+        :return: digest of the shape and contents of the world.
+        """
+        digest = hashlib.blake2b(str((self.width, self.height)).encode(), digest_size=16)
+        digest.update(np.ascontiguousarray(self.words if self.packed else self.cells).data)
+        return digest.digest()
+
+    def get_neighbours(self, x: int, y: int):
+        """
+        Returns a list of values for the 8 neighbours of location ``(x, y)``.
+
+        :param x: column-vale of the location.
+        :param y: row-value of the location.
+        :return: ``List`` of integers representing the values of the neighbours of ``(x, y)``.
+        """
+        return [self.get(nx % self.width, ny % self.height)
+                for nx in range(x - 1, x + 2) for ny in range(y - 1, y + 2) if not (nx == x and ny == y)]
+
+    def evolve(self, birth, survival, age = None) -> "PackedWorld":
+        """
+        Computes the next generation. Classic rules on the one-bit layout use bitwise (SWAR) neighbour counting;
+        aged rules convert to the ``uint8`` layout first.
+
+        :param birth: neighbour counts for which a dead cell becomes alive.
+        :param survival: neighbour counts for which a living cell survives.
+        :param age: (optional) age rule; ``None`` for classic Game of Life.
+        :return: new ``PackedWorld`` holding the next generation.
+        """
+        if age is None and self.packed:
+            newworld = PackedWorld(self.width, self.height)
+            newworld.words = step_words(self.words, self.width, birth, survival)
+            return newworld
+
+        newworld = PackedWorld(self.width, self.height, age=age if age is not None else 1)
+        cells = self.cells if not self.packed else unpack(self.words, self.width)
+        newworld.cells = evolve(cells, birth, survival, age)
+        return newworld
+
+
+def pack(bits: np.ndarray) -> np.ndarray:
+    """
+    Packs a 2D boolean array into rows of little-endian 64-bit words; cell ``x`` is bit ``x % 64`` of word ``x // 64``.
+
+    :param bits: 2D boolean array of living cells.
+    :return: 2D ``uint64`` array with ``ceil(width / 64)`` words per row.
+    """
+    height, width = bits.shape
+    nwords = -(-width // WORD)
+    padded = np.zeros((height, nwords * WORD), dtype=bool)
+    padded[:, :width] = bits
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+
+
+def unpack(words: np.ndarray, width: int) -> np.ndarray:
+    """
+    Inverse of ``pack``.
+
+    :param words: 2D ``uint64`` array of packed rows.
+    :param width: number of cells per row.
+    :return: 2D ``uint8`` array of zeros and ones.
+    """
+    raw = np.ascontiguousarray(words.astype("<u8")).view(np.uint8)
+    return np.unpackbits(raw, axis=1, bitorder="little")[:, :width]
+
+
+def padding_mask(width: int) -> np.ndarray:
+    """
+    Returns per-word masks that clear the unused bits after the last cell of a row.
+
+    :param width: number of cells per row.
+    :return: 1D ``uint64`` array, one mask per word.
+    """
+    mask = np.full(-(-width // WORD), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if width % WORD:
+        mask[-1] = (np.uint64(1) << np.uint64(width % WORD)) - np.uint64(1)
+    return mask
+
+
+def shift_west(words: np.ndarray, width: int, mask: np.ndarray) -> np.ndarray:
+    """
+    Returns packed rows where bit ``x`` holds cell ``x - 1``, wrapping around the left edge.
+    """
+    shifted = (words << np.uint64(1)) | (np.roll(words, 1, axis=1) >> np.uint64(WORD - 1))
+    last = (words[:, (width - 1) // WORD] >> np.uint64((width - 1) % WORD)) & np.uint64(1)
+    shifted[:, 0] = (shifted[:, 0] & ~np.uint64(1)) | last
+    return shifted & mask
+
+
+def shift_east(words: np.ndarray, width: int, mask: np.ndarray) -> np.ndarray:
+    """
+    Returns packed rows where bit ``x`` holds cell ``x + 1``, wrapping around the right edge.
+    """
+    shifted = ((words >> np.uint64(1)) | (np.roll(words, -1, axis=1) << np.uint64(WORD - 1))) & mask
+    word, bit = (width - 1) // WORD, np.uint64((width - 1) % WORD)
+    first = words[:, 0] & np.uint64(1)
+    shifted[:, word] = (shifted[:, word] & ~(np.uint64(1) << bit)) | (first << bit)
+    return shifted
+
+
+def step_words(words: np.ndarray, width: int, birth, survival) -> np.ndarray:
+    """
+    Computes the next generation of a packed toroidal world for classic birth/survival rules. The 8 neighbour
+    bit-planes are summed into 4 count bit-planes with ripple-carry adders, so each operation handles 64 cells.
+
+    :param words: 2D ``uint64`` array of packed rows.
+    :param width: number of cells per row.
+    :param birth: neighbour counts for which a dead cell becomes alive.
+    :param survival: neighbour counts for which a living cell survives.
+    :return: packed rows of the next generation.
+    """
+    mask = padding_mask(width)
+    up = np.roll(words, 1, axis=0)
+    down = np.roll(words, -1, axis=0)
+    planes = [up, down]
+    for row in (up, words, down):
+        planes.append(shift_west(row, width, mask))
+        planes.append(shift_east(row, width, mask))
+
+    # Count bit-planes: count = s0 + 2*s1 + 4*s2 + 8*s3.
+    s0 = np.zeros_like(words)
+    s1 = np.zeros_like(words)
+    s2 = np.zeros_like(words)
+    s3 = np.zeros_like(words)
+    for plane in planes:
+        carry0 = s0 & plane
+        s0 ^= plane
+        carry1 = s1 & carry0
+        s1 ^= carry0
+        carry2 = s2 & carry1
+        s2 ^= carry1
+        s3 |= carry2
+
+    def count_is(n: int) -> np.ndarray:
+        result = mask[np.newaxis, :].repeat(words.shape[0], axis=0)
+        for bit, plane in enumerate((s0, s1, s2, s3)):
+            result &= plane if n >> bit & 1 else ~plane
+        return result
+
+    born = np.zeros_like(words)
+    for n in set(birth):
+        if 0 <= n <= 8:
+            born |= count_is(n)
+    survives = np.zeros_like(words)
+    for n in set(survival):
+        if 0 <= n <= 8:
+            survives |= count_is(n)
+    return ((~words & born) | (words & survives)) & mask
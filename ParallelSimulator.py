@@ -0,0 +1,116 @@
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from Simulator import Simulator, evolve_padded
+from World import World
+
+# Gedeelde buffers die een werkproces al geopend heeft, op naam.
+_attached = {}
+
+
+def _attach(name: str, shape, dtype) -> np.ndarray:
+    """
+    Opens a shared-memory buffer in a worker process (once) and returns it as an array.
+    """
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=_attached[name].buf)
+
+
+def _step_band(source: str, target: str, shape, dtype, y0: int, y1: int, rule) -> None:
+    """
+    Worker task: computes rows ``y0..y1`` of the next generation. The row above and below the band (the halo) are
+    read from the neighbouring bands in the shared source buffer.
+    """
+    height = shape[0]
+    cells = _attach(source, shape, dtype)
+    rows = cells[np.arange(y0 - 1, y1 + 1) % height]
+    padded = np.pad(rows, ((0, 0), (1, 1)), mode="wrap")
+    _attach(target, shape, dtype)[y0:y1] = evolve_padded(padded, None, None, rule=rule)
+
+
+class ParallelSimulator(Simulator):
+    """
+    Game of Life simulator that splits the world into horizontal bands and steps them in a pool of processes.
+    The cells live in two shared-memory buffers that are swapped every generation, so no new ``World`` is allocated.
+
+    The ``World`` returned by ``update`` is a view on one of the buffers: it stays valid until the second ``update``
+    after it, which overwrites the buffer. Copy ``world.world`` to keep a generation for longer.
+    Call ``close`` (or use the simulator as a context manager) to stop the workers and release the buffers.
+    """
+
+    def __init__(self, world = None, birth = [3], survival = [2,3], age = None, workers: int = None):
+        """
+        Constructor for the parallel Game of Life simulator.
+
+        :param world: (optional) environment used to simulate Game of Life.
+        :param workers: (optional) number of worker processes; defaults to the number of CPUs.
+        """
+        super().__init__(world, birth, survival, age)
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+        self.memory = []
+        self.buffers = []
+
+    def __allocate__(self, cells: np.ndarray) -> None:
+        """
+        Internal method that (re)creates the shared buffers and the process pool for worlds of the given shape.
+        """
+        self.close()
+        for _ in range(2):
+            memory = shared_memory.SharedMemory(create=True, size=max(cells.nbytes, 1))
+            self.memory.append(memory)
+            height, width = cells.shape
+            self.buffers.append(World(width, height, np.ndarray(cells.shape, dtype=cells.dtype, buffer=memory.buf)))
+        self.pool = multiprocessing.Pool(self.workers)
+
+    def __step__(self, stats: dict = None) -> World:
+        """
+        Internal method that computes the next generation, one band per worker. ``stats`` is left empty; metrics are
+        taken by comparing with the previous generation.
+
+        :return: New state of the world, as a view on a shared buffer.
+        """
+        cells = np.asarray(self.world.world)
+        if not self.buffers or self.buffers[0].world.shape != cells.shape or self.buffers[0].world.dtype != cells.dtype:
+            self.__allocate__(cells)
+        if self.world is self.buffers[0]:
+            front, back = 0, 1
+        elif self.world is self.buffers[1]:
+            front, back = 1, 0
+        else:  # Nieuwe wereld via set_world of de constructor: kopieer naar de gedeelde buffer.
+            np.copyto(self.buffers[0].world, cells)
+            front, back = 0, 1
+
+        height = cells.shape[0]
+        bounds = np.linspace(0, height, min(self.workers, height) + 1).astype(int)
+        self.pool.starmap(_step_band, [
+            (self.memory[front].name, self.memory[back].name, cells.shape, cells.dtype, y0, y1,
+             self.rule)
+            for y0, y1 in zip(bounds[:-1], bounds[1:])
+        ])
+        return self.buffers[back]
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and releases the shared buffers. The worlds returned by ``update`` get a private
+        copy of their cells first, so they (and the simulator) stay usable; arrays taken from them earlier do not.
+        """
+        for buffer in self.buffers:
+            buffer.world = buffer.world.copy()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        self.buffers = []
+        for memory in self.memory:
+            memory.close()
+            memory.unlink()
+        self.memory = []
+
+    def __enter__(self) -> "ParallelSimulator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,157 @@
+import json
+import os
+import numpy as np
+from typing import Dict, List
+from Snapshot import read_rle
+from World import World
+
+# Map met de patronen die bij het project horen.
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns")
+CACHE_VERSION = 1
+
+
+class PatternLibrary:
+    """
+    Library of the RLE patterns (``*.rle``) in a directory, looked up by file name without extension. The parsed
+    patterns are kept in a cache file next to them; a file is only parsed again when its size or modification time
+    changed, so loading a library that did not change reads a single binary file.
+
+    The arrays returned by the library are read-only and shared; use ``world`` for a copy that can be edited, or pass
+    them straight to ``World.stamp``.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, cache: str = None):
+        """
+        Constructor of the pattern library; indexes the directory right away.
+
+        :param directory: (optional) directory with the RLE files; the patterns of the project by default.
+        :param cache: (optional) cache file; ``.cache.npz`` in ``directory`` by default.
+        """
+        self.directory = directory
+        self.cache = cache or os.path.join(directory, ".cache.npz")
+        self.index = {}  # naam -> bestand, grootte, wijzigingstijd, regels en afmetingen.
+        self.cells = {}  # naam -> cellen (alleen-lezen).
+        self.parsed = 0  # Aantal bestanden dat bij de laatste ``reload`` geparsed werd.
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Brings the library up to date with the directory: parses new and changed files, forgets removed ones and
+        rewrites the cache if anything changed.
+        """
+        index, cells = self.__read_cache__()
+        files = {}
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.lower().endswith(".rle"):
+                    files[os.path.splitext(entry.name)[0].lower()] = entry
+
+        self.parsed = 0
+        changed = set(index) != set(files)
+        self.index, self.cells = {}, {}
+        for name, entry in sorted(files.items()):
+            stat = entry.stat()
+            known = index.get(name)
+            if known is not None and name in cells and known["file"] == entry.name \
+                    and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime_ns:
+                self.index[name], self.cells[name] = known, cells[name]
+                continue
+            with open(entry.path) as file:
+                world, rules = read_rle(file.read())
+            self.index[name] = {"file": entry.name, "size": stat.st_size, "mtime": stat.st_mtime_ns,
+                                "width": world.width, "height": world.height, "rules": rules}
+            self.cells[name] = world.world
+            self.parsed += 1
+            changed = True
+        for name in self.cells:
+            self.cells[name].flags.writeable = False
+        if changed:
+            self.__write_cache__()
+
+    def __read_cache__(self):
+        """
+        Internal method returning the index and cells stored in the cache file; empty when it is missing, unreadable or
+        from another version.
+        """
+        try:
+            with np.load(self.cache, allow_pickle=False) as stored:
+                meta = json.loads(str(stored["index"]))
+                if meta.get("version") != CACHE_VERSION:
+                    return {}, {}
+                index = meta["patterns"]
+                cells = {name: stored["cells_{}".format(i)] for i, name in enumerate(index)}
+            return index, cells
+        except (OSError, KeyError, ValueError):
+            return {}, {}
+
+    def __write_cache__(self) -> None:
+        """
+        Internal method that writes the index and cells to the cache file. A directory that cannot be written to
+        only means that the next load parses the files again.
+        """
+        meta = json.dumps({"version": CACHE_VERSION, "patterns": self.index})
+        arrays = {"cells_{}".format(i): self.cells[name] for i, name in enumerate(self.index)}
+        temporary = self.cache + ".tmp"
+        try:
+            with open(temporary, "wb") as file:
+                np.savez(file, index=np.array(meta), **arrays)
+            os.replace(temporary, self.cache)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Sorted names of the patterns in the library.
+        """
+        return sorted(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Returns the (read-only) cells of a pattern.
+
+        :param name: name of the pattern, the file name without ``.rle``; not case sensitive.
+        """
+        try:
+            return self.cells[name.lower()]
+        except KeyError:
+            raise KeyError("Unknown pattern {!r}".format(name)) from None
+
+    def info(self, name: str) -> Dict:
+        """
+        Returns the ``file``, ``width``, ``height`` and ``rules`` (see ``Snapshot.read_rle``) of a pattern.
+        """
+        self[name]
+        info = dict(self.index[name.lower()])
+        del info["size"], info["mtime"]
+        return info
+
+    def world(self, name: str) -> World:
+        """
+        Returns a pattern as a new ``World`` of its own size, with a copy of its cells.
+        """
+        cells = np.array(self[name])
+        return World(cells.shape[1], cells.shape[0], cells)
+
+    def variants(self, name: str) -> List[np.ndarray]:
+        """
+        Returns the distinct rotations and reflections of a pattern: at most 8, fewer for symmetric patterns.
+        """
+        cells = self[name]
+        variants = []
+        for flipped in (cells, cells.T):
+            for turns in range(4):
+                variant = np.rot90(flipped, turns)
+                if not any(v.shape == variant.shape and np.array_equal(v, variant) for v in variants):
+                    variants.append(variant)
+        return variants
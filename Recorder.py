@@ -0,0 +1,206 @@
+import queue
+import struct
+import threading
+import zlib
+import numpy as np
+from typing import Iterator, Tuple
+from World import World
+from Simulator import Simulator
+
+# Bestandsindeling: MAGIC, daarna records van RECORD (soort, generatie, hoogte, breedte, dtype, lengte) + zlib-data.
+MAGIC = b"GOLREC1\0"
+RECORD = struct.Struct("<BqII8sI")
+KEYFRAME = 0  # Volledige generatie.
+DELTA = 1  # XOR met de vorige opgenomen generatie.
+
+
+class Recorder:
+    """
+    Streams the generations of a ``Simulator`` to a file. Every ``keyframe_interval`` frames a full keyframe is
+    stored; the frames in between are stored as the XOR with the previous frame, which is mostly zeros and
+    compresses well. Compression and writing happen on a background thread.
+    """
+
+    def __init__(self, path: str, keyframe_interval: int = 100, level: int = 6, queue_size: int = 64):
+        """
+        Constructor of the recorder; opens ``path`` for writing.
+
+        :param path: file to write the recording to.
+        :param keyframe_interval: (optional) number of frames between keyframes; seeking decodes at most this many.
+        :param level: (optional) zlib compression level.
+        :param queue_size: (optional) frames waiting to be written before recording blocks the simulation.
+        """
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.frames = queue.Queue(queue_size)
+        self.error = None
+        self.simulators = []  # Simulators waar de recorder als hook aan hangt, losgemaakt bij close().
+        self.thread = threading.Thread(target=self.__write__, daemon=True)
+        self.thread.start()
+
+    def attach(self, simulator: Simulator) -> "Recorder":
+        """
+        Records the current generation of the simulator and every generation after it, until ``close``.
+
+        :param simulator: simulator to record.
+        :return: the recorder itself.
+        """
+        self.record(simulator.get_generation(), simulator.get_world())
+        simulator.add_hook(self)
+        self.simulators.append(simulator)
+        return self
+
+    def __call__(self, simulator: Simulator) -> None:
+        self.record(simulator.get_generation(), simulator.get_world())
+
+    def record(self, generation: int, world: World) -> None:
+        """
+        Queues a generation for writing. The cells are copied, so the world may change right after.
+
+        :param generation: number of the generation.
+        :param world: state of the world.
+        :raises ValueError: when the recorder is closed.
+        """
+        if self.file.closed:
+            raise ValueError("Recorder is closed")
+        if self.error is not None:
+            raise self.error
+        self.frames.put((generation, np.array(world.world)))
+
+    def __write__(self) -> None:
+        """
+        Internal method running on the background thread: encodes and writes queued frames until ``close``.
+        """
+        previous = None
+        since_keyframe = 0
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue
+            generation, cells = frame
+            try:
+                if previous is None or previous.shape != cells.shape or previous.dtype != cells.dtype \
+                        or since_keyframe >= self.keyframe_interval:
+                    kind, data = KEYFRAME, cells
+                    since_keyframe = 0
+                else:
+                    kind, data = DELTA, np.bitwise_xor(previous.view(np.uint8), cells.view(np.uint8))
+                payload = zlib.compress(np.ascontiguousarray(data).tobytes(), self.level)
+                self.file.write(RECORD.pack(kind, generation, cells.shape[0], cells.shape[1], cells.dtype.str.encode(),
+                                            len(payload)))
+                self.file.write(payload)
+                previous = cells
+                since_keyframe += 1
+            except Exception as error:  # Wordt bij de volgende record() of close() doorgegeven.
+                self.error = error
+
+    def close(self) -> None:
+        """
+        Detaches the recorder from the simulators it was attached to, writes the remaining frames and closes the file.
+        """
+        if self.file.closed:
+            return
+        for simulator in self.simulators:
+            if self in simulator.hooks:
+                simulator.remove_hook(self)
+        self.simulators = []
+        self.frames.put(None)
+        self.thread.join()
+        self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Recording:
+    """
+    Reads a file written by ``Recorder``. Only the record headers are read when opening; frames are decoded on demand.
+    """
+
+    def __init__(self, path: str):
+        """
+        Constructor of the reader; indexes the records of the file.
+
+        :param path: file written by a ``Recorder``. A recording that is still being written can be read up to its
+            last complete record.
+        """
+        self.path = path
+        self.index = []  # (generatie, soort, offset van de data, lengte, vorm, dtype) per record.
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError("{} is not a Game of Life recording".format(path))
+            while True:
+                header = file.read(RECORD.size)
+                if len(header) < RECORD.size:
+                    break
+                kind, generation, height, width, dtype, length = RECORD.unpack(header)
+                offset = file.tell()
+                file.seek(length, 1)
+                self.index.append((generation, kind, offset, length, (height, width), np.dtype(dtype.rstrip(b"\0").decode())))
+            end = file.seek(0, 2)
+        while self.index and self.index[-1][2] + self.index[-1][3] > end:  # Onvolledig laatste record.
+            self.index.pop()
+        self.positions = {record[0]: position for position, record in enumerate(self.index)}
+
+    @property
+    def generations(self):
+        """
+        Generations stored in the recording, in recorded order.
+        """
+        return [record[0] for record in self.index]
+
+    def __decode__(self, file, record, previous: np.ndarray) -> np.ndarray:
+        """
+        Internal method that decodes one record, given the frame before it.
+        """
+        generation, kind, offset, length, shape, dtype = record
+        file.seek(offset)
+        data = np.frombuffer(zlib.decompress(file.read(length)), dtype=np.uint8)
+        if kind == DELTA:
+            data = np.bitwise_xor(previous.view(np.uint8).ravel(), data)
+        return data.view(dtype).reshape(shape)
+
+    def frames(self, start: int = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yields ``(generation, cells)`` for every recorded frame, beginning at generation ``start``.
+
+        :param start: (optional) first generation to yield; decoding starts at the nearest keyframe before it.
+        :return: generator of generations and read-only cell arrays.
+        """
+        first = 0 if start is None else self.__position__(start)
+        keyframe = first
+        while self.index[keyframe][1] != KEYFRAME:
+            keyframe -= 1
+        cells = None
+        with open(self.path, "rb") as file:
+            for position in range(keyframe, len(self.index)):
+                cells = self.__decode__(file, self.index[position], cells)
+                if position >= first:
+                    yield self.index[position][0], cells
+
+    def seek(self, generation: int) -> World:
+        """
+        Returns the world at a recorded generation, decoding from the nearest keyframe before it.
+
+        :param generation: recorded generation.
+        :return: ``World`` with a copy of the cells.
+        """
+        cells = next(self.frames(generation))[1]
+        return World(cells.shape[1], cells.shape[0], cells.copy())
+
+    def __position__(self, generation: int) -> int:
+        """
+        Internal method returning the index of the record of a generation.
+        """
+        if generation not in self.positions:
+            raise KeyError("Generation {} was not recorded".format(generation))
+        return self.positions[generation]
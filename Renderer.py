@@ -0,0 +1,230 @@
+import numpy as np
+import pygame
+from math import ceil, floor
+from typing import List, Optional, Sequence, Tuple
+
+white = (255, 255, 255)
+black = (0, 0, 0)
+grid_zoom = 4  # Kleinste celgrootte (in pixels) waarbij nog rasterlijnen getekend worden.
+poolings = ("max", "min", "mean")
+
+
+class Viewport:
+    """
+    Pannable, zoomable window onto a world. ``zoom`` is the size of a cell in pixels and may be below 1; ``x`` and
+    ``y`` are the (fractional) world coordinates shown at the top-left corner of ``area``.
+    """
+
+    def __init__(self, area: pygame.Rect, zoom: float, x: float = 0, y: float = 0) -> None:
+        """
+        Constructor of the viewport.
+
+        :param area: screen area in which the world is drawn.
+        :param zoom: size of a cell in pixels.
+        :param x: (optional) world column shown at the left edge of ``area``.
+        :param y: (optional) world row shown at the top edge of ``area``.
+        """
+        self.area = pygame.Rect(area)
+        self.zoom = zoom
+        self.x = x
+        self.y = y
+
+    @property
+    def state(self) -> Tuple:
+        """
+        Everything that determines where cells end up on screen; the renderer redraws fully when it changes.
+        """
+        return tuple(self.area), self.zoom, self.x, self.y
+
+    @property
+    def unit(self) -> int:
+        """
+        Number of cells (along each axis) pooled into one drawn block: 1 when cells are at least a pixel wide.
+        """
+        return 1 if self.zoom >= 1 else ceil(1 / self.zoom)
+
+    def screen_to_cell(self, px: float, py: float, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """
+        Maps a screen position to the world cell under it.
+
+        :param px: horizontal screen position.
+        :param py: vertical screen position.
+        :param width: width of the world.
+        :param height: height of the world.
+        :return: ``(x, y)`` of the cell, or ``None`` outside the area or the world.
+        """
+        if not self.area.collidepoint(px, py):
+            return None
+        x = floor(self.x + (px - self.area.left) / self.zoom)
+        y = floor(self.y + (py - self.area.top) / self.zoom)
+        if 0 <= x < width and 0 <= y < height:
+            return x, y
+        return None
+
+    def cell_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Maps a world position to the screen position of its top-left corner.
+        """
+        return self.area.left + (x - self.x) * self.zoom, self.area.top + (y - self.y) * self.zoom
+
+    def pan(self, dx: float, dy: float) -> None:
+        """
+        Moves the view by a number of pixels; positive values move the world to the left and up.
+        """
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+
+    def zoom_at(self, factor: float, px: float, py: float) -> None:
+        """
+        Zooms by ``factor`` while keeping the world position under screen position ``(px, py)`` in place.
+        """
+        x = self.x + (px - self.area.left) / self.zoom
+        y = self.y + (py - self.area.top) / self.zoom
+        self.zoom *= factor
+        self.x = x - (px - self.area.left) / self.zoom
+        self.y = y - (py - self.area.top) / self.zoom
+
+
+class Renderer:
+    """
+    Draws the visible part of a world onto a pygame surface through a ``Viewport``. The colours of all visible cells
+    are looked up in one vectorized step and blitted as a pixel array, grid lines come from an overlay that is only
+    redrawn when the view changes, and only the part of the view that changed since the previous frame is redrawn.
+    When zoomed out below a pixel per cell, blocks of cells are pooled (``max``, ``min`` or ``mean`` density) into
+    one pixel.
+    """
+
+    def __init__(self, surface: pygame.Surface, palette: Sequence[Tuple[int, int, int]], cell_size: float = None,
+                 origin: Tuple[float, float] = None, viewport: Viewport = None, pooling: str = "max") -> None:
+        """
+        Constructor of the renderer.
+
+        :param surface: surface to draw on.
+        :param palette: colour per cell value; values outside the palette wrap around like list indices.
+        :param cell_size: (optional) size of a cell in pixels when no ``viewport`` is given.
+        :param origin: (optional) pixel position of the top-left corner of the world when no ``viewport`` is given;
+            defaults to one cell in.
+        :param viewport: (optional) view to draw; by default the world is drawn at ``origin`` with ``cell_size``.
+        :param pooling: (optional) how blocks of cells are combined when zoomed out: ``"max"`` shows a block in the
+            colour of its highest value, ``"min"`` in that of its lowest, ``"mean"`` shades by the share of living cells.
+        """
+        if pooling not in poolings:
+            raise ValueError("Unknown pooling {!r}, expected one of {}".format(pooling, poolings))
+        if viewport is None:
+            origin = origin if origin is not None else (cell_size, cell_size)
+            area = pygame.Rect(int(origin[0]), int(origin[1]), surface.get_width() - int(origin[0]),
+                               surface.get_height() - int(origin[1]))
+            viewport = Viewport(area, cell_size, (int(origin[0]) - origin[0]) / cell_size,
+                                (int(origin[1]) - origin[1]) / cell_size)
+        self.surface = surface
+        self.palette = np.array(palette, dtype=np.uint8)
+        self.viewport = viewport
+        self.pooling = pooling
+        self.previous = None
+        self.state = None
+        self.extent = None
+
+    def invalidate(self) -> None:
+        """
+        Makes the next ``draw`` redraw the whole view, for example after the surface was cleared.
+        """
+        self.previous = None
+
+    def __layout__(self, width: int, height: int) -> None:
+        """
+        Internal method that determines which blocks of cells are visible, where their borders fall on screen, and
+        draws the grid overlay for them.
+        """
+        view = self.viewport
+        unit = view.unit
+        area = view.area
+        # Zichtbare blokken (van unit x unit cellen), begrensd door de wereld.
+        self.u0 = max(0, floor(view.x / unit))
+        self.v0 = max(0, floor(view.y / unit))
+        self.u1 = min(ceil(width / unit), ceil((view.x + area.width / view.zoom) / unit))
+        self.v1 = min(ceil(height / unit), ceil((view.y + area.height / view.zoom) / unit))
+        self.u1, self.v1 = max(self.u1, self.u0), max(self.v1, self.v0)
+
+        def edges(start: int, end: int, offset: float, low: int, high: int, size: int) -> np.ndarray:
+            cells = np.minimum(np.arange(start, end + 1) * unit, size)
+            # Pixel p hoort bij cel c als rand(c) <= p < rand(c + 1), net als in Viewport.screen_to_cell.
+            return np.clip(np.ceil(low + (cells - offset) * view.zoom), low, high).astype(int)
+
+        self.xs = edges(self.u0, self.u1, view.x, area.left, area.right, width)
+        self.ys = edges(self.v0, self.v1, view.y, area.top, area.bottom, height)
+
+        self.overlay = pygame.Surface(area.size, pygame.SRCALPHA)
+        if view.zoom >= grid_zoom:
+            right, bottom = self.xs[-1] - area.left, self.ys[-1] - area.top
+            for x in self.xs - area.left:
+                if x < area.width:
+                    pygame.draw.line(self.overlay, black, (x, self.ys[0] - area.top), (x, bottom))
+            for y in self.ys - area.top:
+                if y < area.height:
+                    pygame.draw.line(self.overlay, black, (self.xs[0] - area.left, y), (right, y))
+
+    def __colours__(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Internal method returning the colour of every visible block as a ``(rows, columns, 3)`` array.
+        """
+        unit = self.viewport.unit
+        window = cells[self.v0 * unit:self.v1 * unit, self.u0 * unit:self.u1 * unit]
+        if unit == 1 or not window.size:
+            return np.take(self.palette, window, axis=0, mode="wrap")
+        rows = np.arange(0, window.shape[0], unit)
+        columns = np.arange(0, window.shape[1], unit)
+        if self.pooling == "mean":
+            counts = np.add.reduceat(np.add.reduceat((window > 0).astype(np.int64), rows, axis=0), columns, axis=1)
+            sizes = np.outer(np.diff(np.append(rows, window.shape[0])), np.diff(np.append(columns, window.shape[1])))
+            density = (counts / sizes)[:, :, np.newaxis]
+            return (np.array(white) * (1 - density) + np.array(black) * density).astype(np.uint8)
+        reduce = np.maximum if self.pooling == "max" else np.minimum
+        pooled = reduce.reduceat(reduce.reduceat(window, rows, axis=0), columns, axis=1)
+        return np.take(self.palette, pooled, axis=0, mode="wrap")
+
+    def draw(self, cells: np.ndarray) -> List[pygame.Rect]:
+        """
+        Draws the part of the view that changed since the previous call.
+
+        :param cells: 2D array of cell values.
+        :return: screen areas that were drawn, for ``pygame.display.update``.
+        """
+        height, width = cells.shape
+        state = (self.viewport.state, cells.shape)
+        full = self.previous is None or self.state != state
+        if full:
+            self.state = state
+            self.__layout__(width, height)
+        colours = self.__colours__(cells)
+
+        area = self.viewport.area
+        if full:
+            # Wis wat er vorige keer getekend is; het nieuwe beeld kan kleiner zijn of verschoven.
+            cleared = self.extent
+            if cleared is not None:
+                self.surface.fill(white, cleared)
+            self.extent = pygame.Rect(self.xs[0], self.ys[0], self.xs[-1] - self.xs[0] + 1,
+                                      self.ys[-1] - self.ys[0] + 1).clip(area)
+            x0, x1, y0, y1 = 0, colours.shape[1], 0, colours.shape[0]
+        else:
+            changed = (colours != self.previous).any(axis=2)
+            rows = np.flatnonzero(changed.any(axis=1))
+            if not len(rows):
+                return []
+            columns = np.flatnonzero(changed.any(axis=0))
+            x0, x1, y0, y1 = columns[0], columns[-1] + 1, rows[0], rows[-1] + 1
+        self.previous = colours
+
+        # Elk blok herhaald tot zijn grootte in pixels.
+        pixels = np.repeat(colours[y0:y1, x0:x1], np.diff(self.xs[x0:x1 + 1]), axis=1)
+        pixels = np.repeat(pixels, np.diff(self.ys[y0:y1 + 1]), axis=0)
+        position = (self.xs[x0], self.ys[y0])
+        if pixels.size:
+            self.surface.blit(pygame.surfarray.make_surface(pixels.transpose(1, 0, 2)), position)
+
+        if full:
+            dirty = self.extent if cleared is None else self.extent.union(cleared)
+        else:
+            dirty = pygame.Rect(position, (self.xs[x1] - self.xs[x0] + 1, self.ys[y1] - self.ys[y0] + 1)).clip(area)
+        self.surface.blit(self.overlay, dirty.topleft, dirty.move(-area.left, -area.top))
+        return [dirty]
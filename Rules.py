@@ -0,0 +1,183 @@
+import re
+import numpy as np
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+# Soort overgang per cel, voor het tellen van geboortes en sterfgevallen in dezelfde gather als de stap.
+STAY_DEAD, BIRTH, SURVIVE, DEATH = range(4)
+
+
+def fertility(age):
+    """
+    Determines the value of newborn cells and the range of ages that count as fertile.
+
+    :param age: age rule of the simulation, or ``None`` when age rules are not implemented.
+    :return: tuple ``(birthval, fertilestart, fertileend)``; the fertile bounds are ``None`` without age rules.
+    """
+    if age is None:
+        return 1, None, None
+    if age >= 4:
+        return age, age - 2, 2
+    return age, age, 0
+
+
+class Rule(NamedTuple):
+    """
+    Compiled birth/survival rule. The next value of a cell is looked up in a transition table indexed by its current
+    value, its number of living neighbours and its number of fertile neighbours, see ``tables``. Create rules with
+    ``compile_rule`` or ``parse_rule``, which cache them.
+
+    With ``age`` the rules of ``Simulator`` apply: newborn cells get the value ``age``, cells that do not survive lose
+    one, and only cells in a range of values count as fertile (see ``fertility``). With ``states`` (Generations rules,
+    see https://conwaylife.com/wiki/Generations) newborn cells get 1, only cells with value 1 count as neighbours, and
+    cells that do not survive pass through the values ``2..states-1`` before dying.
+    """
+    birth: FrozenSet[int]
+    survival: FrozenSet[int]
+    age: Optional[int] = None
+    states: Optional[int] = None
+
+    @property
+    def birthval(self) -> int:
+        """
+        Value of newborn cells.
+        """
+        return fertility(self.age)[0]
+
+    @property
+    def levels(self) -> int:
+        """
+        Number of cell values (from 0) the rule can produce, and the smallest table that covers them.
+        """
+        return self.states if self.states is not None else self.birthval + 1
+
+    @property
+    def fertile_is_alive(self) -> bool:
+        """
+        Whether exactly the living cells are fertile, as with classic and Generations rules.
+        """
+        return self.states is not None or self.age is None
+
+    def alive(self, cells: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Returns which cells count as living neighbours.
+
+        :param cells: cell values.
+        :param out: (optional) boolean array to write the result into.
+        """
+        return np.equal(cells, 1, out=out) if self.states is not None else np.greater(cells, 0, out=out)
+
+    def fertile(self, cells: np.ndarray, out: np.ndarray = None, scratch: np.ndarray = None) -> np.ndarray:
+        """
+        Returns which cells count as fertile neighbours; the same as ``alive`` for classic and Generations rules.
+
+        :param cells: cell values.
+        :param out: (optional) boolean array to write the result into.
+        :param scratch: (optional) boolean array of the same shape, used (and overwritten) for the range check.
+        """
+        if self.fertile_is_alive:
+            return self.alive(cells, out)
+        birthval, fertilestart, fertileend = fertility(self.age)
+        out = np.less_equal(cells, fertilestart, out=out)
+        out &= np.greater_equal(cells, fertileend, out=scratch)
+        return out
+
+    def tables(self, levels: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the transition tables for cell values ``-1..levels-1``, see ``transition_tables``.
+
+        :param levels: (optional) number of non-negative values to cover; at least ``self.levels``.
+        """
+        return transition_tables(self, max(levels or 0, self.levels))
+
+
+@lru_cache(maxsize=256)
+def transition_tables(rule: Rule, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds (and caches) the transition tables of a rule. Both are flat arrays of ``(levels + 1) * 81`` entries, indexed
+    by ``((value + 1) * 9 + living) * 9 + fertile``: values below -1 or above ``levels - 1`` must be clipped first.
+
+    :param rule: compiled rule.
+    :param levels: number of non-negative cell values to cover.
+    :return: tuple of the next values and the kind of each transition (``STAY_DEAD``, ``BIRTH``, ``SURVIVE`` or
+        ``DEATH``).
+    """
+    values = np.arange(-1, levels).reshape(-1, 1, 1)
+    living = np.arange(9).reshape(1, -1, 1)
+    fertile = np.arange(9).reshape(1, 1, -1)
+    born = (values == 0) & np.isin(fertile, list(rule.birth))
+    survives = np.isin(living, list(rule.survival))
+
+    if rule.states is None:
+        decayed = values - 1
+    else:
+        # Generations: wie niet overleeft gaat naar 2, daarna telt elke waarde op tot states, waar de cel sterft.
+        decayed = np.where(values == 1, 2, values + 1)
+        decayed = np.where(decayed >= rule.states, 0, decayed)
+        survives = survives & (values == 1)
+    table = np.where(values > 0, np.where(survives, values, decayed), np.where(born, rule.birthval, 0))
+
+    kinds = np.where(values > 0, np.where(table > 0, SURVIVE, DEATH), np.where(table > 0, BIRTH, STAY_DEAD))
+    table = np.broadcast_to(table, (levels + 1, 9, 9)).astype(np.int64).ravel()
+    kinds = np.broadcast_to(kinds, (levels + 1, 9, 9)).astype(np.uint8).ravel()
+    table.flags.writeable = False
+    kinds.flags.writeable = False
+    return table, kinds
+
+
+@lru_cache(maxsize=256)
+def _compile(birth: Tuple[int, ...], survival: Tuple[int, ...], age: Optional[int], states: Optional[int]) -> Rule:
+    rule = Rule(frozenset(birth), frozenset(survival), age, states)
+    rule.tables()  # Vooraf bouwen, zodat de eerste generatie er niet op wacht.
+    return rule
+
+
+def compile_rule(birth = [3], survival = [2,3], age = None, states = None) -> Rule:
+    """
+    Compiles (and caches) a rule.
+
+    :param birth: (optional) neighbour counts (of fertile cells) for which a dead cell becomes alive.
+    :param survival: (optional) neighbour counts (of living cells) for which a living cell keeps its value.
+    :param age: (optional) age rule; ``None`` for classic Game of Life.
+    :param states: (optional) number of states of a Generations rule; ``None`` (or 2) otherwise.
+    :return: compiled ``Rule``.
+    """
+    if states is not None and states <= 2:
+        states = None
+    if states is not None and age is not None:
+        raise ValueError("A rule cannot have both an age and Generations states")
+    birth = tuple(sorted({int(n) for n in birth if 0 <= n <= 8}))
+    survival = tuple(sorted({int(n) for n in survival if 0 <= n <= 8}))
+    return _compile(birth, survival, age, states)
+
+
+def parse_rule(rule: str, age: int = None) -> Rule:
+    """
+    Parses and compiles a rule in ``B3/S23`` notation, the older ``23/3`` survival/birth notation, or one of the
+    Generations notations ``B2/S345/C4`` and ``345/2/4``.
+
+    :param rule: rule string.
+    :param age: (optional) age rule to combine with a birth/survival rule.
+    :return: compiled ``Rule``.
+    """
+    match = re.fullmatch(r"\s*B(\d*)\s*/\s*S(\d*)\s*(?:/\s*[CG]?(\d+)\s*)?", rule, re.IGNORECASE)
+    if match:
+        birth, survival, states = match.groups()
+    else:
+        match = re.fullmatch(r"\s*S(\d*)\s*/\s*B(\d*)\s*(?:/\s*[CG]?(\d+)\s*)?", rule, re.IGNORECASE) \
+                or re.fullmatch(r"\s*(\d*)\s*/\s*(\d*)\s*(?:/\s*(\d+)\s*)?", rule)
+        if not match:
+            raise ValueError("Cannot parse rule {!r}".format(rule))
+        survival, birth, states = match.groups()
+    return compile_rule([int(n) for n in birth], [int(n) for n in survival], age,
+                        int(states) if states else None)
+
+
+def format_rule(birth, survival, states = None) -> str:
+    """
+    Formats a rule in ``B3/S23`` notation, with ``/C<states>`` for Generations rules.
+    """
+    text = "B{}/S{}".format("".join(str(n) for n in sorted(set(birth))), "".join(str(n) for n in sorted(set(survival))))
+    if states is not None and states > 2:
+        text += "/C{}".format(states)
+    return text
@@ -0,0 +1,385 @@
+import asyncio
+import json
+import struct
+import time
+import zlib
+import numpy as np
+from typing import List, NamedTuple, Optional
+from Simulator import Simulator
+
+# Berichten van de server: een volledig frame of de verschillen met een eerder verstuurd frame.
+KEYFRAME, DELTA = 1, 2
+# Soort, bytes per waarde, breedte, hoogte, generatie, volgnummer, volgnummer van de basis, lengte van de inhoud.
+HEADER = struct.Struct("<BBIIQQQI")
+
+
+class Frame(NamedTuple):
+    """
+    Generation published by a ``Server``. The serial number goes up with every published frame, also when only
+    edits changed the world, and identifies the base of delta frames. The cells are a read-only copy.
+    """
+    serial: int
+    generation: int
+    cells: np.ndarray
+
+
+def value_type(cells: np.ndarray) -> np.dtype:
+    """
+    Returns the smallest type the cells are sent as: one byte per cell when the values fit, four otherwise.
+    """
+    if cells.size == 0 or (cells.min() >= 0 and cells.max() <= 255):
+        return np.dtype("<u1")
+    return np.dtype("<i4")
+
+
+def encode_frame(frame: Frame, base: Frame = None) -> bytes:
+    """
+    Encodes a frame as a message: the cells that changed since ``base`` (a frame the client already has), or all
+    cells when there is no base, its shape differs or the delta would not be smaller. The content is zlib-compressed.
+
+    :param frame: frame to send.
+    :param base: (optional) frame the delta is computed against.
+    :return: header and content of the message.
+    """
+    height, width = frame.cells.shape
+    dtype = value_type(frame.cells)
+    kind, payload = KEYFRAME, None
+    if base is not None and base.cells.shape == frame.cells.shape:
+        changed = np.flatnonzero(frame.cells != base.cells)
+        if changed.size * (4 + dtype.itemsize) < frame.cells.size * dtype.itemsize:
+            kind = DELTA
+            payload = changed.astype("<u4").tobytes() + frame.cells.ravel()[changed].astype(dtype).tobytes()
+    if payload is None:
+        payload = frame.cells.astype(dtype).tobytes()
+    payload = zlib.compress(payload, 1)
+    return HEADER.pack(kind, dtype.itemsize, width, height, frame.generation, frame.serial,
+                       base.serial if kind == DELTA else 0, len(payload)) + payload
+
+
+def decode_frame(header: bytes, payload: bytes, base: Frame = None) -> Frame:
+    """
+    Decodes a message of ``encode_frame``.
+
+    :param header: the ``HEADER.size`` bytes the message starts with.
+    :param payload: the content following the header.
+    :param base: (optional) last frame decoded by the client, needed for delta frames.
+    :return: ``Frame`` with read-only cells.
+    """
+    kind, itemsize, width, height, generation, serial, base_serial, _ = HEADER.unpack(header)
+    dtype = np.dtype("<u1") if itemsize == 1 else np.dtype("<i4")
+    data = zlib.decompress(payload)
+    if kind == KEYFRAME:
+        cells = np.frombuffer(data, dtype=dtype).reshape(height, width).astype(int)
+    elif kind == DELTA:
+        if base is None or base.serial != base_serial:
+            raise ValueError("Delta frame {} needs frame {} as its base".format(serial, base_serial))
+        count = len(data) // (4 + itemsize)
+        changed = np.frombuffer(data, dtype="<u4", count=count)
+        cells = np.array(base.cells)
+        cells.ravel()[changed] = np.frombuffer(data, dtype=dtype, offset=4 * count)
+    else:
+        raise ValueError("Unknown message kind {}".format(kind))
+    cells.flags.writeable = False
+    return Frame(serial, generation, cells)
+
+
+async def receive(reader: asyncio.StreamReader, base: Frame = None) -> Frame:
+    """
+    Client side: reads the next message from a ``Server`` and decodes it, see ``decode_frame``.
+    """
+    header = await reader.readexactly(HEADER.size)
+    payload = await reader.readexactly(HEADER.unpack(header)[-1])
+    return decode_frame(header, payload, base)
+
+
+def encode_edits(cells) -> bytes:
+    """
+    Client side: encodes a batch of cell edits as a command line for a ``Server``.
+
+    :param cells: ``(x, y, value)`` per edited cell.
+    """
+    return json.dumps({"edit": [[int(v) for v in cell] for cell in cells]}).encode() + b"\n"
+
+
+class Subscriber:
+    """
+    Connection of one client to a ``Server``, with the last frame it was sent.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.sent = None
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+
+class Server:
+    """
+    Steps a ``Simulator`` in an asyncio event loop and streams its generations to any number of clients over TCP or
+    a local (Unix) socket. Every client gets a keyframe first and then delta frames, see ``encode_frame``.
+
+    Each client is sent the newest frame whenever its connection has room for it; a slow client skips the frames
+    published while it was busy instead of holding up the simulation or the other clients. The generations are
+    computed in a worker thread, so the connections are served while a generation is computed.
+
+    Clients send commands as lines of JSON: ``{"edit": [[x, y, value], ...]}`` queues a batch of cell edits, which
+    are applied together between generations; ``{"keyframe": true}`` asks for a full frame. A client sending anything
+    else, or an edit outside the world or with a value outside ``0..max_value``, is disconnected.
+    """
+
+    def __init__(self, simulator: Simulator, host: str = "127.0.0.1", port: int = 0, path: str = None,
+                 rate: float = None, buffer: int = 1 << 18, max_value: int = None):
+        """
+        Constructor of the server. Call ``start`` (or ``run``) from a running event loop to accept clients.
+
+        :param simulator: simulator to step; only the server should use it while it runs.
+        :param host: (optional) address to listen on.
+        :param port: (optional) TCP port to listen on; ``0`` picks a free one, see ``address``.
+        :param path: (optional) path of a Unix socket to listen on instead of TCP.
+        :param rate: (optional) target number of generations per second; ``None`` steps as fast as possible.
+        :param buffer: (optional) bytes that may wait to be sent to a client before it skips frames.
+        :param max_value: (optional) largest cell value clients may set; the largest value of the simulator's rule
+            by default.
+        """
+        self.simulator = simulator
+        self.host = host
+        self.port = port
+        self.path = path
+        self.rate = rate
+        self.buffer = buffer
+        self.max_value = max_value
+        self.server = None
+        self.subscribers: List[Subscriber] = []
+        self.edits = []  # Batches (xs, ys, values) die voor de volgende generatie worden toegepast.
+        self.playing = True
+        self.closed = False
+        self.wakeup = None
+        self.serial = 0
+        self.frame = None
+        self.encoded = {}  # Volgnummer van de basis -> bericht voor het nieuwste frame.
+        self.__publish__(self.__snapshot__())
+
+    @property
+    def address(self):
+        """
+        Address the server listens on: ``(host, port)`` for TCP, the socket path otherwise.
+        """
+        return self.server.sockets[0].getsockname() if self.server else None
+
+    async def start(self) -> None:
+        """
+        Starts accepting clients.
+        """
+        self.wakeup = asyncio.Event()
+        if self.path is not None:
+            self.server = await asyncio.start_unix_server(self.__connect__, self.path)
+        else:
+            self.server = await asyncio.start_server(self.__connect__, self.host, self.port)
+
+    async def run(self, generations: int = None) -> None:
+        """
+        Starts the server if needed and steps the simulator until ``close`` (or ``generations`` steps).
+
+        :param generations: (optional) number of generations to compute before returning.
+        """
+        if self.server is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        next_step = time.perf_counter()
+        while not self.closed and (generations is None or generations > 0):
+            if self.edits:
+                self.__apply_edits__()
+            if not self.playing:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                next_step = time.perf_counter()
+                continue
+            if self.rate is not None:
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self.wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    self.wakeup.clear()
+                    continue
+                next_step = max(next_step + 1 / self.rate, time.perf_counter() - 1 / self.rate)
+
+            self.__publish__(await loop.run_in_executor(None, self.__step__))
+            if generations is not None:
+                generations -= 1
+
+    def play(self) -> None:
+        """
+        Starts (or resumes) stepping.
+        """
+        self.playing = True
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def pause(self) -> None:
+        """
+        Pauses stepping after the current generation; edits are still applied and published.
+        """
+        self.playing = False
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def edit(self, xs, ys, values = 1) -> None:
+        """
+        Queues a batch of cell edits, applied together before the next generation (see ``Simulator.set_cells``).
+        """
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        self.edits.append((xs, np.asarray(ys, dtype=np.int64).ravel(), np.broadcast_to(values, xs.shape)))
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def close(self) -> None:
+        """
+        Stops stepping, disconnects all clients and stops listening.
+        """
+        self.closed = True
+        if self.wakeup is not None:
+            self.wakeup.set()
+        if self.server is not None:
+            self.server.close()
+        tasks = [subscriber.task for subscriber in self.subscribers if subscriber.task is not None]
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    def __step__(self) -> np.ndarray:
+        """
+        Internal method, run in a worker thread: computes the next generation and copies its cells.
+        """
+        self.simulator.update()
+        return self.__snapshot__()
+
+    def __snapshot__(self) -> np.ndarray:
+        """
+        Internal method returning a read-only copy of the current cells.
+        """
+        cells = np.array(self.simulator.get_world().world)
+        cells.flags.writeable = False
+        return cells
+
+    def __publish__(self, cells: np.ndarray) -> None:
+        """
+        Internal method that makes the cells the newest frame and wakes up the clients.
+        """
+        self.serial += 1
+        self.frame = Frame(self.serial, self.simulator.get_generation(), cells)
+        self.encoded = {}
+        for subscriber in self.subscribers:
+            subscriber.wakeup.set()
+
+    def __apply_edits__(self) -> None:
+        """
+        Internal method that applies all queued edits at once and publishes the result.
+        """
+        edits, self.edits = self.edits, []
+        self.simulator.set_cells(np.concatenate([xs for xs, _, _ in edits]), np.concatenate([ys for _, ys, _ in edits]),
+                                 np.concatenate([values for _, _, values in edits]))
+        self.__publish__(self.__snapshot__())
+
+    def __encode__(self, base: Optional[Frame]) -> bytes:
+        """
+        Internal method returning the message with the newest frame for a client that has ``base``. Clients that are
+        in step share the encoded message.
+        """
+        serial = base.serial if base is not None else 0
+        if serial not in self.encoded:
+            self.encoded[serial] = encode_frame(self.frame, base)
+        return self.encoded[serial]
+
+    async def __connect__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Internal method serving one client: sends it frames while reading its commands.
+        """
+        subscriber = Subscriber(reader, writer)
+        subscriber.task = asyncio.current_task()
+        writer.transport.set_write_buffer_limits(high=self.buffer)
+        self.subscribers.append(subscriber)
+        subscriber.wakeup.set()
+        sender = asyncio.ensure_future(self.__send__(subscriber))
+        try:
+            while not self.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not self.__command__(subscriber, line):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.subscribers.remove(subscriber)
+            sender.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    def __command__(self, subscriber: Subscriber, line: bytes) -> bool:
+        """
+        Internal method handling one command line of a client.
+
+        :return: whether the command was valid.
+        """
+        try:
+            command = json.loads(line)
+            if not isinstance(command, dict) or not set(command) <= {"edit", "keyframe"}:
+                return False
+            if command.get("edit"):
+                cells = self.__check_edits__(command["edit"])
+                if cells is None:
+                    return False
+                self.edit(cells[:, 0], cells[:, 1], cells[:, 2])
+        except (ValueError, TypeError, OverflowError):
+            return False
+        if command.get("keyframe"):
+            subscriber.sent = None
+            subscriber.wakeup.set()
+        return True
+
+    def __check_edits__(self, edits) -> Optional[np.ndarray]:
+        """
+        Internal method checking the cells of an edit command: a list of ``[x, y]`` or ``[x, y, value]`` of integers,
+        inside the world and with values in ``0..max_value``.
+
+        :return: ``(N, 3)`` array of ``x, y, value``, or ``None`` when an edit is invalid.
+        """
+        if not isinstance(edits, list):
+            return None
+        for cell in edits:
+            if not isinstance(cell, list) or len(cell) not in (2, 3) \
+                    or not all(isinstance(n, int) and not isinstance(n, bool) for n in cell):
+                return None
+        cells = np.array([cell + [1] if len(cell) == 2 else cell for cell in edits], dtype=np.int64).reshape(-1, 3)
+        world = self.simulator.get_world()
+        highest = self.max_value if self.max_value is not None else self.simulator.rule.levels - 1
+        xs, ys, values = cells.T
+        if np.any((xs < 0) | (xs >= world.width) | (ys < 0) | (ys >= world.height) | (values < 0) | (values > highest)):
+            return None
+        return cells
+
+    async def __send__(self, subscriber: Subscriber) -> None:
+        """
+        Internal method sending the newest frame to a client whenever there is one it does not have yet. Waiting for
+        the connection to drain is what makes slow clients skip frames.
+        """
+        try:
+            while True:
+                await subscriber.wakeup.wait()
+                subscriber.wakeup.clear()
+                frame = self.frame
+                if subscriber.sent is frame:
+                    continue
+                subscriber.writer.write(self.__encode__(subscriber.sent))
+                subscriber.sent = frame
+                await subscriber.writer.drain()
+        except ConnectionError:
+            subscriber.writer.close()
@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+import numpy as np
+from typing import NamedTuple
+from Simulator import Simulator
+
+
+class Frame(NamedTuple):
+    """
+    Finished generation published by a ``SimulationThread``. The cells are a read-only copy.
+    """
+    generation: int
+    cells: np.ndarray
+
+
+class SimulationThread(threading.Thread):
+    """
+    Steps a ``Simulator`` on a background thread at its own rate, so a slow generation does not block the UI.
+    After every generation an immutable ``Frame`` replaces the previous one; readers always get the newest finished
+    frame. Cell edits are queued and applied between generations.
+    """
+
+    def __init__(self, simulator: Simulator, rate: float = None) -> None:
+        """
+        Constructor of the simulation thread. The thread starts paused; call ``start`` and then ``play``.
+
+        :param simulator: simulator to step; only this thread should use it while it runs.
+        :param rate: (optional) target number of generations per second; ``None`` steps as fast as possible.
+        """
+        super().__init__(daemon=True)
+        self.simulator = simulator
+        self.rate = rate
+        self.edits = queue.SimpleQueue()
+        self.playing = False
+        self.stopped = False
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.frame = None
+        self.__publish__()
+
+    def __publish__(self) -> None:
+        """
+        Internal method that publishes the current generation as the newest frame.
+        """
+        cells = np.array(self.simulator.get_world().world)
+        cells.flags.writeable = False
+        frame = Frame(self.simulator.get_generation(), cells)
+        with self.lock:
+            self.frame = frame
+
+    def latest(self) -> Frame:
+        """
+        Returns the newest finished generation.
+
+        :return: ``Frame`` with the generation number and read-only cells.
+        """
+        with self.lock:
+            return self.frame
+
+    def edit(self, x: int, y: int, value: int) -> None:
+        """
+        Queues a cell edit; it is applied before the next generation is computed (or right away when paused).
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :param value: new value of the cell.
+        """
+        self.edits.put((x, y, value))
+        self.wakeup.set()
+
+    def play(self) -> None:
+        """
+        Starts (or resumes) stepping.
+        """
+        self.playing = True
+        self.wakeup.set()
+
+    def pause(self) -> None:
+        """
+        Pauses stepping after the current generation.
+        """
+        self.playing = False
+        self.wakeup.set()
+
+    def stop(self) -> None:
+        """
+        Stops the thread and waits for it to finish.
+        """
+        self.stopped = True
+        self.wakeup.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self) -> None:
+        """
+        Thread body: applies queued edits, steps when playing and publishes frames until ``stop``.
+        """
+        next_step = time.perf_counter()
+        while not self.stopped:
+            edited = False
+            while not self.edits.empty():
+                x, y, value = self.edits.get()
+                self.simulator.set_cell(x, y, value)
+                edited = True
+            if edited:
+                self.__publish__()
+
+            if not self.playing:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                next_step = time.perf_counter()
+                continue
+            if self.rate is not None:
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    self.wakeup.wait(delay)
+                    self.wakeup.clear()
+                    continue
+                next_step = max(next_step + 1 / self.rate, time.perf_counter() - 1 / self.rate)
+
+            self.simulator.update()
+            self.__publish__()
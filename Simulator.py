@@ -1,5 +1,188 @@
+import cProfile
+import pstats
+import time
 import pandas
+import numpy as np
+from collections import OrderedDict, deque
+from typing import NamedTuple, Optional, Tuple
 from World import *
+from HashLife import HashLife
+from Rules import Rule, compile_rule, parse_rule, BIRTH, SURVIVE, DEATH
+from History import History
+
+ENGINES = ("vectorized", "loop", "sparse")
+
+
+class Metrics(NamedTuple):
+    """
+    Measurements of one generation, passed to hooks registered with ``Simulator.add_hook(hook, metrics=True)``.
+    """
+    generation: int
+    duration: float  # Seconden voor het berekenen van de generatie.
+    births: Optional[int]  # Dode cellen die levend werden.
+    deaths: Optional[int]  # Levende cellen die dood gingen.
+    survivors: Optional[int]  # Levende cellen die levend bleven.
+    population: int
+    ages: Optional[np.ndarray]  # Aantal levende cellen per waarde (index 0 is altijd 0); alleen met leeftijdsregels.
+
+
+def step_statistics(before: np.ndarray, after: np.ndarray, age = None) -> dict:
+    """
+    Computes the ``Metrics`` counts by comparing two generations, for engines that cannot count while stepping.
+
+    :param before: cells before the step.
+    :param after: cells after the step.
+    :param age: (optional) age rule; the age histogram is only computed with age rules.
+    :return: dictionary with ``births``, ``deaths``, ``survivors``, ``population`` and ``ages``.
+    """
+    was_alive, alive = before > 0, after > 0
+    survivors = int(np.count_nonzero(was_alive & alive))
+    population = int(np.count_nonzero(alive))
+    return {"births": population - survivors, "deaths": int(np.count_nonzero(was_alive)) - survivors,
+            "survivors": survivors, "population": population,
+            "ages": None if age is None else np.bincount(after[alive].ravel())}
+
+
+class Workspace:
+    """
+    Preallocated arrays for stepping cells of one shape without allocating, see ``step_padded``.
+    """
+
+    def __init__(self, shape, dtype, padded: np.ndarray = None):
+        """
+        Constructor of the workspace.
+
+        :param shape: ``(height, width)`` of the cells (without halo).
+        :param dtype: dtype of the cells.
+        :param padded: (optional) existing array with the halo to use instead of allocating one.
+        """
+        height, width = shape
+        self.padded = np.empty((height + 2, width + 2), dtype=dtype) if padded is None else padded
+        self.alive = np.empty(self.padded.shape, dtype=bool)
+        self.fertile = np.empty(self.padded.shape, dtype=bool)
+        self.neighborcount = np.empty(shape, dtype=np.uint8)
+        self.breedingneighborcount = np.empty(shape, dtype=np.uint8)
+        self.index = np.empty(shape, dtype=np.intp)
+
+    def wrap(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Copies the cells into ``padded`` with a halo that wraps around, like ``np.pad(cells, 1, mode="wrap")``.
+
+        :return: ``padded``.
+        """
+        padded = self.padded
+        padded[1:-1, 1:-1] = cells
+        padded[0, 1:-1] = cells[-1]
+        padded[-1, 1:-1] = cells[0]
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+        return padded
+
+
+def step_padded(padded: np.ndarray, out: np.ndarray, rule: Rule, workspace: Workspace, stats: dict = None) -> np.ndarray:
+    """
+    Computes the next generation of the interior of ``padded`` into ``out``, using only the arrays of ``workspace``.
+    After counting the neighbours, the next value of every cell is a single lookup in the transition table of the
+    rule (see ``Rules.transition_tables``). The table only covers the values the rule produces; larger values are
+    looked up as the largest one and corrected afterwards, so it does not grow with the values in the world.
+
+    :param padded: 2D array of cell values surrounded by a one-cell halo that only contributes neighbours.
+    :param out: array of the interior shape to write the next generation into; must not overlap ``padded``.
+    :param rule: compiled rule.
+    :param workspace: arrays for the intermediate results, for the interior shape.
+    :param stats: (optional) dictionary that is filled with the ``Metrics`` counts of the step, looked up with the
+        same table index as the next values.
+    :return: ``out``.
+    """
+    height, width = out.shape
+
+    # Booleans als uint8 bekeken, zodat het optellen zonder omzetten (en tijdelijke buffers) gebeurt.
+    alive = rule.alive(padded, out=workspace.alive).view(np.uint8)
+    neighborcount = workspace.neighborcount
+    neighborcount.fill(0)
+    for dy in range(3):
+        for dx in range(3):
+            if dy == 1 and dx == 1:
+                continue
+            np.add(neighborcount, alive[dy:dy + height, dx:dx + width], out=neighborcount)
+    if rule.fertile_is_alive:
+        breedingneighborcount = neighborcount
+    else:
+        # alive is niet meer nodig en dient als kladruimte.
+        fertile = rule.fertile(padded, out=workspace.fertile, scratch=workspace.alive).view(np.uint8)
+        breedingneighborcount = workspace.breedingneighborcount
+        breedingneighborcount.fill(0)
+        for dy in range(3):
+            for dx in range(3):
+                if dy == 1 and dx == 1:
+                    continue
+                np.add(breedingneighborcount, fertile[dy:dy + height, dx:dx + width], out=breedingneighborcount)
+
+    cells = padded[1:-1, 1:-1]
+    # Minstens 0 en 1 in de tabel: met age=0 is levels 1, maar een levende cel moet als levend opgezocht worden.
+    levels = max(rule.levels, 2)
+    table, kinds = rule.tables(levels)
+    index = np.clip(cells, -1, levels - 1, out=workspace.index)
+    index += 1
+    index *= 9
+    index += neighborcount
+    index *= 9
+    index += breedingneighborcount
+    # mode="clip" voorkomt een tijdelijke buffer; de index valt altijd binnen de tabel.
+    np.take(table if table.dtype == out.dtype else table.astype(out.dtype), index, out=out, mode="clip")
+
+    # Waarden boven de tabel (bijvoorbeeld met de hand gezette leeftijden) zijn opgezocht als levels - 1: een
+    # overlevende cel houdt zijn waarde, een andere verliest er een. Generations-cellen boven states sterven al goed.
+    high = None
+    if rule.states is None and cells.size and cells.max() >= levels:
+        high = cells >= levels
+        out[high] += cells[high] - (levels - 1)
+
+    if stats is not None:
+        transitions = np.take(kinds, index)
+        if high is not None:
+            transitions[high] = SURVIVE  # Waarden van minstens 2 blijven levend.
+        counts = np.bincount(transitions.ravel(), minlength=4)
+        births, survivors, deaths = int(counts[BIRTH]), int(counts[SURVIVE]), int(counts[DEATH])
+        stats.update(births=births, deaths=deaths, survivors=survivors, population=births + survivors, ages=None)
+        if rule.age is not None:
+            stats["ages"] = np.bincount(out[out > 0].ravel(), minlength=rule.birthval + 1)
+    return out
+
+
+def evolve_padded(padded: np.ndarray, birth, survival, age = None, stats: dict = None, rule: Rule = None) -> np.ndarray:
+    """
+    Computes the next generation of the interior of ``padded`` into a new array, see ``step_padded``.
+
+    :param padded: 2D array of cell values surrounded by a one-cell halo.
+    :param birth: neighbour counts (of fertile cells) for which a dead cell becomes alive.
+    :param survival: neighbour counts (of living cells) for which a living cell keeps its age.
+    :param age: (optional) age rule; ``None`` for classic Game of Life.
+    :param stats: (optional) dictionary that is filled with the ``Metrics`` counts of the step.
+    :param rule: (optional) compiled rule to use instead of ``birth``, ``survival`` and ``age``.
+    :return: array with the next generation of the interior cells.
+    """
+    if rule is None:
+        rule = compile_rule(birth, survival, age)
+    shape = (padded.shape[0] - 2, padded.shape[1] - 2)
+    out = np.empty(shape, dtype=padded.dtype)
+    return step_padded(padded, out, rule, Workspace(shape, padded.dtype, padded), stats)
+
+
+def evolve(cells: np.ndarray, birth, survival, age = None, stats: dict = None, rule: Rule = None) -> np.ndarray:
+    """
+    Computes the next generation of a toroidal array of cells; edges wrap around like ``World.get_neighbours``.
+
+    :param cells: 2D array of cell values.
+    :param birth: neighbour counts (of fertile cells) for which a dead cell becomes alive.
+    :param survival: neighbour counts (of living cells) for which a living cell keeps its age.
+    :param age: (optional) age rule; ``None`` for classic Game of Life.
+    :param stats: (optional) dictionary that is filled with the ``Metrics`` counts of the step.
+    :param rule: (optional) compiled rule to use instead of ``birth``, ``survival`` and ``age``.
+    :return: array with the next generation.
+    """
+    return evolve_padded(np.pad(cells, 1, mode="wrap"), birth, survival, age, stats, rule)
+
 
 class Simulator:
     """
@@ -7,30 +190,321 @@ class Simulator:
     Read https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life for an introduction to Conway's Game of Life.
     """
 
-    def __init__(self, world = None, birth = [3], survival = [2,3], age = None):
+    def __init__(self, world = None, birth = [3], survival = [2,3], age = None, engine: str = "vectorized", tile_size: int = 64,
+                 max_period: int = 0, rule = None, double_buffer: bool = True):
         """
         Constructor for Game of Life simulator.
 
         :param world: (optional) environment used to simulate Game of Life.
+        :param double_buffer: (optional) compute generations alternately into two buffers owned by the simulator instead of allocating a new ``World`` per generation; see ``update`` for how long returned worlds stay valid.
+        :param rule: (optional) rule string such as ``"B36/S23"`` or ``"B2/S345/C4"`` (Generations), or a compiled ``Rule``; replaces ``birth``, ``survival`` and ``age``.
+        :param engine: (optional) update engine; ``"vectorized"`` steps the whole array at once, ``"sparse"`` only recomputes tiles near last generation's changes, ``"loop"`` is the cell-by-cell reference implementation.
+        :param tile_size: (optional) width and height of the tiles tracked by the ``"sparse"`` engine.
+        :param max_period: (optional) longest cycle to detect; ``0`` turns cycle detection off. See ``cycle``.
         """
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine {!r}, expected one of {}".format(engine, ENGINES))
         self.generation = 0
         if world is None:
             self.world = World(20)
         else:
             self.world = world
 
-        self.age = age
-        self.birth = birth
-        self.survival = survival
+        self.rule = compile_rule(birth, survival, age) if rule is None else rule
+        self.engine = engine
+        self.hashlife = None
+
+        # Dubbele buffering: twee eigen werelden waar de generaties afwisselend in berekend worden.
+        self.double_buffer = double_buffer
+        self.buffers = []
+        self.workspace = None
+
+        # Administratie van de "sparse" engine.
+        self.tile_size = tile_size
+        self.dirty_tiles = None  # Tegels die in de vorige generatie veranderden.
+        self.tiled_world = None  # Wereld waar dirty_tiles bij hoort.
+        self.tiled_source = None  # Wereld waar tiled_world uit berekend is.
+        self.tiled_rules = None
+        self.active_tiles = 0  # Aantal herberekende tegels in de laatste generatie.
+        self.total_tiles = 0
+
+        # Cyclusdetectie: digests van de laatste max_period generaties.
+        self.max_period = max_period
+        self.seen = OrderedDict()  # digest -> generatie waarin die toestand het laatst voorkwam.
+        self.seen_rules = None
+        self.cycle = None  # (first_seen, period) zodra een toestand terugkeert.
+        self.extinct = False
+
+        self.hooks = []  # Functies die na elke generatie met de simulator aangeroepen worden.
+        self.metrics_hooks = []  # Functies die daarnaast de Metrics van de generatie krijgen.
+        self.metrics = None  # Metrics van de laatste generatie, alleen bijgehouden als er metrics_hooks zijn.
+
+        # Profileren van elke profile_every-ste generatie.
+        self.profile_every = 0
+        self.profile_callback = None
+        self.profiles = deque(maxlen=16)  # (generatie, pstats.Stats) als er geen profile_callback is.
+
+        self.history = None  # Bewaarde generaties voor at(), zie keep_history.
+
+    @property
+    def rule(self) -> Rule:
+        """
+        Compiled rule of the simulation. Assign a ``Rule`` or a rule string to change it; the transition table is
+        compiled once, when the rule is set.
+        """
+        return self.compiled_rule
+
+    @rule.setter
+    def rule(self, rule) -> None:
+        self.compiled_rule = parse_rule(rule) if isinstance(rule, str) else rule
+
+    @property
+    def birth(self) -> Tuple[int, ...]:
+        """
+        Neighbour counts (of fertile cells) for which a dead cell becomes alive, as a sorted tuple. Assign a new list
+        to change them; the tuple itself cannot be edited.
+        """
+        return tuple(sorted(self.rule.birth))
+
+    @birth.setter
+    def birth(self, birth) -> None:
+        self.rule = compile_rule(birth, self.rule.survival, self.rule.age, self.rule.states)
+
+    @property
+    def survival(self) -> Tuple[int, ...]:
+        """
+        Neighbour counts (of living cells) for which a living cell keeps its age, as a sorted tuple. Assign a new list
+        to change them; the tuple itself cannot be edited.
+        """
+        return tuple(sorted(self.rule.survival))
+
+    @survival.setter
+    def survival(self, survival) -> None:
+        self.rule = compile_rule(self.rule.birth, survival, self.rule.age, self.rule.states)
+
+    @property
+    def age(self) -> Optional[int]:
+        """
+        Age rule of the simulation; ``None`` for classic Game of Life.
+        """
+        return self.rule.age
+
+    @age.setter
+    def age(self, age) -> None:
+        self.rule = compile_rule(self.rule.birth, self.rule.survival, age, self.rule.states)
 
     def update(self) -> World:
         """
         Updates the state of the world to the next generation. Uses rules for evolution.
 
+        With ``double_buffer`` (the default) the vectorized and sparse engines write the new generation into one of
+        two buffers owned by the simulator. The returned ``World`` therefore stays valid until the second ``update``
+        after it, which overwrites it; copy ``world.world`` to keep a generation for longer, or use ``at``. A world
+        passed in by the caller (to the constructor or ``set_world``) is never written to.
+
         :return: New state of the world.
         """
+        if self.max_period:
+            self.__track_cycles__(before_step=True)
         self.generation += 1
+        if self.metrics_hooks or self.profile_every:
+            self.world = self.__instrumented_step__()
+        else:
+            self.world = self.__step__()
+        if self.max_period:
+            self.__track_cycles__()
+        if self.history is not None:
+            self.history.record(self.generation, self.world.world, self.rule)
+        for hook in self.hooks:
+            hook(self)
+        for hook in self.metrics_hooks:
+            hook(self, self.metrics)
+        return self.world
+
+    def keep_history(self, interval: int = 100, budget: int = 64 << 20) -> History:
+        """
+        Starts remembering generations from the current one on, so ``at`` can return them. Called by ``at`` with the
+        default settings when needed. Replacing or editing the world (``set_world``, ``set_cell``) starts the history
+        again at the current generation.
+
+        :param interval: (optional) initial number of generations between checkpoints; looking up a generation that
+            is no longer cached recomputes at most one interval. The interval doubles whenever the checkpoints are
+            thinned to stay within the budget, see ``History``.
+        :param budget: (optional) most bytes used for the checkpoints and the cached recent generations together.
+        :return: the ``History``.
+        """
+        if not hasattr(self.world, "world"):
+            raise ValueError("keep_history() needs a world with an array of cells")
+        self.history = History(lambda cells, rule: evolve(cells, None, None, rule=rule), interval, budget)
+        self.history.reset(self.generation, self.world.world, self.rule)
+        return self.history
+
+    def at(self, generation: int) -> World:
+        """
+        Returns the world at any generation since the history started (see ``keep_history``), including future
+        generations. Generations that are not stored are computed on demand from the nearest checkpoint, without
+        changing the current world or generation of the simulator.
 
+        :param generation: number of the generation.
+        :return: ``World`` with read-only cells; it stays valid when the simulator moves on.
+        """
+        if self.history is None:
+            self.keep_history()
+        return self.history.at(generation)
+
+    def add_hook(self, hook, metrics: bool = False) -> None:
+        """
+        Registers a function that is called with the simulator after every generation, for example a ``Recorder``.
+
+        :param hook: callable taking the ``Simulator``.
+        :param metrics: (optional) also pass the ``Metrics`` of the generation: the hook is called as
+            ``hook(simulator, metrics)``. Metrics are only measured while such hooks are registered.
+        """
+        if metrics:
+            self.metrics_hooks.append(hook)
+        else:
+            self.hooks.append(hook)
+
+    def remove_hook(self, hook) -> None:
+        """
+        Unregisters a function added with ``add_hook``.
+
+        :param hook: callable to remove.
+        """
+        if hook in self.metrics_hooks:
+            self.metrics_hooks.remove(hook)
+        else:
+            self.hooks.remove(hook)
+
+    def set_profiling(self, every: int, callback = None) -> None:
+        """
+        Profiles every ``every``-th generation with ``cProfile``.
+
+        :param every: profile the generations that are a multiple of this number; ``0`` turns profiling off.
+        :param callback: (optional) callable receiving the generation and its ``pstats.Stats``; by default the last
+            16 profiles are kept in ``profiles``.
+        """
+        self.profile_every = every
+        self.profile_callback = callback
+
+    def __instrumented_step__(self) -> World:
+        """
+        Internal method that computes the next generation like ``__step__``, while measuring ``metrics`` and profiling
+        when requested. The vectorized engine counts births and deaths in the same pass as the step; other engines
+        and worlds are compared with the previous generation afterwards.
+
+        :return: New state of the world.
+        """
+        stats = {} if self.metrics_hooks else None
+        profiler = None
+        if self.profile_every and self.generation % self.profile_every == 0:
+            profiler = cProfile.Profile()
+        before = self.world
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        world = self.__step__(stats)
+        if profiler is not None:
+            profiler.disable()
+        duration = time.perf_counter() - start
+        if profiler is not None:
+            profile = pstats.Stats(profiler)
+            if self.profile_callback is not None:
+                self.profile_callback(self.generation, profile)
+            else:
+                self.profiles.append((self.generation, profile))
+
+        if stats is not None:
+            if not stats:
+                if hasattr(world, "world"):
+                    stats = step_statistics(np.asarray(before.world), np.asarray(world.world), self.age)
+                else:  # Geen array om te vergelijken (SparseWorld): alleen de populatie.
+                    stats = {"births": None, "deaths": None, "survivors": None, "population": world.population,
+                             "ages": None}
+            self.metrics = Metrics(self.generation, duration, **stats)
+        return world
+
+    def __step__(self, stats: dict = None) -> World:
+        """
+        Internal method that computes the next generation with the selected engine.
+
+        :param stats: (optional) dictionary for the ``Metrics`` counts; engines that count while stepping fill it.
+        :return: New state of the world.
+        """
+        if self.rule.states is not None and (hasattr(self.world, "evolve") or self.engine == "loop"):
+            raise ValueError("Generations rules need the vectorized or sparse engine on a World")
+        if hasattr(self.world, "evolve"):  # Werelden met een eigen opslagvorm rekenen zelf de volgende generatie uit.
+            return self.world.evolve(self.birth, self.survival, self.age)
+        if self.engine == "loop":
+            return self.__update_loop__()
+        if self.engine == "sparse":
+            return self.__update_sparse__()
+        newworld = self.__next_buffer__()
+        step_padded(self.workspace.wrap(self.world.world), newworld.world, self.rule, self.workspace, stats)
+        return newworld
+
+    def __next_buffer__(self) -> World:
+        """
+        Internal method returning the world to compute the next generation into: the buffer that does not hold the
+        current world, or a new world without ``double_buffer``. (Re)allocates the buffers and the workspace when the
+        shape or dtype of the world changed.
+        """
+        cells = self.world.world
+        if self.workspace is None or self.workspace.index.shape != cells.shape or self.workspace.padded.dtype != cells.dtype:
+            self.workspace = Workspace(cells.shape, cells.dtype)
+            self.buffers = []
+        if not self.double_buffer:
+            return World(self.world.width, self.world.height, np.empty_like(cells))
+        if not self.buffers:
+            self.buffers = [World(self.world.width, self.world.height, np.empty_like(cells)) for _ in range(2)]
+        return self.buffers[1] if self.world is self.buffers[0] else self.buffers[0]
+
+    def __track_cycles__(self, before_step: bool = False) -> None:
+        """
+        Internal method that records a digest of the current world and checks whether the state occurred within the
+        last ``max_period`` generations. Only the digests are kept, never copies of the grids.
+
+        :param before_step: whether the call is made before stepping; it then only starts the history when needed.
+        """
+        if before_step:
+            if self.seen and self.seen_rules == self.rule:
+                return
+            # Nieuwe wereld of andere regels: begin opnieuw.
+            self.__reset_cycles__()
+            self.seen_rules = self.rule
+
+        while self.seen and next(iter(self.seen.values())) < self.generation - self.max_period:
+            self.seen.popitem(last=False)
+        digest = self.world.digest()
+        self.extinct = self.world.population == 0
+        previous = self.seen.pop(digest, None)
+        if previous is not None and self.cycle is None:
+            self.cycle = (previous, self.generation - previous)
+        self.seen[digest] = self.generation
+
+    def __reset_cycles__(self) -> None:
+        """
+        Internal method that forgets the recorded states, after the world was replaced or edited.
+        """
+        self.seen.clear()
+        self.cycle = None
+        self.extinct = False
+
+    def settled(self) -> bool:
+        """
+        Returns whether the world died out or came back to an earlier state, after which nothing new will happen.
+        Requires cycle detection to be enabled with ``max_period``.
+
+        :return: ``True`` once ``extinct`` is set or a ``cycle`` ``(first_seen, period)`` was found.
+        """
+        return self.extinct or self.cycle is not None
+
+    def __update_loop__(self) -> World:
+        """
+        Reference engine: evolves the world cell by cell. Slow, but kept to check the vectorized engine against.
+
+        :return: New state of the world.
+        """
         # Iterate over all the cells.
         newworld = World(self.world.width, self.world.height)
 
@@ -80,8 +554,147 @@ class Simulator:
                     else:  # Anders; tel 1 af van de age.
                         newworld.set(x,y,self.world.get(x,y) - 1)
 
-        self.world = newworld
+        return newworld
+
+    def __update_sparse__(self) -> World:
+        """
+        Incremental engine: only recomputes tiles that changed in the previous generation, plus their neighbouring
+        tiles (wrapping around the edges). Any other tile sees the same neighbourhood as last generation, so it cannot
+        change. Everything is recomputed after ``set_world``, a rule change or the first generation; edits made
+        through ``set_cell``, ``set_cells`` or ``World.set`` on the current world mark their tile. Writes straight
+        into the ``world`` array (including ``World.stamp`` and ``World.fill_random``) are not noticed: make them
+        before ``set_world``, or call ``set_world`` again afterwards.
+
+        The buffer that is written holds the generation before the current one, which only differs from it in tiles
+        that are recomputed anyway, so it is only copied in full when it holds something else.
+
+        :return: New state of the world.
+        """
+        cells = self.world.world
+        height, width = cells.shape
+        size = self.tile_size
+        rows, cols = -(-height // size), -(-width // size)
+        if self.tiled_world is not self.world or self.tiled_rules != self.rule or self.dirty_tiles is None \
+                or self.dirty_tiles.shape != (rows, cols):
+            dirty = np.ones((rows, cols), dtype=bool)
+        else:
+            dirty = self.dirty_tiles
+            if self.world.edits:
+                xs, ys = np.array(self.world.edits).T
+                dirty[ys // size, xs // size] = True
+        if self.world.edits is not None:
+            self.world.edits.clear()
+
+        active = dirty.copy()
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                active |= np.roll(dirty, (dy, dx), axis=(0, 1))
+
+        newworld = self.__next_buffer__()
+        if newworld is not self.tiled_source and not active.all():
+            np.copyto(newworld.world, cells)
+        changed = np.zeros((rows, cols), dtype=bool)
+        for ty, tx in zip(*np.nonzero(active)):
+            y0, x0 = ty * size, tx * size
+            y1, x1 = min(y0 + size, height), min(x0 + size, width)
+            # Tegel plus een rand van een cel, met wraparound zoals World.get_neighbours.
+            block = cells[np.ix_(np.arange(y0 - 1, y1 + 1) % height, np.arange(x0 - 1, x1 + 1) % width)]
+            tile = evolve_padded(block, None, None, rule=self.rule)
+            changed[ty, tx] = not np.array_equal(tile, cells[y0:y1, x0:x1])
+            newworld.world[y0:y1, x0:x1] = tile
+
+        self.dirty_tiles = changed
+        newworld.edits = []
+        self.tiled_source = self.world if self.double_buffer else None
+        self.tiled_world = newworld
+        self.tiled_rules = self.rule
+        self.active_tiles = int(active.sum())
+        self.total_tiles = rows * cols
+        return newworld
+
+    def set_cell(self, x: int, y: int, value: int = 1) -> None:
+        """
+        Sets the state of ``(x, y)`` in the current world and makes sure the next generation takes the edit into account.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :param value: (optional) value to set location ``(x, y)``; uses ``1`` otherwise.
+        """
+        self.world.set(x, y, value)
+        self.__reset_cycles__()
+        if self.history is not None:
+            self.history.reset(self.generation, self.world.world, self.rule)
+        if self.dirty_tiles is not None and self.tiled_world is self.world \
+                and 0 <= x < self.world.width and 0 <= y < self.world.height:
+            self.dirty_tiles[y // self.tile_size, x // self.tile_size] = True
+
+    def set_cells(self, xs, ys, values = 1) -> None:
+        """
+        Sets many cells of the current world at once, like ``set_cell`` but resetting the cycle detection and the
+        history only once. Each world applies its own bounds: a ``World`` ignores locations outside it, a
+        ``SparseWorld`` accepts any location. For repeated locations the last value wins.
+
+        :param xs: column-values of the locations.
+        :param ys: row-values of the locations.
+        :param values: (optional) value per location, or one value for all of them; uses ``1`` otherwise.
+        """
+        xs, ys = np.asarray(xs, dtype=np.int64).ravel(), np.asarray(ys, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(values), xs.shape)
+        if isinstance(self.world, World):
+            inside = (xs >= 0) & (ys >= 0) & (xs < self.world.width) & (ys < self.world.height)
+            xs, ys, values = xs[inside], ys[inside], values[inside]
+            if not xs.size:
+                return
+            # Via de setter, zodat ook PackedWorld (waar ``world`` een kopie is) de wijzigingen opslaat.
+            cells = self.world.world
+            cells[ys, xs] = values
+            self.world.world = cells
+        else:
+            if not xs.size:
+                return
+            for x, y, value in zip(xs.tolist(), ys.tolist(), values.tolist()):
+                self.world.set(x, y, value)
+        self.__reset_cycles__()
+        if self.history is not None:
+            self.history.reset(self.generation, self.world.world, self.rule)
+        if self.dirty_tiles is not None and self.tiled_world is self.world and isinstance(self.world, World):
+            self.dirty_tiles[ys // self.tile_size, xs // self.tile_size] = True
+
+    def advance(self, generations: int) -> World:
+        """
+        Advances the world by the given number of generations at once. Long jumps on worlds whose width and height
+        are powers of two use HashLife, jumping by powers of two; other worlds and shorter jumps are stepped with the
+        engine of the simulator, which is faster there. Only classic birth/survival rules are supported; every
+        positive value counts as a living cell. The HashLife caches are kept between calls as long as the rules stay
+        the same; assign ``self.hashlife`` to change its memory limits.
 
+        The whole advance counts as one jump: the hooks registered with ``add_hook`` are called once, with the final
+        generation, and hooks registered with ``metrics=True`` are not called, since no generation is measured.
+
+        :param generations: number of generations to advance.
+        :return: New state of the world.
+        """
+        if self.age is not None or self.rule.states is not None:
+            raise ValueError("advance() does not support age or Generations rules")
+        if generations < 0:
+            raise ValueError("Cannot advance by a negative number of generations")
+        width, height = self.world.width, self.world.height
+        # HashLife deelt alleen knopen als de tegels van de torus op de quadtree passen (machten van twee), en betaalt
+        # zich pas terug bij sprongen van ruwweg twee keer het aantal cellen (gemeten op 64x64 tot 256x256 soep).
+        if width & (width - 1) or height & (height - 1) or generations < 2 * width * height:
+            for _ in range(generations):
+                self.world = self.__step__()
+        else:
+            if self.hashlife is None or self.hashlife.birth != set(self.birth) \
+                    or self.hashlife.survival != set(self.survival):
+                self.hashlife = HashLife(self.birth, self.survival)
+            self.world = self.hashlife.advance(self.world, generations)
+        self.generation += generations
+        self.__reset_cycles__()
+        if self.history is not None:
+            self.history.reset(self.generation, self.world.world, self.rule)
+        for hook in self.hooks:
+            hook(self)
         return self.world
 
     def get_generation(self):
@@ -107,4 +720,11 @@ class Simulator:
         :param world: new version of the world.
 
         """
-        self.world = world
\ No newline at end of file
+        self.world = world
+        # De tegels van de sparse engine horen bij de vorige wereld; de volgende generatie rekent alles opnieuw uit.
+        self.dirty_tiles = None
+        self.tiled_world = None
+        self.tiled_source = None
+        self.__reset_cycles__()
+        if self.history is not None:
+            self.history.reset(self.generation, self.world.world, self.rule)
\ No newline at end of file
@@ -0,0 +1,263 @@
+import re
+import struct
+import numpy as np
+from typing import Dict, List, Tuple
+from World import World
+from Simulator import Simulator
+from Rules import compile_rule, parse_rule, format_rule
+
+# Bestandsindeling: een header van HEADER_SIZE bytes, gevolgd door de cellen rij voor rij.
+MAGIC = b"GOLSNAP\0"
+VERSION = 2
+# Versie 2: leeftijd als int32 en het aantal toestanden van Generations-regels (0 zonder).
+HEADER = struct.Struct("<8sHB8sIIQiHHH")
+HEADER_V1 = struct.Struct("<8sHB8sIIQhHH")
+HEADER_SIZE = 64
+RAW = 0  # Een waarde per cel, met het dtype uit de header; kan via np.memmap geopend worden.
+BITS = 1  # Een bit per cel (alleen 0/1-werelden), rijen opgevuld tot hele bytes.
+
+
+def rule_mask(counts) -> int:
+    """
+    Encodes a list of neighbour counts (0 to 8) as a bit mask.
+    """
+    return sum(1 << n for n in set(counts) if 0 <= n <= 8)
+
+
+def mask_rule(mask: int) -> List[int]:
+    """
+    Decodes a bit mask written by ``rule_mask``.
+    """
+    return [n for n in range(9) if mask >> n & 1]
+
+
+def save(path: str, world: World, generation: int = 0, birth = [3], survival = [2,3], age = None,
+         packed: bool = False, states = None) -> None:
+    """
+    Writes a binary snapshot of a world and the rules it is simulated with.
+
+    :param path: file to write.
+    :param world: world to store.
+    :param generation: (optional) generation of the world.
+    :param birth: (optional) birth rule to store.
+    :param survival: (optional) survival rule to store.
+    :param age: (optional) age rule to store.
+    :param packed: (optional) store one bit per cell; only for worlds with values 0 and 1. Packed snapshots are
+        smaller but have to be unpacked on loading.
+    :param states: (optional) number of states of a Generations rule to store.
+    """
+    if age is not None and not 0 <= age <= 2 ** 31 - 1:
+        raise ValueError("Age {} does not fit in a snapshot".format(age))
+    if states is not None and not 0 <= states <= 2 ** 16 - 1:
+        raise ValueError("{} states do not fit in a snapshot".format(states))
+    cells = np.asarray(world.world)
+    if packed:
+        if cells.size and (cells.min() < 0 or cells.max() > 1):
+            raise ValueError("Only worlds with values 0 and 1 can be stored packed")
+        encoding, dtype = BITS, np.dtype(np.uint8)
+        data = np.packbits(cells > 0, axis=1)
+    else:
+        # Het kleinste dtype waar alle waarden in passen; uint8 voor gewone werelden.
+        encoding = RAW
+        if cells.size == 0 or (cells.min() >= 0 and cells.max() <= 255):
+            dtype = np.dtype(np.uint8)
+        else:
+            dtype = cells.dtype.newbyteorder("<")
+        data = cells.astype(dtype)
+    header = HEADER.pack(MAGIC, VERSION, encoding, dtype.str.encode(), world.width, world.height, generation,
+                         -1 if age is None else age, rule_mask(birth), rule_mask(survival), states or 0)
+    with open(path, "wb") as file:
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        file.write(np.ascontiguousarray(data).tobytes())
+
+
+def read_header(path: str) -> Dict:
+    """
+    Reads the header of a snapshot.
+
+    :param path: file to read.
+    :return: dictionary with ``width``, ``height``, ``generation``, ``birth``, ``survival``, ``age``, ``states``,
+        ``encoding`` and ``dtype``.
+    """
+    with open(path, "rb") as file:
+        raw = file.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE or raw[:len(MAGIC)] != MAGIC:
+        raise ValueError("{} is not a Game of Life snapshot".format(path))
+    version = struct.unpack_from("<H", raw, len(MAGIC))[0]
+    if version == VERSION:
+        magic, version, encoding, dtype, width, height, generation, age, birth, survival, states = \
+            HEADER.unpack_from(raw)
+    elif version == 1:
+        magic, version, encoding, dtype, width, height, generation, age, birth, survival = HEADER_V1.unpack_from(raw)
+        states = 0
+    else:
+        raise ValueError("Unsupported snapshot version {}".format(version))
+    return {
+        "width": width,
+        "height": height,
+        "generation": generation,
+        "birth": mask_rule(birth),
+        "survival": mask_rule(survival),
+        "age": None if age < 0 else age,
+        "states": states or None,
+        "encoding": encoding,
+        "dtype": np.dtype(dtype.rstrip(b"\0").decode()),
+    }
+
+
+def load(path: str, mode: str = "c") -> Tuple[World, Dict]:
+    """
+    Opens a snapshot. Unpacked snapshots are memory-mapped, so even huge worlds open instantly and are only read
+    from disk where they are used.
+
+    :param path: file to read.
+    :param mode: (optional) ``np.memmap`` mode: ``"c"`` (copy-on-write, edits stay in memory), ``"r"`` (read-only)
+        or ``"r+"`` (edits are written to the file).
+    :return: tuple of the ``World`` and the header (see ``read_header``).
+    """
+    header = read_header(path)
+    width, height = header["width"], header["height"]
+    if header["encoding"] == RAW:
+        cells = np.memmap(path, dtype=header["dtype"], mode=mode, offset=HEADER_SIZE, shape=(height, width))
+    else:
+        rows = np.fromfile(path, dtype=np.uint8, offset=HEADER_SIZE).reshape(height, -1)
+        cells = np.unpackbits(rows, axis=1)[:, :width].astype(np.uint8)
+    return World(width, height, cells), header
+
+
+def read_rle(text: str) -> Tuple[World, Dict]:
+    """
+    Parses a pattern in run length encoded (RLE) format, see https://conwaylife.com/wiki/Run_Length_Encoded.
+    Both two-state (``b``/``o``) and multi-state (``.``/``A``..``X``) patterns are understood.
+
+    :param text: contents of an RLE file.
+    :return: tuple of a ``World`` of the size in the header and a dictionary with the ``birth`` and ``survival``
+        rules (if the header has a rule), plus the number of ``states`` for Generations rules.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if not lines:
+        raise ValueError("Empty RLE pattern")
+    header = dict(re.findall(r"(\w+)\s*=\s*([^,]+)", lines[0]))
+    if "x" not in header or "y" not in header:
+        raise ValueError("RLE header must start with x = .., y = ..")
+    world = World(int(header["x"]), int(header["y"]))
+    rules = {}
+    if "rule" in header:
+        rule = parse_rule(header["rule"].strip())
+        rules.update(birth=sorted(rule.birth), survival=sorted(rule.survival))
+        if rule.states is not None:
+            rules["states"] = rule.states
+
+    x = y = 0
+    body = "".join(lines[1:])
+    for count, tag in re.findall(r"(\d*)([bo$!.A-X]|[p-y][A-X])", body):
+        count = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            x, y = 0, y + count
+            continue
+        if tag in "b.":
+            value = 0
+        elif tag == "o":
+            value = 1
+        elif len(tag) == 1:
+            value = ord(tag) - ord("A") + 1
+        else:
+            value = (ord(tag[0]) - ord("p") + 1) * 24 + ord(tag[1]) - ord("A") + 1
+        if value:
+            world.world[y, x:x + count] = value
+        x += count
+    return world, rules
+
+
+def write_rle(world: World, birth = [3], survival = [2,3], states = None) -> str:
+    """
+    Encodes a world in run length encoded (RLE) format. Worlds with values above 1 use the multi-state letters.
+
+    :param world: world to encode.
+    :param birth: (optional) birth rule for the header.
+    :param survival: (optional) survival rule for the header.
+    :param states: (optional) number of states of a Generations rule for the header.
+    :return: RLE text.
+    """
+    cells = np.asarray(world.world)
+    multistate = cells.size > 0 and cells.max() > 1
+
+    def tag(value: int) -> str:
+        if not multistate:
+            return "o" if value > 0 else "b"
+        if value <= 0:
+            return "."
+        if value <= 24:
+            return chr(ord("A") + value - 1)
+        return chr(ord("p") + (value - 1) // 24 - 1) + chr(ord("A") + (value - 1) % 24)
+
+    runs = []
+    blank_rows = 0
+    for row in cells:
+        row = [int(value) for value in row]
+        while row and row[-1] <= 0:  # Lege cellen aan het einde van een rij worden weggelaten.
+            row.pop()
+        if not row:
+            blank_rows += 1
+            continue
+        if runs:
+            runs.append("{}$".format(blank_rows + 1) if blank_rows else "$")
+        elif blank_rows:
+            runs.append("{}$".format(blank_rows))
+        blank_rows = 0
+        start = 0
+        while start < len(row):
+            end = start
+            while end < len(row) and row[end] == row[start]:
+                end += 1
+            runs.append("{}{}".format(end - start if end - start > 1 else "", tag(row[start])))
+            start = end
+    runs.append("!")
+
+    # Regels van hoogstens 70 tekens, zoals gebruikelijk.
+    lines, line = [], ""
+    for run in runs:
+        if len(line) + len(run) > 70:
+            lines.append(line)
+            line = ""
+        line += run
+    lines.append(line)
+    header = "x = {}, y = {}, rule = {}".format(world.width, world.height, format_rule(birth, survival, states))
+    return "\n".join([header] + lines) + "\n"
+
+
+def load_rle(path: str) -> Tuple[World, Dict]:
+    """
+    Reads an RLE file, see ``read_rle``.
+    """
+    with open(path) as file:
+        return read_rle(file.read())
+
+
+def save_rle(path: str, world: World, birth = [3], survival = [2,3], states = None) -> None:
+    """
+    Writes an RLE file, see ``write_rle``.
+    """
+    with open(path, "w") as file:
+        file.write(write_rle(world, birth, survival, states))
+
+
+def save_simulator(path: str, simulator: Simulator, packed: bool = False) -> None:
+    """
+    Writes a snapshot of the current world, generation and rules of a ``Simulator``.
+    """
+    save(path, simulator.get_world(), simulator.get_generation(), simulator.birth, simulator.survival,
+         simulator.age, packed, simulator.rule.states)
+
+
+def load_simulator(path: str, mode: str = "c") -> Simulator:
+    """
+    Opens a snapshot as a ``Simulator`` that continues at the stored generation with the stored rules.
+    """
+    world, header = load(path, mode)
+    simulator = Simulator(world, rule=compile_rule(header["birth"], header["survival"], header["age"], header["states"]))
+    simulator.generation = header["generation"]
+    return simulator
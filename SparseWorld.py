@@ -0,0 +1,182 @@
+import hashlib
+import numpy as np
+from typing import Dict, List, Tuple
+from World import World, OFFSETS
+from Rules import fertility
+
+
+class SparseWorld:
+    """
+    Unbounded Game of Life world that only stores its non-zero cells, keyed by ``(x, y)``. Coordinates may be any
+    integer, including negative ones; there are no edges to wrap around, so patterns can grow without limit.
+    Stepping costs time proportional to the number of stored cells instead of the area.
+    """
+
+    def __init__(self, cells: Dict[Tuple[int, int], int] = None):
+        """
+        Constructor of SparseWorld datatype.
+
+        :param cells: (optional) mapping of ``(x, y)`` to the value of each non-zero cell.
+        """
+        self.cells = {}
+        for (x, y), value in (cells or {}).items():
+            self.set(x, y, value)
+
+    @classmethod
+    def from_world(cls, world: World, x: int = 0, y: int = 0) -> "SparseWorld":
+        """
+        Creates a sparse world from the non-zero cells of a ``World``.
+
+        :param world: world to copy.
+        :param x: (optional) column at which the left edge of ``world`` is placed.
+        :param y: (optional) row at which the top edge of ``world`` is placed.
+        :return: new ``SparseWorld``.
+        """
+        cells = np.asarray(world.world)
+        ys, xs = np.nonzero(cells)
+        return cls({(int(cx) + x, int(cy) + y): int(cells[cy, cx]) for cx, cy in zip(xs, ys)})
+
+    @property
+    def population(self) -> int:
+        """
+        Number of living cells (stored cells with a value above 0).
+        """
+        return sum(1 for value in self.cells.values() if value > 0)
+
+    def digest(self) -> bytes:
+        """
+        Returns a 128-bit digest of the stored cells, independent of the order in which they were set.
+
+        :return: digest of the contents of the world.
+        """
+        return hashlib.blake2b(repr(sorted(self.cells.items())).encode(), digest_size=16).digest()
+
+    def get(self, x: int, y: int) -> int:
+        """
+        Returns the value on location ``(x, y)`` in the world.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :return: value of location ``(x, y)``; ``0`` for cells that were never set.
+        """
+        return self.cells.get((x, y), 0)
+
+    def set(self, x: int, y: int, value: int = 1) -> None:
+        """
+        Sets the state of ``(x, y)`` to the given value.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :param value: (optional) value to set location ``(x, y)``; uses ``1`` otherwise.
+        """
+        if value:
+            self.cells[(x, y)] = value
+        else:
+            self.cells.pop((x, y), None)
+
+    def get_neighbours(self, x: int, y: int) -> List[int]:
+        """
+        Returns a list of values for the 8 neighbours of location ``(x, y)``.
+
+        :param x: column-value of the location.
+        :param y: row-value of the location.
+        :return: ``List`` of integers representing the values of the neighbours of ``(x, y)``.
+        """
+        return [self.get(x + dx, y + dy) for dx, dy in OFFSETS.tolist()]
+
+    def bounding_box(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the smallest rectangle holding every stored cell.
+
+        :return: tuple ``(x, y, width, height)``; ``(0, 0, 0, 0)`` for an empty world.
+        """
+        if not self.cells:
+            return 0, 0, 0, 0
+        xs, ys = zip(*self.cells)
+        return min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1
+
+    @property
+    def width(self) -> int:
+        """
+        Width of the bounding box.
+        """
+        return self.bounding_box()[2]
+
+    @property
+    def height(self) -> int:
+        """
+        Height of the bounding box.
+        """
+        return self.bounding_box()[3]
+
+    def to_world(self, margin: int = 0) -> World:
+        """
+        Exports the bounding box (plus an optional empty margin) as a dense ``World``, for example to show it in
+        ``Visualisation``. The top-left cell of the result is at ``bounding_box()[:2]`` minus ``margin``.
+
+        :param margin: (optional) number of empty cells added on every side.
+        :return: new ``World``.
+        """
+        x0, y0, width, height = self.bounding_box()
+        world = World(width + 2 * margin, height + 2 * margin)
+        for (x, y), value in self.cells.items():
+            world.set(x - x0 + margin, y - y0 + margin, value)
+        return world
+
+    def evolve(self, birth, survival, age = None) -> "SparseWorld":
+        """
+        Computes the next generation with the same rules as the ``Simulator`` engines. Only stored cells and their
+        neighbours can change; every other cell has no living neighbours.
+
+        :param birth: neighbour counts (of fertile cells) for which a dead cell becomes alive.
+        :param survival: neighbour counts (of living cells) for which a living cell keeps its age.
+        :param age: (optional) age rule; ``None`` for classic Game of Life.
+        :return: new ``SparseWorld`` holding the next generation.
+        """
+        birthval, fertilestart, fertileend = fertility(age)
+        # Met leeftijdsregels onder de 4 tellen dode cellen als vruchtbaar; een lege omgeving heeft dan 8.
+        dead_fertile = age is not None and fertileend == 0
+        if (8 if dead_fertile else 0) in birth:
+            raise ValueError("These rules give birth to cells without living neighbours, filling the unbounded plane")
+        if not self.cells:
+            return SparseWorld()
+
+        coords = np.array(list(self.cells), dtype=np.int64)
+        xs, ys = coords[:, 0], coords[:, 1]
+        values = np.array(list(self.cells.values()), dtype=np.int64)
+        alive = values > 0
+        if age is None:
+            fertile = alive
+        else:
+            fertile = (values <= fertilestart) & (values >= fertileend)
+
+        # Coordinaten worden tot een enkel getal gecodeerd zodat np.unique en np.searchsorted gebruikt kunnen worden.
+        x0, y0 = xs.min() - 1, ys.min() - 1
+        span = ys.max() - y0 + 2
+        keys = (xs - x0) * span + (ys - y0)
+        neighbour_keys = ((xs[np.newaxis, :] + OFFSETS[:, 0:1] - x0) * span + (ys[np.newaxis, :] + OFFSETS[:, 1:2] - y0)).ravel()
+        candidates = np.unique(np.concatenate([keys, neighbour_keys]))
+        index = np.searchsorted(candidates, neighbour_keys)
+        sources = np.tile(np.arange(len(values)), len(OFFSETS))
+
+        neighborcount = np.bincount(index, weights=alive[sources], minlength=len(candidates))
+        if dead_fertile:
+            breedingneighborcount = 8 - np.bincount(index, weights=~fertile[sources], minlength=len(candidates))
+        else:
+            breedingneighborcount = np.bincount(index, weights=fertile[sources], minlength=len(candidates))
+
+        cells = np.zeros(len(candidates), dtype=np.int64)
+        cells[np.searchsorted(candidates, keys)] = values
+        newcells = np.zeros_like(cells)
+        born = (cells == 0) & np.isin(breedingneighborcount, list(birth))
+        newcells[born] = birthval
+        living = cells > 0
+        survives = np.isin(neighborcount, list(survival))
+        newcells[living] = np.where(survives[living], cells[living], cells[living] - 1)
+
+        keep = newcells != 0
+        newxs = (candidates[keep] // span + x0).tolist()
+        newys = (candidates[keep] % span + y0).tolist()
+        newworld = SparseWorld()
+        newworld.cells = dict(zip(zip(newxs, newys), newcells[keep].tolist()))
+        return newworld
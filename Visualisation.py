@@ -1,6 +1,7 @@
 import pygame
-from math import floor
 from Simulator import Simulator
+from Renderer import Renderer, Viewport
+from SimulationThread import SimulationThread
 
 # COLOURS
 white = (255, 255, 255)
@@ -21,6 +22,8 @@ rainbow = [
 margin = 20
 panelWidth = 200
 buttonHeight = 50
+zoomStep = 1.25  # Zoomfactor per stap van het muiswiel.
+panStep = 40  # Pixels per druk op een pijltjestoets.
 
 
 class Visualisation:
@@ -28,13 +31,24 @@ class Visualisation:
     Visualiser for Game of Life ``World``s.
     """
 
-    def __init__(self, simulator: Simulator, size: (int, int) = (800, 600), scale: float = 1) -> None:
+    def __init__(self, simulator: Simulator, size: (int, int) = (800, 600), scale: float = 1, threaded: bool = False,
+                 rate: float = 2, pooling: str = "max", history: bool = False) -> None:
         """
         Constructor to initiate the visualistion. Visualisor requires focus, meaning that it connects to ``Simulator`` object to call ``update()``.
 
         :param simulator: ``Simulator``-object used to evolve the state of the world.
         :param size: tuple to indicate the desired screen size. Typical values are (800, 600), (1024, 768), (1280, 1024), etc.
         :param scale: float to indicate the draw-scale: 1 = 100%, 0.5 = 50%, etc.
+        :param threaded: (optional) step the simulation on a ``SimulationThread`` so drawing and input never wait for a generation.
+        :param rate: (optional) generations per second when threaded; ``None`` for as fast as possible.
+        :param pooling: (optional) how cells are combined when zoomed out below a pixel per cell: ``"max"``, ``"min"``
+            or ``"mean"`` (see ``Renderer``).
+        :param history: (optional) remember the generations so they can be browsed (see ``Simulator.keep_history``);
+            costs a copy of the world per generation.
+
+        Scroll to zoom around the mouse, drag with the right or middle mouse button (or use the arrow keys) to pan
+        and press Home to fit the world on screen again. With ``history``, Page Up and Page Down step back and forth
+        through the generations seen so far while paused (see ``Simulator.at``).
         """
         pygame.init()
         pygame.font.init()
@@ -50,23 +64,61 @@ class Visualisation:
         pygame.display.set_caption("BS - Game of Life")
         self.surface.fill(white)
         pygame.display.flip()
+        # De wereld begint een cel van de rand, zoals voorheen; het paneel rechts valt buiten het beeld.
+        self.viewport = Viewport(pygame.Rect(0, 0, self.size[0] - panelWidth, self.size[1]), self.scaled_margin, -1, -1)
+        self.renderer = Renderer(self.surface, rainbow, viewport=self.viewport, pooling=pooling)
+        self.dragging = False
         self.done = False
         self.editable = True
         self.clock = pygame.time.Clock()
+        self.stepper = None
+        self.viewed = None  # Generatie uit de geschiedenis die getoond wordt; None voor de huidige.
+        if history:
+            self.simulator.keep_history()
+        if threaded:
+            self.stepper = SimulationThread(self.simulator, rate)
+            self.stepper.start()
 
         while not self.done:
             self.__handle_events__()
 
-            if not self.editable and not self.paused:
+            if self.stepper is None and not self.editable and not self.paused:
                 self.simulator.update()
 
             self.__redraw__()
 
-            if self.editable:
+            if self.stepper is not None:
+                self.clock.tick(60) # the simulation runs on its own thread, keep the UI smooth
+            elif self.editable:
                 self.clock.tick(10) # 10 fps when editing (for responsiveness)
             else:
                 self.clock.tick(2) # 2 fps otherwise (to slow down simulation)
 
+        if self.stepper is not None:
+            self.stepper.stop()
+
+    def __frame__(self):
+        """
+        Internal method returning the generation and cells to draw: the newest finished frame when threaded.
+        """
+        if self.viewed is not None:
+            return self.viewed, self.simulator.at(self.viewed).world
+        if self.stepper is not None:
+            return self.stepper.latest()
+        return self.simulator.generation, self.simulator.get_world().world
+
+    def __browse__(self, step: int) -> None:
+        """
+        Internal method that moves ``step`` generations through the history while paused; moving past the newest
+        generation returns to it.
+        """
+        if not self.paused or self.simulator.history is None:
+            return
+        current = self.stepper.latest().generation if self.stepper is not None else self.simulator.generation
+        viewed = (current if self.viewed is None else self.viewed) + step
+        viewed = max(viewed, self.simulator.history.base)
+        self.viewed = None if viewed >= current else viewed
+
     def __handle_events__(self) -> None:
         """
         Internal method to handle interaction with the UI.
@@ -74,58 +126,82 @@ class Visualisation:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.done = True
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEWHEEL:
                 (mouseX, mouseY) = pygame.mouse.get_pos()
-                if mouseX > self.scaled_margin and mouseX < self.scaled_margin + self.simulator.get_world().width * self.scaled_margin:
-                    if mouseY > self.scaled_margin and mouseY < self.scaled_margin + self.simulator.get_world().height * self.scaled_margin:
-                        x = floor((mouseX - self.scaled_margin) / self.scaled_margin)
-                        y = floor((mouseY - self.scaled_margin) / self.scaled_margin)
-                        oldValue = self.simulator.get_world().get(x, y)
-                        newValue = (oldValue + 1) % 9
-                        if self.editable:
-                            self.simulator.get_world().set(x, y, newValue)
+                if self.viewport.area.collidepoint(mouseX, mouseY):
+                    self.viewport.zoom_at(zoomStep ** event.y, mouseX, mouseY)
+            if event.type == pygame.MOUSEMOTION and self.dragging:
+                self.viewport.pan(-event.rel[0], -event.rel[1])
+            if event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+                self.dragging = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    self.viewport.pan(-panStep, 0)
+                elif event.key == pygame.K_RIGHT:
+                    self.viewport.pan(panStep, 0)
+                elif event.key == pygame.K_UP:
+                    self.viewport.pan(0, -panStep)
+                elif event.key == pygame.K_DOWN:
+                    self.viewport.pan(0, panStep)
+                elif event.key == pygame.K_PAGEUP:
+                    self.__browse__(-1)
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.__browse__(1)
+                elif event.key == pygame.K_HOME:
+                    self.viewport.zoom, self.viewport.x, self.viewport.y = self.scaled_margin, -1, -1
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+                self.dragging = True
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                (mouseX, mouseY) = event.pos
+                cells = self.__frame__()[1]
+                height, width = cells.shape
+                cell = self.viewport.screen_to_cell(mouseX, mouseY, width, height)
+                if cell is not None:
+                    x, y = cell
+                    oldValue = int(cells[y][x])
+                    newValue = (oldValue + 1) % 9
+                    if self.editable and self.viewed is None:
+                        if self.stepper is not None:
+                            self.stepper.edit(x, y, newValue)
+                        else:
+                            self.simulator.set_cell(x, y, newValue)
                 if mouseX > self.size[0] - panelWidth + margin and mouseX < self.size[0] - margin:
                     if mouseY > margin*3 and mouseY < margin*3+buttonHeight:
                         self.editable = False
                         self.paused = not self.paused
+                        self.viewed = None
+                        if self.stepper is not None:
+                            if self.paused:
+                                self.stepper.pause()
+                            else:
+                                self.stepper.play()
 
     def __determineScale__(self) -> None:
         """
         Determine and adapts the scale factor of the display to fit the requested world.
         """
-        # scale too big:
-        while self.scale*(self.simulator.get_world().height+2)*margin > self.size[1] and self.scale*(self.simulator.get_world().width+2)*margin > self.size[0] - panelWidth:
-            self.scale = round(self.scale*0.9, 2)
-
-        # scale too small:
-        if floor(self.scale * margin) < 5:
-            self.scale = 5/margin
-
+        # Past de wereld (met een marge van een cel rondom) niet, dan wordt er verkleind; cellen mogen kleiner dan
+        # een pixel worden, de renderer toont dan een samengevatte weergave.
+        world = self.simulator.get_world()
+        fit = min((self.size[0] - panelWidth) / ((world.width + 2) * margin), self.size[1] / ((world.height + 2) * margin))
+        self.scale = min(self.scale, fit)
 
     def __redraw__(self) -> None:
         """
         Internal method to redraw the elements of the visualisation.
         """
-        # Clean the canvas
-        self.surface.fill(white)
-
-        # Draw the cells
-        for y in range(self.simulator.get_world().height):
-            for x in range(self.simulator.get_world().width):
-                pygame.draw.rect(self.surface, rainbow[self.simulator.get_world().get(x,y)], ((x+1) * self.scaled_margin, (y + 1) * self.scaled_margin, self.scaled_margin, self.scaled_margin))
-        # Draw vertical lines
-        for y in range(self.simulator.get_world().height+1):
-            pygame.draw.line(self.surface, black, (self.scaled_margin, (y + 1) * self.scaled_margin), ((self.simulator.get_world().width + 1) * self.scaled_margin, (y + 1) * self.scaled_margin))
-        # Draw horizontal lines
-        for x in range(self.simulator.get_world().width+1):
-            pygame.draw.line(self.surface, black, ((x+1) * self.scaled_margin, self.scaled_margin), ((x + 1) * self.scaled_margin, (self.simulator.get_world().height + 1) * self.scaled_margin))
+        # Draw the cells that changed, with the grid on top
+        generation, cells = self.__frame__()
+        dirty = self.renderer.draw(cells)
 
         panelX = self.size[0] - panelWidth + margin
         panelY = margin
 
         # Generation text
         pygame.draw.rect(self.surface, white, (panelX, panelY, panelWidth-2*margin, buttonHeight))
-        genText = "Generation: "+str(self.simulator.generation)
+        genText = "Generation: "+str(generation)
+        if self.viewed is not None:
+            genText += " (history)"
         gt = self.font.render(genText, 0, black)
         self.surface.blit(gt, (panelX, panelY))
 
@@ -139,5 +215,6 @@ class Visualisation:
         (w,h) = self.font.size(ppText)
         self.surface.blit(playPausedText, (panelX+(buttonWidth-w)/2, panelY+(buttonHeight-h)/2))
 
-        # Write to screen
-        pygame.display.update()
+        # Write the changed areas and the panel to screen
+        dirty.append(pygame.Rect(self.size[0] - panelWidth, 0, panelWidth, self.size[1]))
+        pygame.display.update(dirty)
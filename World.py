@@ -1,24 +1,67 @@
+import copy
+import hashlib
 import numpy as np
-from typing import List
+from functools import lru_cache
+from typing import List, Union
+
+# Relatieve posities van de 8 buren, in de volgorde van get_neighbours.
+OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy])
+NEIGHBOURS = [tuple(offset) for offset in OFFSETS.tolist()]
+# Grootste aantal cellen waarvoor de platte indices in een int32 passen.
+TABLE_LIMIT = np.iinfo(np.int32).max
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(width: int, height: int) -> np.ndarray:
+    """
+    Builds (and caches) the neighbour-index table of a toroidal world: row ``y * width + x`` holds the flat indices of
+    the 8 neighbours of ``(x, y)``, in the order of ``World.get_neighbours``. The table takes 32 bytes per cell.
+
+    :param width: width of the world.
+    :param height: height of the world.
+    :return: read-only ``int32`` array of shape ``(width * height, 8)``.
+    """
+    if width * height > TABLE_LIMIT:
+        raise ValueError("World of {}x{} cells is too large for a neighbour table".format(width, height))
+    table = np.empty((width * height, 8), dtype=np.int32)
+    grid = table.reshape(height, width, 8)
+    rows = np.arange(height, dtype=np.int32)
+    columns = np.arange(width, dtype=np.int32)
+    # Per buur een keer optellen, rechtstreeks in de tabel, zonder tijdelijke arrays ter grootte van de wereld.
+    for i, (dx, dy) in enumerate(OFFSETS.tolist()):
+        np.add(((rows + dy) % height * width)[:, None], ((columns + dx) % width)[None, :], out=grid[:, :, i])
+    table.flags.writeable = False
+    return table
+
 
 class World:
     """
     Data structure for representing Game of Life worlds.
     """
 
-    def __init__(self, width: int, height: int = -1):
+    # Als dit een lijst is, komt elke locatie die via ``set`` verandert erbij; zo ziet de sparse engine van
+    # ``Simulator`` bewerkingen die rechtstreeks op zijn wereld gedaan worden.
+    edits = None
+
+    def __init__(self, width: int, height: int = -1, cells: np.ndarray = None):
         """
         Constructor of World datatype.
 
         :param width: integer representing the width of the world.
         :param height: (optional) integer representing the height of the world. If left implicit, the value of ``width`` is used to create a square-shaped world.
+        :param cells: (optional) existing ``(height, width)`` array to use as the cells of the world, without copying it.
         """
         self.width = width
         if not height == -1:
             self.height = height
         else:
             self.height = width
-        self.world = np.zeros((self.height, self.width), dtype=int)
+        if cells is None:
+            self.world = np.zeros((self.height, self.width), dtype=int)
+        else:
+            if cells.shape != (self.height, self.width):
+                raise ValueError("Expected cells of shape {}, got {}".format((self.height, self.width), cells.shape))
+            self.world = cells
 
     def get(self, x: int, y: int) -> int:
         """
@@ -43,6 +86,102 @@ class World:
         if x < 0 or y < 0 or x >= self.width or y >= self.height:
             return
         self.world[y][x] = value
+        if self.edits is not None:
+            self.edits.append((x, y))
+
+    def fill_random(self, density: float = 0.5, seed: int = None, value: int = 1) -> None:
+        """
+        Replaces all cells: each cell becomes alive with chance ``density``.
+
+        :param density: (optional) chance that a cell is alive.
+        :param seed: (optional) seed of the random generator, to make the world reproducible.
+        :param value: (optional) value of living cells, for example the birth value of the age rules.
+        """
+        # Via de setter, zodat subklassen waarvan ``world`` een kopie is (PackedWorld) het resultaat opslaan.
+        cells = self.world
+        alive = np.random.default_rng(seed).random(cells.shape) < density
+        np.multiply(alive, value, out=cells, casting="unsafe")
+        self.world = cells
+
+    def stamp(self, pattern: Union[np.ndarray, "World", str], offsets, overwrite: bool = False, wrap: bool = True) -> None:
+        """
+        Copies a pattern into the world at many positions at once.
+
+        :param pattern: 2D array of cell values, a ``World``, or a pattern in RLE format (see ``Snapshot.read_rle``).
+        :param offsets: ``(x, y)`` of the top-left corner of every copy; a single pair or a sequence of pairs.
+        :param overwrite: (optional) also copy the dead cells of the pattern, clearing what was there; by default only
+            the living cells of the pattern are written.
+        :param wrap: (optional) let copies that cross an edge continue on the other side, like the simulation does;
+            otherwise the cells outside the world are dropped.
+        """
+        if isinstance(pattern, str):
+            from Snapshot import read_rle  # Snapshot importeert World.
+            pattern = read_rle(pattern)[0]
+        if isinstance(pattern, World):
+            pattern = pattern.world
+        pattern = np.asarray(pattern)
+        offsets = np.asarray(offsets, dtype=np.int64).reshape(-1, 2)
+
+        ys, xs = np.nonzero(np.ones(pattern.shape, dtype=bool) if overwrite else pattern)
+        values = pattern[ys, xs]
+        # Een rij per kopie, een kolom per cel van het patroon.
+        rows = offsets[:, 1:2] + ys
+        columns = offsets[:, 0:1] + xs
+        cells = self.world
+        if wrap:
+            rows %= self.height
+            columns %= self.width
+            cells[rows, columns] = values
+        else:
+            inside = (rows >= 0) & (rows < self.height) & (columns >= 0) & (columns < self.width)
+            cells[rows[inside], columns[inside]] = np.broadcast_to(values, rows.shape)[inside]
+        self.world = cells
+
+    def rotate(self, turns: int = 1) -> "World":
+        """
+        Returns a copy of the world rotated clockwise by a quarter turn ``turns`` times.
+
+        :param turns: (optional) number of quarter turns; negative values rotate counterclockwise.
+        :return: new world of the same type; width and height are swapped for odd ``turns``.
+        """
+        return self.__transformed__(np.rot90(self.world, -turns))
+
+    def reflect(self, vertical: bool = False) -> "World":
+        """
+        Returns a mirrored copy of the world.
+
+        :param vertical: (optional) mirror top to bottom instead of left to right.
+        :return: new world of the same type.
+        """
+        return self.__transformed__(np.flip(self.world, 0 if vertical else 1))
+
+    def __transformed__(self, cells: np.ndarray) -> "World":
+        """
+        Internal method returning a copy of the world, of the same type, with the given cells.
+        """
+        transformed = copy.copy(self)
+        transformed.edits = None  # Wijzigingen in de kopie horen niet in de lijst van het origineel.
+        transformed.width, transformed.height = cells.shape[1], cells.shape[0]
+        transformed.world = cells.copy()
+        return transformed
+
+    @property
+    def population(self) -> int:
+        """
+        Number of living cells (cells with a value above 0).
+        """
+        return int(np.count_nonzero(self.world > 0))
+
+    def digest(self) -> bytes:
+        """
+        Returns a 128-bit digest of the cells, for recognising states that were seen before without storing them.
+
+        :return: digest of the shape and contents of the world.
+        """
+        cells = np.ascontiguousarray(self.world)
+        digest = hashlib.blake2b(str(cells.shape).encode(), digest_size=16)
+        digest.update(cells.data)
+        return digest.digest()
 
     def get_neighbours(self, x: int, y:int) -> List[int]:
         """
@@ -53,17 +192,42 @@ class World:
         :return: ``List`` of integers representing the values of the neighbours of ``(x, y)``.
         """
         neighbour_values = []
-        for nx in range(x-1,x+2):
-            for ny in range(y-1,y+2):
-                if not (nx is x and ny is y):
-                    neighbour_values.append(self.world[ny%self.height][nx%self.width])
+        for dx, dy in NEIGHBOURS:
+            neighbour_values.append(self.world[(y + dy) % self.height][(x + dx) % self.width])
         return neighbour_values
 
+    @property
+    def neighbour_table(self) -> np.ndarray:
+        """
+        Flat neighbour-index table of the world's size, shared by all worlds of that size; see ``neighbour_table``.
+        Built on first use, for ``gather_neighbours``.
+        """
+        return neighbour_table(self.width, self.height)
+
+    def gather_neighbours(self, xs, ys, out: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the values of the 8 neighbours of many locations at once, in the order of ``get_neighbours``.
+        Locations outside the world wrap around, like the neighbours do. Uses the cached ``neighbour_table``, except
+        for worlds too large for ``int32`` indices, where the neighbours are computed from ``OFFSETS``.
+
+        :param xs: column-values of the locations.
+        :param ys: row-values of the locations.
+        :param out: (optional) ``(N, 8)`` array to write the values into, to avoid allocating one per call.
+        :return: ``(N, 8)`` array with a row of neighbour values per location.
+        """
+        xs = np.asarray(xs).ravel() % self.width
+        ys = np.asarray(ys).ravel() % self.height
+        if self.width * self.height > TABLE_LIMIT:
+            values = self.world[(ys[:, None] + OFFSETS[:, 1]) % self.height, (xs[:, None] + OFFSETS[:, 0]) % self.width]
+            if out is None:
+                return values
+            out[...] = values
+            return out
+        return np.take(self.world, self.neighbour_table[ys * self.width + xs], out=out)
+
     def __str__(self):
-        print('-'*self.width*4)
+        lines = ['-'*self.width*4]
         for row in self.world:
-            print('|', end=" ")
-            for column in row:
-                print(column, end=" | ")
-            print()
-            print('-'*self.width*4)
+            lines.append('| ' + ''.join('{} | '.format(column) for column in row))
+            lines.append('-'*self.width*4)
+        return '\n'.join(lines)
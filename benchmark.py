@@ -0,0 +1,218 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from typing import Dict, List
+from Rules import fertility, format_rule, parse_rule
+from Simulator import Simulator, ENGINES
+from World import World
+
+CASE_KEYS = ("engine", "size", "density", "rule", "age")
+
+
+def make_world(size: int, density: float, age: int = None, seed: int = 0) -> World:
+    """
+    Returns a square world with a random fraction ``density`` of living cells; with ``age`` they get the birth value.
+    """
+    world = World(size)
+    world.fill_random(density, seed, fertility(age)[0])
+    return world
+
+
+def time_generations(simulator: Simulator, min_time: float, max_generations: int) -> Dict:
+    """
+    Steps the simulator (after one warm-up generation) until ``min_time`` seconds or ``max_generations`` have passed.
+
+    :return: dictionary with the number of ``generations`` and the ``seconds`` they took.
+    """
+    simulator.update()
+    generations = 0
+    start = time.perf_counter()
+    while generations < max_generations:
+        simulator.update()
+        generations += 1
+        if time.perf_counter() - start >= min_time:
+            break
+    return {"generations": generations, "seconds": time.perf_counter() - start}
+
+
+def measure_memory(simulator: Simulator, generations: int = 3) -> Dict:
+    """
+    Measures memory use per generation with ``tracemalloc`` (which also traces numpy buffers). Runs separately from
+    the timing, since tracing slows allocation down.
+
+    :return: dictionary with the highest ``peak_memory`` (bytes allocated per step on top of what was in use before
+        the generation) and ``retained_memory`` (bytes still in use after it) over the measured generations.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        simulator.update()
+        peak = retained = 0
+        for _ in range(generations):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            simulator.update()
+            current, highest = tracemalloc.get_traced_memory()
+            peak = max(peak, highest - before)
+            retained = max(retained, current - before)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return {"peak_memory": peak, "retained_memory": retained}
+
+
+def run_case(engine: str, size: int, density: float, rule: str, age: int = None, min_time: float = 0.5,
+             max_generations: int = 1000, memory: bool = True) -> Dict:
+    """
+    Benchmarks ``Simulator.update`` for one combination of engine, world size, density, rule and age.
+
+    :param rule: rule string, see ``Rules.parse_rule``; Generations rules cannot be combined with ``age``.
+    :return: dictionary with the case parameters, ``gens_per_sec``, ``cells_per_sec`` and (with ``memory``) the
+        results of ``measure_memory``.
+    """
+    rule = parse_rule(rule, age)
+    simulator = Simulator(make_world(size, density, age), engine=engine, rule=rule)
+    timing = time_generations(simulator, min_time, max_generations)
+    rate = timing["generations"] / timing["seconds"]
+    result = {"engine": engine, "size": size, "density": density,
+              "rule": format_rule(rule.birth, rule.survival, rule.states), "age": age,
+              "generations": timing["generations"], "gens_per_sec": rate, "cells_per_sec": rate * size * size}
+    if memory:
+        simulator = Simulator(make_world(size, density, age), engine=engine, rule=rule)
+        result.update(measure_memory(simulator))
+        result["bytes_per_cell"] = result["peak_memory"] / (size * size)
+    return result
+
+
+def run_world(size: int = 64, calls: int = 20000) -> List[Dict]:
+    """
+    Benchmarks the per-cell ``World`` methods used by the loop engine and the visualisation.
+
+    :return: list with a dictionary per method with its ``calls_per_sec``.
+    """
+    world = make_world(size, 0.3)
+    positions = np.random.default_rng(1).integers(0, size, (calls, 2)).tolist()
+    methods = {
+        "World.get": lambda x, y: world.get(x, y),
+        "World.set": lambda x, y: world.set(x, y, 1),
+        "World.get_neighbours": lambda x, y: world.get_neighbours(x, y),
+    }
+    results = []
+    for name, method in methods.items():
+        start = time.perf_counter()
+        for x, y in positions:
+            method(x, y)
+        results.append({"name": name, "size": size, "calls_per_sec": calls / (time.perf_counter() - start)})
+    return results
+
+
+def key(case: Dict) -> str:
+    """
+    Returns the name under which a benchmark result is matched against the baseline.
+    """
+    if "name" in case:
+        return "{name}/{size}".format(**case)
+    return "/".join("{}={}".format(name, case[name]) for name in CASE_KEYS)
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = 0.1) -> List[str]:
+    """
+    Compares benchmark results with a baseline written earlier by this script. Rates (higher is better) regress when
+    they drop by more than ``threshold``; peak memory regresses when it grows by more than ``threshold``.
+
+    :param results: results of ``run_suite``.
+    :param baseline: earlier results of ``run_suite``.
+    :param threshold: (optional) allowed relative change, ``0.1`` for 10%.
+    :return: description of every regression; empty when there are none.
+    """
+    regressions = []
+    for section in ("cases", "world"):
+        old = {key(case): case for case in baseline.get(section, [])}
+        for case in results.get(section, []):
+            previous = old.get(key(case))
+            if previous is None:
+                continue
+            for metric in ("gens_per_sec", "calls_per_sec"):
+                if metric in case and metric in previous and case[metric] < previous[metric] * (1 - threshold):
+                    regressions.append("{}: {} {:.4g} -> {:.4g} ({:+.1%})".format(
+                        key(case), metric, previous[metric], case[metric], case[metric] / previous[metric] - 1))
+            if previous.get("peak_memory") and case.get("peak_memory", 0) > previous["peak_memory"] * (1 + threshold):
+                regressions.append("{}: peak_memory {} -> {} ({:+.1%})".format(
+                    key(case), previous["peak_memory"], case["peak_memory"],
+                    case["peak_memory"] / previous["peak_memory"] - 1))
+    return regressions
+
+
+def run_suite(args: argparse.Namespace) -> Dict:
+    """
+    Runs every combination of the requested engines, sizes, densities, rules and ages, printing a line per case.
+    """
+    results = {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "cases": [],
+        "world": [],
+    }
+    for engine in args.engines:
+        for size in args.sizes:
+            for density in args.densities:
+                for rule in args.rules:
+                    for age in args.ages:
+                        case = run_case(engine, size, density, rule, age, args.min_time, args.max_generations,
+                                        not args.no_memory)
+                        results["cases"].append(case)
+                        print("{:<60} {:>10.2f} gen/s {:>14.0f} cells/s {:>12}".format(
+                            key(case), case["gens_per_sec"], case["cells_per_sec"],
+                            "" if args.no_memory else "{:.2f} B/cell allocated".format(case["bytes_per_cell"])))
+    if not args.no_world:
+        for case in run_world():
+            results["world"].append(case)
+            print("{:<60} {:>10.0f} calls/s".format(key(case), case["calls_per_sec"]))
+    return results
+
+
+def parse_age(value: str):
+    """
+    Argument type for ``--ages``: an integer, or ``none`` for classic rules.
+    """
+    return None if value.lower() == "none" else int(value)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for Simulator and World.")
+    parser.add_argument("--engines", nargs="+", default=["vectorized"], choices=ENGINES, help="simulator engines")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[64, 256, 1024, 4096], help="world widths and heights")
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.1, 0.3], help="fractions of living cells")
+    parser.add_argument("--rules", nargs="+", default=["B3/S23", "B36/S23"], help="rules in B3/S23 notation")
+    parser.add_argument("--ages", nargs="+", type=parse_age, default=[None, 5], help="age rules, 'none' for classic")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to time each case for")
+    parser.add_argument("--max-generations", type=int, default=1000, help="most generations to time per case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slower) memory measurements")
+    parser.add_argument("--no-world", action="store_true", help="skip the World method benchmarks")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative regression (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regressions beyond {:.0%}".format(args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
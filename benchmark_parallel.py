@@ -0,0 +1,38 @@
+import argparse
+import os
+import time
+import numpy as np
+from ParallelSimulator import ParallelSimulator
+from Simulator import Simulator
+from World import World
+
+
+def generations_per_second(simulator: Simulator, generations: int) -> float:
+    """
+    Steps the simulator (after one warm-up generation) and returns the measured rate.
+    """
+    simulator.update()
+    start = time.perf_counter()
+    for _ in range(generations):
+        simulator.update()
+    return generations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark for ParallelSimulator.")
+    parser.add_argument("--size", type=int, default=2000, help="width and height of the world")
+    parser.add_argument("--generations", type=int, default=20, help="generations to time per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="highest number of workers to try")
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of living cells at the start")
+    args = parser.parse_args()
+
+    world = World(args.size)
+    world.world[:] = np.random.default_rng(0).random((args.size, args.size)) < args.density
+
+    serial = generations_per_second(Simulator(world), args.generations)
+    print("{:>8} {:>12.2f} gen/s {:>14.0f} cells/s".format("serial", serial, serial * args.size ** 2))
+    for workers in range(1, args.workers + 1):
+        with ParallelSimulator(world, workers=workers) as simulator:
+            rate = generations_per_second(simulator, args.generations)
+        print("{:>8} {:>12.2f} gen/s {:>14.0f} cells/s  speedup {:.2f}x".format(
+            workers, rate, rate * args.size ** 2, rate / serial))
@@ -1,19 +1,33 @@
 from Visualisation import *
 from Simulator import *
+from Server import Server
+import asyncio
 import time
 
 # Configuratie
 VISUALISATION=True
+THREADED=False  # Laat de simulatie in een eigen thread lopen zodat de interface altijd reageert.
+HISTORY=False  # Onthoud de generaties, zodat je er gepauzeerd met Page Up/Page Down doorheen kunt bladeren.
+MAX_PERIOD=2  # Stop zonder visualisatie zodra de wereld uitsterft of in een cyclus tot deze lengte komt.
+SERVER=False  # Zonder visualisatie: stuur de generaties naar clients op SERVER_PORT in plaats van ze te printen.
+SERVER_PORT=8765
+SERVER_RATE=10  # Generaties per seconde voor de server.
 
 if __name__ == "__main__":
     w = World(110)
-    sim = Simulator(w)
+    sim = Simulator(w, max_period=MAX_PERIOD)
 
     if VISUALISATION:
-        vis = Visualisation(sim)
+        vis = Visualisation(sim, threaded=THREADED, history=HISTORY)
+    elif SERVER:
+        asyncio.run(Server(sim, port=SERVER_PORT, rate=SERVER_RATE).run())
     else:
-        while True:
+        while not sim.settled():
             # Create new world and print to screen
             print(sim.update())
             # slow down simulation
-            time.sleep(0.5)
\ No newline at end of file
+            time.sleep(0.5)
+        if sim.extinct:
+            print("World died out at generation", sim.get_generation())
+        else:
+            print("Generation {} repeats every {} generation(s)".format(*sim.cycle))
\ No newline at end of file
@@ -0,0 +1,49 @@
+from unittest import TestCase
+import numpy as np
+from BatchSimulator import *
+from Simulator import Simulator
+
+
+class TestBatchSimulator(TestCase):
+    """
+    Tests for ``BatchSimulator`` implementation.
+    """
+    def test_matches_simulator(self):
+        """
+        Tests that every world in a batch with mixed rules evolves exactly like its own ``Simulator``.
+        """
+        rng = np.random.default_rng(8)
+        rules = [([3], [2, 3], None), ([3, 6], [2, 3], None), ([1, 2, 3, 4], [2, 3], 6), ([2, 3], [3, 4, 5], 3)]
+        worlds = []
+        for birth, survival, age in rules:
+            world = World(11, 9)
+            world.world[:] = rng.integers(0, (age or 1) + 1, size=(9, 11))
+            worlds.append(world)
+        batch = BatchSimulator(worlds, rules)
+        simulators = [Simulator(world, *rule) for world, rule in zip(worlds, rules)]
+        for _ in range(6):
+            statistics = batch.update()
+            for i, sim in enumerate(simulators):
+                previous = sim.get_world().world
+                current = sim.update().world
+                np.testing.assert_array_equal(batch.get_world(i).world, current)
+                self.assertEqual(statistics["population"][i], np.count_nonzero(current > 0))
+                self.assertEqual(statistics["births"][i], np.count_nonzero((previous == 0) & (current > 0)))
+                self.assertEqual(statistics["deaths"][i], np.count_nonzero((previous > 0) & (current <= 0)))
+        self.assertEqual(batch.get_generation(), 6)
+
+    def test_random(self):
+        """
+        Tests that random batches are reproducible and start at the birth value of their rules.
+        """
+        a = BatchSimulator.random(5, 8, density=0.4, seed=1, rules=([3], [2, 3], 7))
+        b = BatchSimulator.random(5, 8, density=0.4, seed=1, rules=([3], [2, 3], 7))
+        np.testing.assert_array_equal(a.cells, b.cells)
+        self.assertEqual(set(np.unique(a.cells)), {0, 7})
+
+    def test_rules_length(self):
+        """
+        Tests that a list of rules must have one entry per world.
+        """
+        with self.assertRaises(ValueError):
+            BatchSimulator(np.zeros((3, 4, 4), dtype=int), [([3], [2, 3], None)])
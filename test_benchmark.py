@@ -0,0 +1,36 @@
+from unittest import TestCase
+from benchmark import *
+
+
+class TestBenchmark(TestCase):
+    """
+    Tests for the benchmark suite.
+    """
+
+    def test_run_case(self):
+        """
+        Tests that a benchmark case reports rates and memory use for its parameters.
+        """
+        case = run_case("vectorized", 32, 0.3, "B3/S23", 5, min_time=0, max_generations=2)
+        self.assertEqual(key(case), "engine=vectorized/size=32/density=0.3/rule=B3/S23/age=5")
+        self.assertEqual(case["generations"], 1)
+        self.assertAlmostEqual(case["cells_per_sec"], case["gens_per_sec"] * 32 * 32)
+        self.assertGreater(case["peak_memory"], 0)
+
+    def test_compare(self):
+        """
+        Tests that slower rates and higher peak memory beyond the threshold are reported, and nothing else.
+        """
+        baseline = {"cases": [{"engine": "vectorized", "size": 64, "density": 0.3, "rule": "B3/S23", "age": None,
+                               "gens_per_sec": 100.0, "peak_memory": 1000}],
+                    "world": [{"name": "World.get", "size": 64, "calls_per_sec": 1000.0}]}
+        results = json.loads(json.dumps(baseline))
+        results["cases"][0]["gens_per_sec"] = 95.0
+        self.assertEqual(compare(results, baseline, 0.1), [])
+        results["cases"][0]["gens_per_sec"] = 80.0
+        results["cases"][0]["peak_memory"] = 1200
+        results["world"][0]["calls_per_sec"] = 500.0
+        regressions = compare(results, baseline, 0.1)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("engine=vectorized/size=64"))
+        self.assertIn("World.get/64", regressions[2])
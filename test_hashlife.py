@@ -0,0 +1,120 @@
+from unittest import TestCase
+import numpy as np
+from HashLife import *
+from Simulator import Simulator
+
+
+class TestHashLife(TestCase):
+    """
+    Tests for ``HashLife`` engine.
+    """
+    def setUp(self):
+        self.hashlife = HashLife()
+
+    def test_hash_consing(self):
+        """
+        Tests that equal subtrees are shared.
+        """
+        a = self.hashlife.join(self.hashlife.on, self.hashlife.off, self.hashlife.off, self.hashlife.on)
+        b = self.hashlife.join(self.hashlife.on, self.hashlife.off, self.hashlife.off, self.hashlife.on)
+        self.assertIs(a, b)
+        self.assertEqual(a.population, 2)
+        self.assertIs(self.hashlife.zero(3), self.hashlife.zero(3))
+
+    def test_world_roundtrip(self):
+        """
+        Tests converting a ``World`` to a node and back.
+        """
+        world = World(6, 5)
+        for x, y in [(0, 0), (5, 4), (2, 3)]:
+            world.set(x, y)
+        node = self.hashlife.from_world(world)
+        self.assertEqual(node.level, 3)
+        self.assertEqual(node.population, 3)
+        np.testing.assert_array_equal(self.hashlife.to_world(node, 6, 5).world, world.world)
+
+    def test_matches_update(self):
+        """
+        Tests that ``Simulator.advance`` ends in the same state as repeated ``update`` calls, on square, power-of-two
+        and odd-sized toroidal worlds.
+        """
+        rng = np.random.default_rng(11)
+        for width, height in [(16, 16), (10, 7), (3, 5)]:
+            for birth, survival in [([3], [2, 3]), ([3, 6], [2, 3])]:
+                for generations in (1, 6, 37):
+                    world = World(width, height)
+                    world.world[:] = rng.integers(0, 2, size=(height, width))
+                    stepped = Simulator(world, birth, survival)
+                    for _ in range(generations):
+                        stepped.update()
+                    jumped = Simulator(world, birth, survival)
+                    jumped.advance(generations)
+                    self.assertEqual(jumped.get_generation(), generations)
+                    np.testing.assert_array_equal(jumped.get_world().world, stepped.get_world().world)
+                    # Korte sprongen worden gestapt; de HashLife-engine zelf moet hetzelfde geven.
+                    np.testing.assert_array_equal(HashLife(birth, survival).advance(world, generations).world,
+                                                  stepped.get_world().world)
+
+    def test_far_future(self):
+        """
+        Tests a jump of a million generations: a glider on an 8x8 torus is back at its start every 32 generations.
+        """
+        world = World(8)
+        for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:
+            world.set(x, y)
+        sim = Simulator(world)
+        sim.advance(2 ** 20)
+        np.testing.assert_array_equal(sim.get_world().world, world.world)
+
+    def test_eviction(self):
+        """
+        Tests that small cache limits evict entries without changing the outcome, and that the node table stays within
+        ``max_nodes`` during a jump, not only between jumps.
+        """
+        class Counting(HashLife):
+            peak = 0
+
+            def join(self, *quadrants):
+                node = super().join(*quadrants)
+                self.peak = max(self.peak, len(self.nodes))
+                return node
+
+        rng = np.random.default_rng(5)
+        world = World(16)
+        world.world[:] = rng.integers(0, 2, size=(16, 16))
+        full = Counting()
+        expected = full.advance(world, 200)
+        small = Counting(max_nodes=1000, max_results=500)
+        result = small.advance(world, 200)
+        self.assertGreater(full.peak, 1000)
+        self.assertLessEqual(small.peak, 1000)
+        self.assertLessEqual(len(small.results), 500)
+        np.testing.assert_array_equal(result.world, expected.world)
+
+    def test_advance_engine(self):
+        """
+        Tests that ``Simulator.advance`` steps worlds HashLife is slow on, and calls the hooks once per advance.
+        """
+        calls = []
+        sim = Simulator(World(10, 7))
+        sim.add_hook(lambda simulator: calls.append(simulator.get_generation()))
+        sim.advance(100)
+        self.assertIsNone(sim.hashlife)
+        self.assertEqual(calls, [100])
+
+        sim = Simulator(World(8))
+        sim.add_hook(lambda simulator: calls.append(simulator.get_generation()))
+        sim.advance(10)
+        self.assertIsNone(sim.hashlife)
+        sim.advance(1024)
+        self.assertIsNotNone(sim.hashlife)
+        self.assertEqual(calls, [100, 10, 1034])
+
+    def test_unsupported_rules(self):
+        """
+        Tests that age rules and B0 rules are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Simulator(age=6).advance(4)
+        with self.assertRaises(ValueError):
+            HashLife(birth=[0, 3])
@@ -0,0 +1,111 @@
+from unittest import TestCase
+import numpy as np
+from History import History
+from Rules import compile_rule
+from Simulator import Simulator, evolve
+from World import World
+
+
+class TestHistory(TestCase):
+    """
+    Tests for ``History`` and ``Simulator.at``.
+    """
+
+    def setUp(self):
+        """
+        Common setup for running tests: a random 16x12 world and its first 40 generations.
+        """
+        self.world = World(16, 12)
+        self.world.world[:] = np.random.default_rng(5).random((12, 16)) < 0.4
+        self.generations = [self.world.world.copy()]
+        for _ in range(40):
+            self.generations.append(evolve(self.generations[-1], [3], [2, 3]))
+
+    def test_at(self):
+        """
+        Tests that past, current and future generations are returned read-only without moving the simulator.
+        """
+        sim = Simulator(self.world)
+        sim.keep_history(interval=8, budget=0)
+        for _ in range(20):
+            sim.update()
+        for generation in (0, 3, 8, 19, 20, 33, 7):
+            world = sim.at(generation)
+            np.testing.assert_array_equal(world.world, self.generations[generation])
+        self.assertEqual(sim.get_generation(), 20)
+        with self.assertRaises(ValueError):
+            world.world[0, 0] = 1
+
+        sim.set_cell(0, 0, 1)
+        with self.assertRaises(ValueError):
+            sim.at(19)
+        self.assertEqual(sim.at(20).get(0, 0), 1)
+
+    def test_recompute_bound(self):
+        """
+        Tests that generations that are no longer cached are recomputed from the nearest checkpoint, and that stepping
+        backwards through them is served from the cache afterwards.
+        """
+        steps = []
+
+        def step(cells, rule):
+            steps.append(1)
+            return evolve(cells, None, None, rule=rule)
+
+        rule = compile_rule()
+        history = History(step, interval=10, budget=self.world.world.nbytes * (12 + 5))  # 5 checkpoints.
+        history.reset(0, self.generations[0], rule)
+        for generation in range(1, 41):
+            history.record(generation, self.generations[generation], rule)
+        self.assertLessEqual(history.cached_bytes + history.checkpoint_bytes, history.budget)
+
+        np.testing.assert_array_equal(history.at(35).world, self.generations[35])
+        self.assertEqual(len(steps), 0)
+        np.testing.assert_array_equal(history.at(19).world, self.generations[19])
+        self.assertEqual(len(steps), 9)
+        for generation in range(18, 10, -1):
+            np.testing.assert_array_equal(history.at(generation).world, self.generations[generation])
+        self.assertEqual(len(steps), 9)
+
+    def test_thinning(self):
+        """
+        Tests that the number and size of the checkpoints stay bounded by doubling the interval.
+        """
+        rule = compile_rule()
+        step = lambda cells, rule: evolve(cells, None, None, rule=rule)
+        history = History(step, interval=2, budget=1 << 20, max_checkpoints=4)
+        history.reset(0, self.generations[0], rule)
+        for generation in range(1, 41):
+            history.record(generation, self.generations[generation], rule)
+        self.assertLessEqual(len(history.checkpoints), 4)
+        self.assertEqual(history.interval, 16)
+        np.testing.assert_array_equal(history.at(31).world, self.generations[31])
+
+        # Checkpoints tellen mee in het budget; de eerste blijft altijd bewaard.
+        history = History(step, interval=2, budget=self.world.world.nbytes * 3)
+        history.reset(0, self.generations[0], rule)
+        for generation in range(1, 41):
+            history.record(generation, self.generations[generation], rule)
+        self.assertLessEqual(history.checkpoint_bytes + history.cached_bytes, history.budget)
+        self.assertEqual(history.interval, 16)
+        self.assertIn(0, history.checkpoints)
+        np.testing.assert_array_equal(history.at(13).world, self.generations[13])
+        history = History(step, interval=2, budget=0)
+        history.reset(0, self.generations[0], rule)
+        for generation in range(1, 41):
+            history.record(generation, self.generations[generation], rule)
+        self.assertEqual(list(history.checkpoints), [0])
+
+    def test_rule_change(self):
+        """
+        Tests that changing the rules restarts the history at the last generation computed with the old rules.
+        """
+        sim = Simulator(self.world)
+        sim.keep_history()
+        sim.update()
+        sim.update()
+        sim.birth = [3, 6]
+        sim.update()
+        self.assertEqual(sim.history.base, 2)
+        np.testing.assert_array_equal(sim.at(2).world, self.generations[2])
+        np.testing.assert_array_equal(sim.at(4).world, evolve(evolve(self.generations[2], [3, 6], [2, 3]), [3, 6], [2, 3]))
@@ -0,0 +1,115 @@
+from unittest import TestCase
+import numpy as np
+from PackedWorld import *
+from Simulator import Simulator
+
+
+class TestPackedWorld(TestCase):
+    """
+    Tests for ``PackedWorld`` data type.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests
+        """
+        self.width, self.height = 70, 12
+        self.world = PackedWorld(self.width, self.height)
+
+    def test_set_get(self):
+        """
+        Tests setting and getting values, including cells in the second word of a row.
+        """
+        for x in (0, 5, 63, 64, 69):
+            self.world.set(x, 3)
+            self.assertEqual(self.world.get(x, 3), 1)
+        self.world.set(64, 3, 0)
+        self.assertEqual(self.world.get(64, 3), 0)
+        self.assertEqual(self.world.get(63, 3), 1)
+        self.assertEqual(self.world.get(self.width, 0), -1)
+        self.assertEqual(self.world.words.shape, (12, 2))
+
+    def test_world_roundtrip(self):
+        """
+        Tests that the unpacked array view and packing agree.
+        """
+        cells = np.random.default_rng(1).integers(0, 2, size=(self.height, self.width))
+        self.world.world = cells
+        np.testing.assert_array_equal(self.world.world, cells)
+
+    def test_get_neighbours(self):
+        """
+        Tests getting neighbours across the wrapping edges.
+        """
+        self.world.set(self.width - 1, self.height - 1)
+        neighbours = self.world.get_neighbours(0, 0)
+        self.assertEqual(8, len(neighbours))
+        self.assertIn(1, neighbours)
+
+    def test_matches_world(self):
+        """
+        Tests that SWAR stepping gives the same generations as the vectorized engine on an ordinary ``World``,
+        for widths around the 64-bit word boundary.
+        """
+        rng = np.random.default_rng(7)
+        for birth, survival in [([3], [2, 3]), ([3, 6], [2, 3]), ([0, 2], [8])]:
+            for width in (1, 3, 63, 64, 65, 130):
+                cells = rng.integers(0, 2, size=(5, width))
+                world = World(width, 5)
+                world.world[:] = cells
+                packed = PackedWorld(width, 5)
+                packed.world = cells
+                reference = Simulator(world, birth, survival)
+                sim = Simulator(packed, birth, survival)
+                for _ in range(5):
+                    reference.update()
+                    sim.update()
+                    self.assertIsInstance(sim.get_world(), PackedWorld)
+                    np.testing.assert_array_equal(sim.get_world().world, reference.get_world().world)
+
+    def test_aged_fallback(self):
+        """
+        Tests that aged rules switch to the ``uint8`` layout and match an ordinary ``World``.
+        """
+        rng = np.random.default_rng(3)
+        cells = rng.integers(0, 7, size=(10, 10))
+        world = World(10)
+        world.world[:] = cells
+        packed = PackedWorld(10, age=6)
+        packed.world = cells
+        self.assertFalse(packed.packed)
+        self.assertEqual(packed.world.dtype, np.uint8)
+        reference = Simulator(world, [1, 2, 3, 4], [2, 3], 6)
+        sim = Simulator(packed, [1, 2, 3, 4], [2, 3], 6)
+        for _ in range(4):
+            reference.update()
+            sim.update()
+            np.testing.assert_array_equal(sim.get_world().world, reference.get_world().world)
+
+    def test_bulk_operations(self):
+        """
+        Tests that random fills, stamps, rotations and reflections are stored in the packed layout.
+        """
+        self.world.fill_random(0.5, seed=1)
+        reference = World(self.width, self.height)
+        reference.fill_random(0.5, seed=1)
+        self.assertGreater(self.world.population, 0)
+        np.testing.assert_array_equal(self.world.world, reference.world)
+
+        world = PackedWorld(self.width, self.height)
+        world.stamp(np.ones((2, 2), dtype=int), [(0, 0), (68, 10)])
+        self.assertEqual(world.population, 8)
+        self.assertEqual(world.get(69, 11), 1)
+
+        rotated = world.rotate()
+        self.assertIsInstance(rotated, PackedWorld)
+        self.assertEqual((rotated.width, rotated.height), (self.height, self.width))
+        np.testing.assert_array_equal(rotated.world, np.rot90(world.world, -1))
+        reflected = world.reflect(vertical=True)
+        self.assertIsInstance(reflected, PackedWorld)
+        np.testing.assert_array_equal(reflected.world, world.world[::-1])
+        self.assertEqual(world.get(0, 0), 1)
+
+        aged = PackedWorld(10, age=6)
+        aged.fill_random(0.5, seed=2, value=6)
+        self.assertEqual(set(np.unique(aged.world)), {0, 6})
+        self.assertIsInstance(aged.rotate(), PackedWorld)
@@ -0,0 +1,42 @@
+from unittest import TestCase
+import numpy as np
+from ParallelSimulator import *
+
+
+class TestParallelSimulator(TestCase):
+    """
+    Tests for ``ParallelSimulator`` implementation.
+    """
+    def test_matches_serial(self):
+        """
+        Tests that banded, multi-process stepping gives the same generations as the serial engine,
+        also with more workers than rows and with age rules.
+        """
+        rng = np.random.default_rng(2)
+        for workers, height, rules in [(2, 17, ([3], [2, 3], None)), (3, 2, ([3], [2, 3], None)),
+                                       (4, 12, ([1, 2, 3, 4], [2, 3], 6))]:
+            world = World(13, height)
+            world.world[:] = rng.integers(0, 7 if rules[2] else 2, size=(height, 13))
+            serial = Simulator(world, *rules)
+            with ParallelSimulator(world, *rules, workers=workers) as parallel:
+                for _ in range(5):
+                    serial.update()
+                    parallel.update()
+                    np.testing.assert_array_equal(parallel.get_world().world, serial.get_world().world)
+                self.assertEqual(parallel.get_generation(), 5)
+
+    def test_double_buffering(self):
+        """
+        Tests that generations alternate between two shared buffers and that the original world is left untouched.
+        """
+        world = World(10)
+        for x, y in [(3, 3), (3, 4), (3, 5)]:
+            world.set(x, y)
+        original = world.world.copy()
+        with ParallelSimulator(world, workers=2) as sim:
+            first = sim.update()
+            second = sim.update()
+            self.assertIsNot(first, second)
+            self.assertIs(sim.update(), first)
+            np.testing.assert_array_equal(world.world, original)
+        self.assertEqual(sim.get_world().get(2, 4), 1, "World should survive close()")
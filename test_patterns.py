@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+import numpy as np
+from Patterns import *
+from Simulator import Simulator
+
+
+class TestPatternLibrary(TestCase):
+    """
+    Tests for the pattern library and its cache.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests: a copy of the patterns of the project.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "patterns")
+        shutil.copytree(DEFAULT_DIRECTORY, self.path, ignore=shutil.ignore_patterns(".cache*"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        """
+        Tests looking up patterns by name.
+        """
+        library = PatternLibrary(self.path)
+        self.assertIn("glider", library.names)
+        self.assertIn("Glider", library)
+        self.assertEqual(library["glider"].tolist(), [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+        self.assertFalse(library["glider"].flags.writeable)
+        self.assertEqual(library.info("gosper-glider-gun")["width"], 36)
+        self.assertEqual(library.info("glider")["rules"], {"birth": [3], "survival": [2, 3]})
+        with self.assertRaises(KeyError):
+            library["unknown"]
+
+        world = library.world("lwss")
+        world.set(0, 0, 1)
+        self.assertEqual(library["lwss"][0, 0], 0)
+
+    def test_patterns(self):
+        """
+        Tests that the shipped still lifes, oscillators and spaceships come back after their period, moved by their
+        displacement.
+        """
+        library = PatternLibrary(self.path)
+        for name, period, dx, dy in [("block", 1, 0, 0), ("beehive", 1, 0, 0), ("blinker", 2, 0, 0),
+                                     ("pulsar", 3, 0, 0), ("glider", 4, 1, 1), ("lwss", 4, -2, 0)]:
+            world = World(40)
+            world.stamp(library[name], (15, 15))
+            start = world.world.copy()
+            simulator = Simulator(world)
+            for _ in range(period):
+                simulator.update()
+            np.testing.assert_array_equal(simulator.get_world().world, np.roll(start, (dy, dx), axis=(0, 1)), name)
+
+    def test_cache(self):
+        """
+        Tests that an unchanged library is loaded from the cache and changed files are parsed again.
+        """
+        library = PatternLibrary(self.path)
+        self.assertEqual(library.parsed, len(library))
+        self.assertTrue(os.path.exists(library.cache))
+
+        cached = PatternLibrary(self.path)
+        self.assertEqual(cached.parsed, 0)
+        self.assertEqual(cached.names, library.names)
+        for name in library:
+            self.assertTrue(np.array_equal(cached[name], library[name]))
+
+        with open(os.path.join(self.path, "block.rle"), "w") as file:
+            file.write("x = 3, y = 1\n3o!\n")
+        os.remove(os.path.join(self.path, "acorn.rle"))
+        changed = PatternLibrary(self.path)
+        self.assertEqual(changed.parsed, 1)
+        self.assertEqual(changed["block"].tolist(), [[1, 1, 1]])
+        self.assertNotIn("acorn", changed)
+
+    def test_variants(self):
+        """
+        Tests the distinct rotations and reflections of patterns.
+        """
+        library = PatternLibrary(self.path)
+        self.assertEqual(len(library.variants("block")), 1)
+        self.assertEqual(len(library.variants("blinker")), 2)
+        self.assertEqual(len(library.variants("glider")), 8)
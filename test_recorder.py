@@ -0,0 +1,75 @@
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from Recorder import *
+
+
+class TestRecorder(TestCase):
+    """
+    Tests for ``Recorder`` and ``Recording``.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests: records 25 generations of a random world.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.golrec")
+        world = World(20, 15)
+        world.world[:] = np.random.default_rng(6).integers(0, 2, size=(15, 20))
+        self.sim = Simulator(world)
+        self.expected = [world.world.copy()]
+        with Recorder(self.path, keyframe_interval=10).attach(self.sim) as recorder:
+            for _ in range(25):
+                self.expected.append(self.sim.update().world.copy())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_frames(self):
+        """
+        Tests that every recorded generation is read back in order.
+        """
+        recording = Recording(self.path)
+        self.assertEqual(recording.generations, list(range(26)))
+        for (generation, cells), expected in zip(recording.frames(), self.expected):
+            np.testing.assert_array_equal(cells, expected)
+        self.assertEqual(sum(record[1] == KEYFRAME for record in recording.index), 3)
+
+    def test_seek(self):
+        """
+        Tests seeking to generations on, right after and between keyframes.
+        """
+        recording = Recording(self.path)
+        for generation in (0, 10, 11, 19, 25):
+            np.testing.assert_array_equal(recording.seek(generation).world, self.expected[generation])
+        self.assertEqual([g for g, _ in recording.frames(23)], [23, 24, 25])
+        with self.assertRaises(KeyError):
+            recording.seek(26)
+
+    def test_hook(self):
+        """
+        Tests that the recorder is registered as a hook until it is closed, and refuses frames afterwards.
+        """
+        self.assertEqual(self.sim.hooks, [])
+        recorder = Recorder(os.path.join(self.directory.name, "hook.golrec"), queue_size=1).attach(self.sim)
+        self.assertEqual(self.sim.hooks, [recorder])
+        recorder.close()
+        self.assertEqual(self.sim.hooks, [])
+        for _ in range(5):  # Met de hook nog aanwezig zou de volle wachtrij hier blijven hangen.
+            self.sim.update()
+        with self.assertRaises(ValueError):
+            recorder.record(self.sim.get_generation(), self.sim.get_world())
+
+        # Een hook die al met de hand verwijderd is, is geen probleem bij close().
+        recorder = Recorder(os.path.join(self.directory.name, "removed.golrec")).attach(self.sim)
+        self.sim.remove_hook(recorder)
+        recorder.close()
+
+    def test_truncated(self):
+        """
+        Tests that an incomplete last record is ignored.
+        """
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 3)
+        self.assertEqual(Recording(self.path).generations, list(range(25)))
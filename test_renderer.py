@@ -0,0 +1,120 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from unittest import TestCase
+import numpy as np
+import pygame
+from Renderer import *
+
+palette = [(255, 255, 255), (240, 0, 0), (0, 0, 240)]
+
+
+class TestRenderer(TestCase):
+    """
+    Tests for ``Renderer`` implementation.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests: a renderer with 10 pixel cells on an off-screen surface.
+        """
+        self.surface = pygame.Surface((200, 200))
+        self.surface.fill((255, 255, 255))
+        self.renderer = Renderer(self.surface, palette, 10)
+        self.cells = np.zeros((8, 12), dtype=int)
+
+    def test_full_draw(self):
+        """
+        Tests that the first draw covers the whole world, with cell colours and grid lines.
+        """
+        self.cells[2, 3] = 1
+        self.cells[4, 5] = 2
+        dirty = self.renderer.draw(self.cells)
+        self.assertEqual(dirty, [pygame.Rect(10, 10, 121, 81)])
+        self.assertEqual(self.surface.get_at((45, 35))[:3], palette[1])
+        self.assertEqual(self.surface.get_at((65, 55))[:3], palette[2])
+        self.assertEqual(self.surface.get_at((25, 25))[:3], palette[0])
+        self.assertEqual(self.surface.get_at((30, 25))[:3], black)
+
+    def test_changed_region(self):
+        """
+        Tests that later draws only redraw the bounding box of the changed cells, and nothing when nothing changed.
+        """
+        self.renderer.draw(self.cells)
+        self.assertEqual(self.renderer.draw(self.cells), [])
+        self.cells[6, 7] = 1
+        dirty = self.renderer.draw(self.cells)
+        self.assertEqual(dirty, [pygame.Rect(80, 70, 11, 11)])
+        self.assertEqual(self.surface.get_at((85, 75))[:3], palette[1])
+
+    def test_fractional_cells(self):
+        """
+        Tests that fractional cell sizes still tile the world without gaps.
+        """
+        renderer = Renderer(self.surface, palette, 7.5)
+        self.cells[:] = 1
+        renderer.draw(self.cells)
+        self.assertEqual(self.surface.get_at((int(7.5 + 12 * 7.5) - 2, 20))[:3], palette[1])
+
+    def test_pooling(self):
+        """
+        Tests that zoomed out below a pixel per cell, blocks of cells are drawn pooled and only the visible part is used.
+        """
+        cells = np.zeros((400, 400), dtype=int)
+        cells[0, 0] = 2
+        cells[1, 1] = 1
+        cells[4:8, 4:8] = 1
+        viewport = Viewport(pygame.Rect(0, 0, 100, 100), 0.25)
+        renderer = Renderer(self.surface, palette, viewport=viewport)
+        self.assertEqual(renderer.draw(cells), [pygame.Rect(0, 0, 100, 100)])
+        self.assertEqual(self.surface.get_at((0, 0))[:3], palette[2])
+        self.assertEqual(self.surface.get_at((1, 1))[:3], palette[1])
+        self.assertEqual(self.surface.get_at((2, 2))[:3], palette[0])
+
+        renderer = Renderer(self.surface, palette, viewport=viewport, pooling="min")
+        renderer.draw(cells)
+        self.assertEqual(self.surface.get_at((0, 0))[:3], palette[0])
+        self.assertEqual(self.surface.get_at((1, 1))[:3], palette[1])
+
+        cells[8:12, 8:12] = [[1, 1, 0, 0]] * 4
+        renderer = Renderer(self.surface, palette, viewport=viewport, pooling="mean")
+        renderer.draw(cells)
+        self.assertEqual(self.surface.get_at((1, 1))[:3], black)
+        self.assertEqual(self.surface.get_at((2, 2))[:3], (127, 127, 127))
+        self.assertEqual(self.surface.get_at((50, 50))[:3], (255, 255, 255))
+
+    def test_viewport_mapping(self):
+        """
+        Tests that screen positions map to the cell drawn under them at several zoom levels and after panning.
+        """
+        cells = np.arange(400 * 601).reshape(400, 601) % 3
+        for zoom in (0.3, 1, 2.5, 10):
+            viewport = Viewport(pygame.Rect(10, 20, 150, 120), zoom, 3.5, 2.25)
+            renderer = Renderer(self.surface, palette, viewport=viewport)
+            viewport.zoom_at(1.5, 60, 70)
+            viewport.pan(7, 3)
+            renderer.draw(cells)
+            for px, py in ((10, 20), (60, 70), (159, 139), (33, 101)):
+                x, y = viewport.screen_to_cell(px, py, 601, 400)
+                unit = viewport.unit
+                if unit == 1:
+                    expected = palette[cells[y, x]]
+                else:
+                    block = cells[y // unit * unit:(y // unit + 1) * unit, x // unit * unit:(x // unit + 1) * unit]
+                    expected = palette[block.max()]
+                if viewport.zoom >= grid_zoom and (px in renderer.xs or py in renderer.ys):
+                    expected = black
+                self.assertEqual(self.surface.get_at((px, py))[:3], expected, (zoom, px, py))
+        self.assertIsNone(viewport.screen_to_cell(5, 30, 601, 400))
+
+    def test_zoom_at(self):
+        """
+        Tests that zooming keeps the cell under the mouse in place, and panning moves the view by whole pixels.
+        """
+        viewport = Viewport(pygame.Rect(0, 0, 100, 100), 4)
+        self.assertEqual(viewport.screen_to_cell(42, 18, 1000, 1000), (10, 4))
+        viewport.zoom_at(0.5, 42, 18)
+        self.assertEqual(viewport.screen_to_cell(42, 18, 1000, 1000), (10, 4))
+        self.assertEqual(viewport.unit, 1)
+        viewport.zoom_at(0.25, 42, 18)
+        self.assertEqual(viewport.unit, 2)
+        viewport.pan(-42, -18)
+        self.assertIsNone(viewport.screen_to_cell(0, 0, 1000, 1000))
@@ -0,0 +1,97 @@
+from unittest import TestCase
+import numpy as np
+from Rules import *
+from Simulator import Simulator
+from World import World
+
+
+class TestRules(TestCase):
+    """
+    Tests for the compiled rules in ``Rules``.
+    """
+
+    def test_parse_rule(self):
+        """
+        Tests the rule notations, including Generations rules.
+        """
+        self.assertEqual(parse_rule("B36/S23"), compile_rule([3, 6], [2, 3]))
+        self.assertEqual(parse_rule("23/36"), compile_rule([3, 6], [2, 3]))
+        self.assertEqual(parse_rule("s23/b3"), compile_rule([3], [2, 3]))
+        self.assertEqual(parse_rule("B2/S/C3"), Rule(frozenset([2]), frozenset(), None, 3))
+        self.assertEqual(parse_rule("345/2/4"), Rule(frozenset([2]), frozenset([3, 4, 5]), None, 4))
+        self.assertEqual(parse_rule("B3/S23/C2"), compile_rule([3], [2, 3]))
+        self.assertEqual(parse_rule("B3/S23", age=5).age, 5)
+        self.assertEqual(format_rule([6, 3], [3, 2]), "B36/S23")
+        self.assertEqual(format_rule([2], [], 3), "B2/S/C3")
+        with self.assertRaises(ValueError):
+            parse_rule("life")
+        with self.assertRaises(ValueError):
+            parse_rule("B2/S/C3", age=5)
+
+    def test_cache(self):
+        """
+        Tests that equal rules are compiled once, whatever the order of the neighbour counts.
+        """
+        rule = compile_rule([6, 3, 3], (3, 2))
+        self.assertIs(rule, compile_rule([3, 6], [2, 3]))
+        self.assertIs(rule.tables()[0], compile_rule([3, 6], [2, 3]).tables()[0])
+        self.assertFalse(rule.tables()[0].flags.writeable)
+
+    def test_table(self):
+        """
+        Tests entries of the transition table against the age rules of ``Simulator``.
+        """
+        rule = compile_rule([3], [2, 3], 5)
+        table, kinds = rule.tables(8)
+        lookup = lambda value, living, fertile: table[((value + 1) * 9 + living) * 9 + fertile]
+        kind = lambda value, living, fertile: kinds[((value + 1) * 9 + living) * 9 + fertile]
+        self.assertEqual(lookup(0, 0, 3), 5)
+        self.assertEqual(kind(0, 0, 3), BIRTH)
+        self.assertEqual(lookup(0, 3, 2), 0)
+        self.assertEqual(lookup(7, 2, 0), 7)
+        self.assertEqual(lookup(7, 4, 0), 6)
+        self.assertEqual(lookup(1, 4, 0), 0)
+        self.assertEqual(kind(1, 4, 0), DEATH)
+        self.assertEqual(lookup(-1, 0, 3), 0)
+
+    def test_generations(self):
+        """
+        Tests Brian's Brain (``B2/S/C3``) against a cell-by-cell implementation, for the vectorized and sparse engines.
+        """
+        rng = np.random.default_rng(3)
+        world = World(11, 9)
+        world.world[:] = rng.integers(0, 3, size=(9, 11))
+        vectorized = Simulator(world, rule="B2/S/C3")
+        sparse = Simulator(world, rule="B2/S/C3", engine="sparse", tile_size=4)
+        cells = world.world.copy()
+        for _ in range(5):
+            expected = np.zeros_like(cells)
+            for y in range(9):
+                for x in range(11):
+                    firing = sum(cells[(y + dy) % 9, (x + dx) % 11] == 1
+                                 for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+                    if cells[y, x] == 0:
+                        expected[y, x] = 1 if firing == 2 else 0
+                    else:
+                        expected[y, x] = (cells[y, x] + 1) % 3
+            cells = expected
+            np.testing.assert_array_equal(vectorized.update().world, cells)
+            np.testing.assert_array_equal(sparse.update().world, cells)
+        with self.assertRaises(ValueError):
+            Simulator(world, rule="B2/S/C3", engine="loop").update()
+
+    def test_simulator_rules(self):
+        """
+        Tests that assigning rules on a simulator compiles them, and that the neighbour counts stay readable but
+        cannot be edited in place.
+        """
+        sim = Simulator()
+        sim.birth = [3, 6]
+        self.assertIs(sim.rule, compile_rule([3, 6], [2, 3]))
+        sim.survival = [2]
+        sim.age = 5
+        self.assertEqual((sim.birth, sim.survival, sim.age), ((3, 6), (2,), 5))
+        with self.assertRaises(AttributeError):
+            sim.birth.append(4)
+        sim.rule = "B2/S/C3"
+        self.assertEqual((sim.birth, sim.survival, sim.age, sim.rule.states), ((2,), (), None, 3))
@@ -0,0 +1,147 @@
+import asyncio
+from unittest import TestCase
+import numpy as np
+from Server import *
+from World import World
+
+
+class TestServer(TestCase):
+    """
+    Tests for the streaming ``Server`` and its frame encoding.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests: a glider in a paused server.
+        """
+        world = World(16)
+        world.stamp("x = 3, y = 3\nbob$2bo$3o!", (2, 2))
+        self.sim = Simulator(world)
+        self.server = Server(self.sim)
+        self.server.pause()
+
+    def run_async(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+    async def connect(self):
+        await self.server.start()
+        return await asyncio.open_connection(*self.server.address[:2])
+
+    def test_encoding(self):
+        """
+        Tests that delta frames reproduce the cells and fall back to keyframes.
+        """
+        cells = np.random.default_rng(0).integers(0, 2, (20, 30))
+        first = Frame(1, 0, cells)
+        changed = cells.copy()
+        changed[3, 4] = 7
+        second = Frame(2, 1, changed)
+
+        message = encode_frame(second, first)
+        self.assertEqual(HEADER.unpack(message[:HEADER.size])[0], DELTA)
+        decoded = decode_frame(message[:HEADER.size], message[HEADER.size:], decode_frame(
+            encode_frame(first)[:HEADER.size], encode_frame(first)[HEADER.size:]))
+        self.assertEqual((decoded.serial, decoded.generation), (2, 1))
+        self.assertTrue(np.array_equal(decoded.cells, changed))
+        with self.assertRaises(ValueError):
+            decode_frame(message[:HEADER.size], message[HEADER.size:], second)
+
+        different = Frame(3, 2, 1 - cells)
+        message = encode_frame(different, first)
+        self.assertEqual(HEADER.unpack(message[:HEADER.size])[0], KEYFRAME)
+        large = Frame(4, 3, cells * 1000)
+        message = encode_frame(large)
+        self.assertTrue(np.array_equal(decode_frame(message[:HEADER.size], message[HEADER.size:]).cells, large.cells))
+
+    def test_stream(self):
+        """
+        Tests that clients get a keyframe and then deltas following the simulation.
+        """
+        async def scenario():
+            reader, writer = await self.connect()
+            frame = await receive(reader)
+            self.assertTrue(np.array_equal(frame.cells, self.sim.get_world().world))
+            self.server.play()
+            await self.server.run(generations=4)
+            while frame.generation < 4:
+                frame = await receive(reader, frame)
+            self.assertTrue(np.array_equal(frame.cells, self.sim.get_world().world))
+            writer.close()
+            await self.server.close()
+        self.run_async(scenario())
+
+    def test_edits(self):
+        """
+        Tests that batched edits of a client are applied together and published.
+        """
+        async def scenario():
+            reader, writer = await self.connect()
+            frame = await receive(reader)
+            runner = asyncio.ensure_future(self.server.run())
+            writer.write(encode_edits([(10, 10, 1), (11, 10, 1), (12, 10, 1)]))
+            await writer.drain()
+            while frame.cells[10, 11] != 1:
+                frame = await receive(reader, frame)
+            self.assertEqual(frame.generation, 0)
+            self.assertEqual(self.sim.get_world().population, 5 + 3)
+
+            writer.write(b'{"unknown": 1}\n')
+            await writer.drain()
+            self.assertEqual(await reader.read(), b"")
+            writer.close()
+
+            # Waarden en posities buiten de wereld of de regel verbreken de verbinding, zonder iets te wijzigen.
+            lines = [encode_edits(edit) for edit in ([(1, 1, 10 ** 9)], [(16, 0, 1)], [(-1, 0, 1)], [(0, 0, -1)])]
+            lines += [b'{"edit": [[1, 1, 1.5]]}\n', b'{"edit": [[1, true]]}\n', b'{"edit": [1, 2]}\n']
+            for line in lines:
+                reader, writer = await asyncio.open_connection(*self.server.address[:2])
+                await receive(reader)
+                writer.write(line)
+                await writer.drain()
+                self.assertEqual(await reader.read(), b"", line)
+                writer.close()
+            self.assertEqual(self.sim.get_world().population, 5 + 3)
+            await self.server.close()
+            await runner
+        self.run_async(scenario())
+
+    def test_slow_client(self):
+        """
+        Tests that a client whose connection is full skips frames instead of holding up the simulation.
+        """
+        class FullWriter:
+            def __init__(self):
+                self.messages = []
+                self.room = asyncio.Event()
+
+            def write(self, data):
+                self.messages.append(data)
+
+            async def drain(self):
+                await self.room.wait()
+
+            def close(self):
+                pass
+
+        async def scenario():
+            await self.server.start()
+            writer = FullWriter()
+            subscriber = Subscriber(None, writer)
+            self.server.subscribers.append(subscriber)
+            subscriber.wakeup.set()
+            sender = asyncio.ensure_future(self.server.__send__(subscriber))
+            self.server.play()
+            await self.server.run(generations=20)
+            self.assertEqual(self.sim.get_generation(), 20)
+            self.assertEqual(len(writer.messages), 1)
+
+            writer.room.set()
+            while len(writer.messages) < 2:
+                await asyncio.sleep(0.001)
+            frames = [None]
+            for message in writer.messages:
+                frames.append(decode_frame(message[:HEADER.size], message[HEADER.size:], frames[-1]))
+            self.assertEqual(frames[-1].generation, 20)
+            self.assertTrue(np.array_equal(frames[-1].cells, self.sim.get_world().world))
+            sender.cancel()
+            await self.server.close()
+        self.run_async(scenario())
@@ -0,0 +1,72 @@
+import time
+from unittest import TestCase
+from SimulationThread import *
+from World import World
+
+
+class TestSimulationThread(TestCase):
+    """
+    Tests for ``SimulationThread`` implementation.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests: a blinker on a running, paused thread.
+        """
+        world = World(10)
+        for x, y in [(3, 3), (3, 4), (3, 5)]:
+            world.set(x, y)
+        self.sim = Simulator(world)
+        self.thread = SimulationThread(self.sim)
+        self.thread.start()
+
+    def tearDown(self):
+        self.thread.stop()
+
+    def wait_for(self, condition, timeout: float = 5):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            self.assertLess(time.perf_counter(), deadline, "Timed out")
+            time.sleep(0.001)
+
+    def test_paused(self):
+        """
+        Tests that a paused thread publishes the starting generation as a read-only frame.
+        """
+        frame = self.thread.latest()
+        self.assertEqual(frame.generation, 0)
+        self.assertFalse(frame.cells.flags.writeable)
+        time.sleep(0.05)
+        self.assertEqual(self.sim.get_generation(), 0)
+
+    def test_play_pause(self):
+        """
+        Tests that frames advance while playing and that the published cells match the generation.
+        """
+        self.thread.play()
+        self.wait_for(lambda: self.thread.latest().generation >= 5)
+        self.thread.pause()
+        time.sleep(0.05)
+        frame = self.thread.latest()
+        self.assertEqual(frame.generation, self.sim.get_generation())
+        expected = 1 if frame.generation % 2 == 0 else 0
+        self.assertEqual(frame.cells[3][3], expected)
+
+    def test_edits(self):
+        """
+        Tests that edits are applied between generations, also while paused.
+        """
+        self.thread.edit(8, 8, 5)
+        self.wait_for(lambda: self.thread.latest().cells[8][8] == 5)
+        self.assertEqual(self.sim.get_world().get(8, 8), 5)
+
+    def test_rate(self):
+        """
+        Tests that a target rate slows stepping down.
+        """
+        self.thread.stop()
+        self.thread = SimulationThread(self.sim, rate=50)
+        self.thread.start()
+        self.thread.play()
+        time.sleep(0.2)
+        self.thread.pause()
+        self.assertLess(self.sim.get_generation(), 20)
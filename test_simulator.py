@@ -1,5 +1,7 @@
 from unittest import TestCase
 from Simulator import *
+from PackedWorld import PackedWorld
+from SparseWorld import SparseWorld
 
 
 class TestSimulator(TestCase):
@@ -145,4 +147,283 @@ class TestSimulator(TestCase):
         self.assertEqual(self.sim.get_world().get(3, 2), 6, "Cell should be alive (at age factor value)")
         self.assertEqual(self.sim.get_world().get(3, 4), 6, "Cell should be alive (at age factor value)")
         self.assertEqual(self.sim.get_world().get(5, 2), 6, "Cell should be alive (at age factor value)")
-        self.assertEqual(self.sim.get_world().get(5, 4), 6, "Cell should be alive (at age factor value)")
\ No newline at end of file
+        self.assertEqual(self.sim.get_world().get(5, 4), 6, "Cell should be alive (at age factor value)")
+
+    def test_engines_match(self):
+        """
+        Tests that the vectorized engine produces exactly the same worlds as the loop reference engine,
+        for classic and aged rules and for worlds small enough that neighbours wrap onto themselves.
+        """
+        rng = np.random.default_rng(42)
+        scenarios = [
+            ([3], [2, 3], None),
+            ([3, 6], [2, 3], None),
+            ([0, 1], [], None),
+            ([1, 2, 3, 4], [2, 3], 6),
+            ([2, 3], [3, 4, 5], 3),
+            ([8], [1], 1),
+            ([3], [2, 3], 0),
+        ]
+        for birth, survival, age in scenarios:
+            for width, height in [(1, 1), (2, 3), (9, 7), (16, 16)]:
+                world = World(width, height)
+                world.world[:] = rng.integers(-1, (age or 1) + 3, size=(height, width))
+                vectorized = Simulator(world, birth, survival, age)
+                loop = Simulator(world, birth, survival, age, engine="loop")
+                for _ in range(4):
+                    vectorized.update()
+                    loop.update()
+                    np.testing.assert_array_equal(vectorized.get_world().world, loop.get_world().world,
+                                                  "Engines differ for B{}/S{} age={} on {}x{}".format(birth, survival, age, width, height))
+
+    def test_large_values(self):
+        """
+        Tests that cells far above the values of the rule are stepped like the loop engine, without growing the
+        transition table.
+        """
+        world = World(8)
+        world.world[2, 2:5] = [10 ** 12, 1, 1]
+        world.world[5, 5] = 10 ** 7
+        vectorized = Simulator(world)
+        loop = Simulator(world, engine="loop")
+        metrics = []
+        vectorized.add_hook(lambda sim, m: metrics.append(m), metrics=True)
+        for _ in range(3):
+            before = loop.get_world().world.copy()
+            np.testing.assert_array_equal(vectorized.update().world, loop.update().world)
+            expected = step_statistics(before, loop.get_world().world)
+            self.assertEqual((metrics[-1].births, metrics[-1].deaths, metrics[-1].survivors),
+                             (expected["births"], expected["deaths"], expected["survivors"]))
+        self.assertEqual(vectorized.get_world().world[5, 5], 10 ** 7 - 3)
+        self.assertEqual(len(vectorized.rule.tables()[0]), (vectorized.rule.levels + 1) * 81)
+
+    def test_unknown_engine(self):
+        """
+        Tests that an unknown engine name is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Simulator(engine="gpu")
+
+    def test_sparse_engine(self):
+        """
+        Tests that the sparse engine matches the vectorized engine, including gliders crossing the wrapping edges
+        and partial tiles, and that it skips tiles away from the activity.
+        """
+        world = World(50, 37)
+        for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:  # Glider
+            world.set(x + 44, y + 33)
+        for x, y in [(20, 20), (21, 20), (20, 21), (21, 21)]:  # Block
+            world.set(x, y)
+        vectorized = Simulator(world)
+        sparse = Simulator(world, engine="sparse", tile_size=8)
+        for _ in range(60):
+            vectorized.update()
+            sparse.update()
+            np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+        self.assertEqual(sparse.total_tiles, 7 * 5)
+        self.assertLess(sparse.active_tiles, sparse.total_tiles)
+
+        # Edits through set_cell wake up a quiet tile.
+        sparse.set_cell(30, 5)
+        sparse.set_cell(31, 5)
+        sparse.set_cell(32, 5)
+        vectorized.set_cell(30, 5)
+        vectorized.set_cell(31, 5)
+        vectorized.set_cell(32, 5)
+        sparse.update()
+        vectorized.update()
+        np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+        self.assertEqual(sparse.get_world().get(31, 4), 1, "Blinker should have turned")
+
+        # Net zo met set_cells, in een keer.
+        sparse.set_cells([10, 11, 12], [30, 30, 30])
+        vectorized.set_cells([10, 11, 12, -1], [30, 30, 30, 30], [1, 1, 1, 5])
+        sparse.update()
+        vectorized.update()
+        np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+        self.assertEqual(sparse.get_world().get(11, 29), 1, "Blinker should have turned")
+
+        # Ook rechtstreeks via World.set op de huidige wereld.
+        for x in (40, 41, 42):
+            sparse.get_world().set(x, 10)
+            vectorized.get_world().set(x, 10)
+        for _ in range(3):
+            sparse.update()
+            vectorized.update()
+            np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+        self.assertEqual(sparse.get_world().get(41, 9), 1, "Blinker should have turned")
+
+        # Na set_world met een grotere wereld horen de tegels bij de nieuwe wereld.
+        sparse.set_world(World(90, 70))
+        vectorized.set_world(World(90, 70))
+        for x in (80, 81, 82):
+            sparse.set_cell(x, 60)
+            vectorized.set_cell(x, 60)
+        sparse.update()
+        vectorized.update()
+        np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+        self.assertEqual(sparse.total_tiles, 12 * 9)
+
+        # Een gedraaide kopie van de huidige wereld houdt zijn wijzigingen voor zich.
+        rotated = sparse.get_world().rotate()
+        rotated.set(65, 85)
+        sparse.update()
+        vectorized.update()
+        np.testing.assert_array_equal(sparse.get_world().world, vectorized.get_world().world)
+
+    def test_set_cells(self):
+        """
+        Tests that ``set_cells`` follows the bounds of each kind of world.
+        """
+        sim = Simulator(World(10))
+        sim.set_cells([1, 2, 10, -1], [1, 1, 1, 1], [3, 4, 5, 6])
+        self.assertEqual(sim.get_world().world.sum(), 7)
+
+        sim = Simulator(PackedWorld(70, 3))
+        sim.set_cells([0, 65], [0, 2])
+        self.assertEqual(sim.get_world().population, 2)
+
+        sim = Simulator(SparseWorld({(0, 0): 1}))
+        sim.set_cells([-5, 40], [-7, 3])
+        self.assertEqual(sim.get_world().get(-5, -7), 1)
+        self.assertEqual(sim.get_world().get(40, 3), 1)
+
+    def test_cycle_detection(self):
+        """
+        Tests detection of still lifes, oscillators and extinction, and that nothing is reported when disabled.
+        """
+        world = World(10)
+        for x, y in [(3, 3), (3, 4), (3, 5)]:  # Blinker, period 2.
+            world.set(x, y)
+        sim = Simulator(world, max_period=2)
+        sim.update()
+        self.assertFalse(sim.settled())
+        sim.update()
+        self.assertEqual(sim.cycle, (0, 2))
+        self.assertFalse(sim.extinct)
+
+        still = World(10)
+        for x, y in [(2, 2), (2, 3), (3, 2), (3, 3)]:  # Block, still life.
+            still.set(x, y)
+        sim.set_world(still)
+        self.assertIsNone(sim.cycle)
+        sim.update()
+        self.assertEqual(sim.cycle, (sim.get_generation() - 1, 1))
+
+        sim = Simulator(World(10), max_period=1)
+        sim.get_world().set(5, 5)
+        sim.update()
+        self.assertTrue(sim.extinct)
+        self.assertTrue(sim.settled())
+
+        sim = Simulator(world)
+        sim.update()
+        sim.update()
+        self.assertIsNone(sim.cycle)
+
+    def test_cycle_longer_than_window(self):
+        """
+        Tests that cycles longer than ``max_period`` are not reported.
+        """
+        world = World(10)
+        for x, y in [(3, 3), (3, 4), (3, 5)]:
+            world.set(x, y)
+        sim = Simulator(world, max_period=1)
+        for _ in range(6):
+            sim.update()
+        self.assertIsNone(sim.cycle)
+
+    def test_metrics(self):
+        """
+        Tests that metrics hooks receive the counts of every generation, equal for the in-pass counting of the
+        vectorized engine and the comparison used by the loop engine, and that nothing is measured without them.
+        """
+        rng = np.random.default_rng(7)
+        for age in (None, 5):
+            world = World(12, 9)
+            world.world[:] = rng.integers(0, (age or 1) + 1, size=(9, 12))
+            received = {}
+            for engine in ("vectorized", "loop"):
+                sim = Simulator(world, [3], [2, 3], age, engine=engine)
+                received[engine] = []
+                sim.add_hook(lambda simulator, metrics: received[simulator.engine].append(metrics), metrics=True)
+                for _ in range(3):
+                    before = sim.get_world().world
+                    sim.update()
+                    metrics = sim.metrics
+                    after = sim.get_world().world
+                    self.assertEqual(metrics.generation, sim.get_generation())
+                    self.assertEqual(metrics.population, sim.get_world().population)
+                    self.assertEqual(metrics.births, np.count_nonzero((before <= 0) & (after > 0)))
+                    self.assertEqual(metrics.deaths, np.count_nonzero((before > 0) & (after <= 0)))
+                    self.assertEqual(metrics.survivors, np.count_nonzero((before > 0) & (after > 0)))
+                    self.assertGreaterEqual(metrics.duration, 0)
+            for vectorized, loop in zip(received["vectorized"], received["loop"]):
+                self.assertEqual(vectorized[2:6], loop[2:6])
+                if age is None:
+                    self.assertIsNone(vectorized.ages)
+                else:
+                    np.testing.assert_array_equal(np.trim_zeros(vectorized.ages, "b"), np.trim_zeros(loop.ages, "b"))
+                    self.assertEqual(vectorized.ages.sum(), vectorized.population)
+
+        sim = Simulator()
+        hook = lambda simulator, metrics: None
+        sim.add_hook(hook, metrics=True)
+        sim.remove_hook(hook)
+        sim.update()
+        self.assertIsNone(sim.metrics)
+
+    def test_profiling(self):
+        """
+        Tests that every N-th generation is profiled.
+        """
+        sim = Simulator()
+        sim.set_profiling(2)
+        for _ in range(5):
+            sim.update()
+        self.assertEqual([generation for generation, _ in sim.profiles], [2, 4])
+        self.assertIsInstance(sim.profiles[0][1], pstats.Stats)
+
+        profiled = []
+        sim.set_profiling(3, lambda generation, stats: profiled.append(generation))
+        for _ in range(4):
+            sim.update()
+        self.assertEqual(profiled, [6, 9])
+
+    def test_double_buffering(self):
+        """
+        Tests that generations alternate between two buffers owned by the simulator, that the world passed in is
+        never written to, and that stepping does not allocate grid-sized arrays.
+        """
+        world = World(30, 20)
+        world.world[:] = np.random.default_rng(2).random((20, 30)) < 0.4
+        original = world.world.copy()
+        sim = Simulator(world)
+        first = sim.update()
+        second = sim.update()
+        self.assertIsNot(first, world)
+        self.assertIsNot(first, second)
+        self.assertIs(sim.update(), first)
+        np.testing.assert_array_equal(world.world, original)
+        np.testing.assert_array_equal(second.world, evolve(evolve(original, [3], [2, 3]), [3], [2, 3]))
+
+        sim.set_world(world)
+        self.assertIs(sim.update(), first)
+        np.testing.assert_array_equal(world.world, original)
+
+        unbuffered = Simulator(world, double_buffer=False)
+        self.assertIsNot(unbuffered.update().world, unbuffered.update().world)
+
+        import tracemalloc
+        large = World(200)
+        large.world[:] = np.random.default_rng(3).random((200, 200)) < 0.4
+        sim = Simulator(large)
+        sim.update()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            sim.update()
+            peak = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, large.world.nbytes)
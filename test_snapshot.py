@@ -0,0 +1,120 @@
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from Snapshot import *
+from Simulator import Simulator
+
+
+class TestSnapshot(TestCase):
+    """
+    Tests for snapshots and RLE patterns.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "world.gol")
+        self.world = World(13, 7)
+        self.world.world[:] = np.random.default_rng(0).integers(0, 2, size=(7, 13))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        """
+        Tests that the header and the cells survive saving and memory-mapped loading.
+        """
+        self.world.set(2, 2, 6)
+        save(self.path, self.world, 42, [1, 2, 3, 4], [2, 3], 6)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 13 * 7)
+        world, header = load(self.path)
+        self.assertIsInstance(world.world, np.memmap)
+        np.testing.assert_array_equal(world.world, self.world.world)
+        self.assertEqual((header["generation"], header["birth"], header["survival"], header["age"]),
+                         (42, [1, 2, 3, 4], [2, 3], 6))
+        world.set(0, 0, 5)  # Copy-on-write: the file is left alone.
+        self.assertEqual(load(self.path)[0].get(0, 0), self.world.get(0, 0))
+
+    def test_packed(self):
+        """
+        Tests the bit-packed encoding.
+        """
+        save(self.path, self.world, packed=True)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 2 * 7)
+        np.testing.assert_array_equal(load(self.path)[0].world, self.world.world)
+        self.world.set(0, 0, 2)
+        with self.assertRaises(ValueError):
+            save(self.path, self.world, packed=True)
+
+    def test_simulator(self):
+        """
+        Tests that a stored simulator continues where it left off.
+        """
+        sim = Simulator(self.world, [3, 6], [2, 3])
+        sim.update()
+        save_simulator(self.path, sim)
+        loaded = load_simulator(self.path)
+        self.assertEqual(loaded.get_generation(), 1)
+        np.testing.assert_array_equal(loaded.update().world, sim.update().world)
+
+    def test_simulator_rules(self):
+        """
+        Tests that Generations rules and large ages survive a snapshot, and that ages too large are rejected.
+        """
+        sim = Simulator(self.world, rule="B2/S/C4")
+        sim.update()
+        save_simulator(self.path, sim)
+        loaded = load_simulator(self.path)
+        self.assertEqual(loaded.rule, sim.rule)
+        np.testing.assert_array_equal(loaded.update().world, sim.update().world)
+
+        save(self.path, self.world, age=40000)
+        self.assertEqual(read_header(self.path)["age"], 40000)
+        with self.assertRaises(ValueError):
+            save(self.path, self.world, age=2 ** 31)
+
+        # Snapshots van versie 1 blijven leesbaar.
+        with open(self.path, "wb") as file:
+            file.write(HEADER_V1.pack(MAGIC, 1, RAW, b"|u1", 1, 1, 3, 5, 8, 12).ljust(HEADER_SIZE, b"\0") + b"\1")
+        self.assertEqual(read_header(self.path)["age"], 5)
+        self.assertIsNone(read_header(self.path)["states"])
+
+        text = write_rle(self.world, [2], [], 4)
+        self.assertEqual(read_rle(text)[1]["states"], 4)
+
+    def test_not_a_snapshot(self):
+        """
+        Tests that other files are rejected.
+        """
+        with open(self.path, "wb") as file:
+            file.write(b"hello")
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+    def test_read_rle(self):
+        """
+        Tests parsing a glider.
+        """
+        world, rules = read_rle("#N Glider\nx = 3, y = 3, rule = B3/S23\nbob$2bo$3o!\n")
+        self.assertEqual((world.width, world.height), (3, 3))
+        np.testing.assert_array_equal(world.world, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+        self.assertEqual(rules, {"birth": [3], "survival": [2, 3]})
+
+    def test_rle_roundtrip(self):
+        """
+        Tests that writing and reading RLE gives back the world, for two-state and multi-state worlds
+        with empty rows.
+        """
+        self.world.world[0] = 0
+        self.world.world[3:5] = 0
+        text = write_rle(self.world, [3, 6], [2, 3])
+        self.assertTrue(text.startswith("x = 13, y = 7, rule = B36/S23"))
+        world, rules = read_rle(text)
+        np.testing.assert_array_equal(world.world, self.world.world)
+        self.assertEqual(rules["birth"], [3, 6])
+
+        self.world.set(4, 1, 30)
+        self.world.set(5, 1, 7)
+        np.testing.assert_array_equal(read_rle(write_rle(self.world))[0].world, self.world.world)
@@ -0,0 +1,77 @@
+from unittest import TestCase
+import numpy as np
+from SparseWorld import *
+from Simulator import Simulator
+
+
+class TestSparseWorld(TestCase):
+    """
+    Tests for ``SparseWorld`` data type.
+    """
+    def setUp(self):
+        """
+        Common setup for running tests
+        """
+        self.world = SparseWorld()
+
+    def test_set_get(self):
+        """
+        Tests setting and getting values at arbitrary (also negative) coordinates.
+        """
+        self.world.set(-5, 10**9, 3)
+        self.assertEqual(self.world.get(-5, 10**9), 3)
+        self.assertEqual(self.world.get(0, 0), 0)
+        self.world.set(-5, 10**9, 0)
+        self.assertEqual(self.world.population, 0)
+
+    def test_bounding_box(self):
+        """
+        Tests the bounding box and exporting it to a dense ``World``.
+        """
+        self.world.set(-2, 3)
+        self.world.set(4, 5, 2)
+        self.assertEqual(self.world.bounding_box(), (-2, 3, 7, 3))
+        self.assertEqual((self.world.width, self.world.height), (7, 3))
+        world = self.world.to_world(margin=1)
+        self.assertEqual((world.width, world.height), (9, 5))
+        self.assertEqual(world.get(1, 1), 1)
+        self.assertEqual(world.get(7, 3), 2)
+
+    def test_matches_world(self):
+        """
+        Tests that stepping matches a ``World`` large enough that the pattern never reaches its edges,
+        for classic and aged rules.
+        """
+        rng = np.random.default_rng(4)
+        for birth, survival, age in [([3], [2, 3], None), ([1, 2, 3, 4], [2, 3], 6), ([2, 3], [3, 4, 5], 3)]:
+            world = World(80)
+            world.world[35:45, 35:45] = rng.integers(0, (age or 1) + 1, size=(10, 10))
+            sparse = Simulator(SparseWorld.from_world(world, -40, -40), birth, survival, age)
+            dense = Simulator(world, birth, survival, age)
+            for _ in range(12):
+                sparse.update()
+                dense.update()
+                expected = SparseWorld.from_world(dense.get_world(), -40, -40)
+                self.assertEqual(sparse.get_world().cells, expected.cells)
+
+    def test_unbounded_growth(self):
+        """
+        Tests that a glider keeps travelling instead of wrapping around.
+        """
+        for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:
+            self.world.set(x, y)
+        sim = Simulator(self.world)
+        for _ in range(400):
+            sim.update()
+        self.assertEqual(sim.get_world().population, 5)
+        self.assertEqual(sim.get_world().bounding_box(), (100, 100, 3, 3))
+
+    def test_filling_rules(self):
+        """
+        Tests that rules that would give birth everywhere are rejected.
+        """
+        self.world.set(0, 0)
+        with self.assertRaises(ValueError):
+            self.world.evolve([0, 3], [2, 3])
+        with self.assertRaises(ValueError):
+            self.world.evolve([8], [2, 3], 3)
@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import patch
 from World import *
 
 
@@ -43,3 +44,99 @@ class TestWorld(TestCase):
         neighbours = self.world.get_neighbours(x, y)
         self.assertEqual(8, len(neighbours))
         self.assertIn(value, neighbours)
+
+    def test_wrap_cells(self):
+        """
+        Tests that a world can use an existing array without copying it.
+        """
+        cells = np.zeros((self.height, self.width), dtype=np.uint8)
+        world = World(self.width, self.height, cells)
+        world.set(1, 2, 5)
+        self.assertEqual(cells[2][1], 5)
+        with self.assertRaises(ValueError):
+            World(self.width + 1, self.height, cells)
+
+    def test_fill_random(self):
+        """
+        Tests that random fills follow the density and are reproducible with a seed.
+        """
+        self.world.fill_random(0.3, seed=4, value=5)
+        self.assertTrue(set(np.unique(self.world.world)) <= {0, 5})
+        other = World(self.width, self.height)
+        other.fill_random(0.3, seed=4, value=5)
+        self.assertTrue(np.array_equal(self.world.world, other.world))
+        large = World(200)
+        large.fill_random(0.3, seed=1)
+        self.assertAlmostEqual(large.population / large.world.size, 0.3, delta=0.02)
+
+    def test_stamp(self):
+        """
+        Tests stamping a pattern at several offsets, wrapping around the edges or not.
+        """
+        glider = "x = 3, y = 3\nbob$2bo$3o!"
+        self.world.world[0, 0] = 7
+        self.world.stamp(glider, [(0, 0), (4, 4), (9, 9)])
+        self.assertEqual(self.world.population, 5 * 3 + 1)
+        self.assertEqual(self.world.get(0, 0), 7)  # Dode cellen van het patroon laten de wereld ongemoeid.
+        self.assertEqual(self.world.get(5, 4), 1)
+        self.assertEqual(self.world.get(0, 11), 1)  # (9, 9) loopt over de randen door.
+
+        self.world.stamp(np.zeros((2, 2), dtype=int), (0, 0), overwrite=True)
+        self.assertEqual(self.world.get(0, 0), 0)
+
+        clipped = World(self.width, self.height)
+        clipped.stamp(World(3, 3, np.ones((3, 3), dtype=int)), [(8, 10), (-1, -1)], wrap=False)
+        self.assertEqual(clipped.population, 4 + 4)
+        self.assertEqual(clipped.get(0, 0), 1)
+        self.assertEqual(clipped.get(9, 11), 1)
+
+    def test_rotate_reflect(self):
+        """
+        Tests rotating and reflecting a world.
+        """
+        world = World(3, 2, np.array([[1, 2, 3], [4, 5, 6]]))
+        rotated = world.rotate()
+        self.assertEqual((rotated.width, rotated.height), (2, 3))
+        self.assertEqual(rotated.world.tolist(), [[4, 1], [5, 2], [6, 3]])
+        self.assertTrue(np.array_equal(world.rotate(4).world, world.world))
+        self.assertTrue(np.array_equal(world.rotate(-1).world, world.rotate(3).world))
+        self.assertEqual(world.reflect().world.tolist(), [[3, 2, 1], [6, 5, 4]])
+        self.assertEqual(world.reflect(vertical=True).world.tolist(), [[4, 5, 6], [1, 2, 3]])
+        self.assertEqual(world.world.tolist(), [[1, 2, 3], [4, 5, 6]])
+
+    def test_neighbour_table(self):
+        """
+        Tests that the cached neighbour table and the batched gather agree with ``get_neighbours``.
+        """
+        self.world.fill_random(0.5, seed=2, value=3)
+        table = self.world.neighbour_table
+        self.assertEqual(table.shape, (self.width * self.height, 8))
+        self.assertEqual(table.dtype, np.int32)
+        self.assertIs(World(self.width, self.height).neighbour_table, table)
+
+        ys, xs = np.divmod(np.arange(self.width * self.height), self.width)
+        out = np.empty((len(xs), 8), dtype=self.world.world.dtype)
+        gathered = self.world.gather_neighbours(xs, ys, out=out)
+        self.assertIs(gathered, out)
+        for x, y, row in zip(xs, ys, gathered):
+            self.assertEqual(row.tolist(), self.world.get_neighbours(x, y))
+        self.assertEqual(self.world.gather_neighbours([-1], [self.height]).tolist(),
+                         [self.world.get_neighbours(self.width - 1, 0)])
+
+        # Werelden te groot voor int32-indices gebruiken de offsets in plaats van de tabel.
+        expected = gathered.copy()
+        out.fill(0)
+        with patch("World.TABLE_LIMIT", 10):
+            np.testing.assert_array_equal(self.world.gather_neighbours(xs, ys), expected)
+            self.assertIs(self.world.gather_neighbours(xs, ys, out=out), out)
+            np.testing.assert_array_equal(out, expected)
+
+    def test_get_neighbours_large(self):
+        """
+        Tests that the cell itself is left out for coordinates beyond the small integers CPython caches.
+        """
+        world = World(400, 3)
+        world.set(300, 1, 9)
+        neighbours = world.get_neighbours(300, 1)
+        self.assertEqual(8, len(neighbours))
+        self.assertNotIn(9, neighbours)